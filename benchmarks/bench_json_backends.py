@@ -0,0 +1,103 @@
+"""
+Compare JSON dump/parse throughput and file size across the file_manager serializers.
+
+    python benchmarks/bench_json_backends.py [files ...] [--iterations 20]
+
+Without arguments every .json file in the bot's data folders is measured (persistent_data,
+recap, bet_vault_persistent, settings, discordauth). When those hold nothing big enough to
+matter, synthetic stand-ins shaped like a week roster file, transactions.json and
+player_data.json are used instead. orjson rows appear only when it is installed.
+"""
+import argparse
+import json
+import random
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from file_manager import StdlibJson, OrjsonJson, orjson
+
+DATA_FOLDERS = ('persistent_data', 'recap', 'bet_vault_persistent', 'settings', 'discordauth')
+MIN_REAL_BYTES = 64 * 1024
+
+
+###################################################
+# Documents
+###################################################
+
+def real_documents() -> dict:
+    documents = {}
+    for folder in DATA_FOLDERS:
+        for path in sorted((ROOT / folder).glob('*.json')):
+            documents[f'{folder}/{path.name}'] = json.loads(path.read_text(encoding='utf-8'))
+    return documents
+
+
+def synthetic_documents() -> dict:
+    rng = random.Random(3)
+    positions = ['QB', 'WR', 'RB', 'TE', 'K', 'DEF']
+
+    roster = [{
+        'owner_id': str(team_id), 'owner_name': f'Manager {team_id}', 'week': 3,
+        'name': f'Player {team_id}-{slot}', 'primary_position': rng.choice(positions),
+        'team_name': 'Buffalo Bills', 'number': str(rng.randint(1, 99)), 'player_key': f'449.p.{30000 + team_id * 20 + slot}',
+        'value': round(rng.uniform(0, 100), 2), 'points': round(rng.uniform(0, 40), 2),
+    } for team_id in range(1, 13) for slot in range(16)]
+
+    # TransactionsLog keeps each transaction as yfpy's JSON string
+    transactions = {str(transaction_id): json.dumps({
+        'transaction_id': transaction_id, 'type': 'add/drop', 'status': 'successful', 'timestamp': 1726000000 + transaction_id,
+        'players': [{'player_id': rng.randint(1000, 40000), 'name': {'full': 'Some Player'}, 'transaction_data': {
+            'type': 'add', 'source_type': 'freeagents', 'destination_team_key': '449.l.1.t.4'}}],
+    }, indent=4) for transaction_id in range(1, 400)}
+
+    player_data = {str(player_id): f'Player {player_id}' for player_id in range(1000, 13000)}
+
+    return {'synthetic/week_3_roster.json': roster, 'synthetic/transactions.json': transactions,
+            'synthetic/player_data.json': player_data}
+
+
+###################################################
+# Harness
+###################################################
+
+def per_call_ms(func, iterations:int) -> float:
+    func()
+    start = time.perf_counter()
+    for _ in range(iterations):
+        func()
+    return (time.perf_counter() - start) / iterations * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('files', nargs='*', type=Path)
+    parser.add_argument('--iterations', type=int, default=20)
+    args = parser.parse_args()
+
+    if args.files:
+        documents = {str(path): json.loads(path.read_text(encoding='utf-8')) for path in args.files}
+    else:
+        documents = real_documents()
+        if sum(len(json.dumps(document)) for document in documents.values()) < MIN_REAL_BYTES:
+            documents.update(synthetic_documents())
+
+    serializers = {'stdlib indent=4': StdlibJson(pretty=True), 'stdlib compact': StdlibJson()}
+    if orjson is not None:
+        serializers['orjson compact'] = OrjsonJson()
+        serializers['orjson indent=2'] = OrjsonJson(pretty=True)
+
+    print(f'{"file":<36}{"serializer":<18}{"KiB":>9}{"dump ms":>10}{"parse ms":>10}')
+    for name, document in documents.items():
+        for label, serializer in serializers.items():
+            text = serializer.dumps(document)
+            dump_ms = per_call_ms(lambda: serializer.dumps(document), args.iterations)
+            parse_ms = per_call_ms(lambda: serializer.loads(text), args.iterations)
+            print(f'{name[-35:]:<36}{label:<18}{len(text.encode("utf-8")) / 1024:>9.1f}{dump_ms:>10.3f}{parse_ms:>10.3f}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,192 @@
+"""
+Compare yfpy model construction with the raw __slots__ records for the hot endpoints.
+
+    python benchmarks/bench_raw_payload.py [--iterations 5]
+
+Both paths start from the same JSON text (json.loads is timed on both sides) for a 12 team
+league: a 6 matchup scoreboard, a 16 player roster and the standings. Memory is the size
+retained by keeping 5 parsed responses alive, measured with tracemalloc.
+"""
+import argparse
+import json
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from yfpy.query import YahooFantasySportsQuery
+from query_helpers.raw_records import parse_scoreboard, parse_roster, parse_standings
+
+NUM_TEAMS = 12
+ROSTER_SIZE = 16
+LEAGUE_KEY = '449.l.1'
+
+
+###################################################
+# Synthetic payloads, shaped like Yahoo's
+###################################################
+
+def team_meta(team_id:int) -> list:
+    return [
+        {'team_key': f'{LEAGUE_KEY}.t.{team_id}'},
+        {'team_id': str(team_id)},
+        {'name': f'Team {team_id}'},
+        [],
+        {'url': f'https://football.fantasysports.yahoo.com/f1/1/{team_id}'},
+        {'team_logos': [{'team_logo': {'size': 'large', 'url': f'https://s.yimg.com/logo/{team_id}.png'}}]},
+        [],
+        {'waiver_priority': team_id},
+        {'faab_balance': '87'},
+        {'number_of_moves': 4},
+        {'number_of_trades': 0},
+        {'roster_adds': {'coverage_type': 'week', 'coverage_value': '3', 'value': '1'}},
+        [],
+        {'league_scoring_type': 'head'},
+        [],
+        [],
+        {'has_draft_grade': 1},
+        {'managers': [{'manager': {'manager_id': str(team_id), 'nickname': f'manager{team_id}', 'guid': 'ABCDEF', 'image_url': 'https://s.yimg.com/manager.png', 'felo_score': '700', 'felo_tier': 'gold'}}]},
+    ]
+
+
+def scoreboard_payload() -> dict:
+    def team(team_id):
+        return {'team': [team_meta(team_id), {
+            'win_probability': 0.5,
+            'team_points': {'coverage_type': 'week', 'week': '3', 'total': f'{90 + team_id}.25'},
+            'team_projected_points': {'coverage_type': 'week', 'week': '3', 'total': '101.25'},
+        }]}
+
+    matchups = {'count': NUM_TEAMS // 2}
+    for index in range(NUM_TEAMS // 2):
+        matchups[str(index)] = {'matchup': {
+            'week': '3', 'week_start': '2024-09-19', 'week_end': '2024-09-23', 'status': 'postevent',
+            'is_playoffs': '0', 'is_consolation': '0', 'is_tied': 0, 'winner_team_key': f'{LEAGUE_KEY}.t.{2 * index + 2}',
+            'stat_winners': [{'stat_winner': {'stat_id': str(stat_id), 'winner_team_key': f'{LEAGUE_KEY}.t.1'}} for stat_id in range(10)],
+            '0': {'teams': {'0': team(2 * index + 1), '1': team(2 * index + 2), 'count': 2}},
+        }}
+    return {'fantasy_content': {'league': [{'league_key': LEAGUE_KEY, 'current_week': 3}, {'scoreboard': {'week': '3', '0': {'matchups': matchups}}}]}}
+
+
+def roster_payload() -> dict:
+    positions = ['QB', 'WR', 'WR', 'RB', 'RB', 'TE', 'W/R/T', 'K', 'DEF'] + ['BN'] * (ROSTER_SIZE - 9)
+    players = {'count': ROSTER_SIZE}
+    for index in range(ROSTER_SIZE):
+        player_id = 30000 + index
+        players[str(index)] = {'player': [
+            [
+                {'player_key': f'449.p.{player_id}'}, {'player_id': str(player_id)},
+                {'name': {'full': f'Player {player_id}', 'first': 'Player', 'last': str(player_id), 'ascii_first': 'Player', 'ascii_last': str(player_id)}},
+                {'url': f'https://sports.yahoo.com/nfl/players/{player_id}'},
+                {'editorial_player_key': f'nfl.p.{player_id}'}, {'editorial_team_key': 'nfl.t.2'},
+                {'editorial_team_full_name': 'Buffalo Bills'}, {'editorial_team_abbr': 'Buf'},
+                {'bye_weeks': {'week': '12'}}, {'is_keeper': {'status': False, 'cost': False, 'kept': False}},
+                {'uniform_number': '17'}, {'display_position': 'QB'},
+                {'headshot': {'url': 'https://s.yimg.com/headshot.png', 'size': 'small'}}, {'image_url': 'https://s.yimg.com/headshot.png'},
+                {'is_undroppable': '0'}, {'position_type': 'O'}, {'primary_position': 'QB'},
+                {'eligible_positions': [{'position': 'QB'}]}, {'has_player_notes': 1},
+            ],
+            {'selected_position': [{'coverage_type': 'week'}, {'week': '3'}, {'position': positions[index]}, {'is_flex': 0}]},
+        ]}
+    team = [team_meta(4), {'roster': {'coverage_type': 'week', 'week': '3', 'is_editable': 0, '0': {'players': players}}}]
+    return {'fantasy_content': {'team': team}}
+
+
+def standings_payload() -> dict:
+    teams = {'count': NUM_TEAMS}
+    for index in range(NUM_TEAMS):
+        team_id = index + 1
+        teams[str(index)] = {'team': [
+            team_meta(team_id),
+            {'team_points': {'coverage_type': 'season', 'season': '2024', 'total': '300.5'}},
+            {'team_standings': {
+                'rank': team_id, 'playoff_seed': str(team_id), 'points_for': '300.5', 'points_against': 280,
+                'outcome_totals': {'wins': '2', 'losses': 1, 'ties': 0, 'percentage': '.667'},
+                'divisional_outcome_totals': {'wins': '1', 'losses': 0, 'ties': 0},
+                'streak': {'type': 'win', 'value': '2'},
+            }},
+        ]}
+    return {'fantasy_content': {'league': [{'league_key': LEAGUE_KEY}, {'standings': [{'teams': teams}]}]}}
+
+
+###################################################
+# Harness
+###################################################
+
+class FakeResponse:
+    status_code = 200
+    url = 'https://fantasysports.yahooapis.com/'
+
+    def __init__(self, text:str):
+        self.text = text
+
+    def json(self):
+        return json.loads(self.text)
+
+
+def offline_query(text:str) -> YahooFantasySportsQuery:
+    """A YahooFantasySportsQuery that answers every request with the same payload, no auth."""
+    query = YahooFantasySportsQuery.__new__(YahooFantasySportsQuery)
+    query.offline = False
+    query.all_output_as_json_str = False
+    query.executed_queries = []
+    query._fantasy_content_data_field = 'fantasy_content'
+    query.league_key = LEAGUE_KEY
+    query.get_league_key = lambda season=None: LEAGUE_KEY
+    query.get_response = lambda url: FakeResponse(text)
+    return query
+
+
+def time_per_call(func, iterations:int) -> float:
+    func()
+    start = time.perf_counter()
+    for _ in range(iterations):
+        func()
+    return (time.perf_counter() - start) / iterations
+
+
+def retained_bytes(func, copies:int = 5) -> int:
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    kept = [func() for _ in range(copies)]
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    size = sum(stat.size_diff for stat in after.compare_to(before, 'filename'))
+    del kept
+    return size // copies
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--iterations', type=int, default=5)
+    args = parser.parse_args()
+
+    endpoints = {
+        'scoreboard': (scoreboard_payload(), lambda query: query.get_league_scoreboard_by_week(3), parse_scoreboard),
+        'roster': (roster_payload(), lambda query: query.get_team_roster_by_week(4, 3), parse_roster),
+        'standings': (standings_payload(), lambda query: query.get_league_standings(), parse_standings),
+    }
+
+    print(f'{"endpoint":<12}{"yfpy ms":>10}{"raw ms":>10}{"speedup":>10}{"yfpy KiB":>11}{"raw KiB":>10}')
+    for name, (payload, yfpy_call, raw_parse) in endpoints.items():
+        text = json.dumps(payload)
+        query = offline_query(text)
+
+        def yfpy_path():
+            return yfpy_call(query)
+
+        def raw_path():
+            return raw_parse(json.loads(text)['fantasy_content'])
+
+        yfpy_time = time_per_call(yfpy_path, args.iterations)
+        raw_time = time_per_call(raw_path, args.iterations)
+        yfpy_size = retained_bytes(yfpy_path)
+        raw_size = retained_bytes(raw_path)
+        print(f'{name:<12}{yfpy_time * 1000:>10.3f}{raw_time * 1000:>10.3f}{yfpy_time / raw_time:>9.1f}x'
+              f'{yfpy_size / 1024:>11.1f}{raw_size / 1024:>10.1f}')
+
+
+if __name__ == '__main__':
+    main()
@@ -5,6 +5,7 @@ from discord.ext import tasks, commands
 from typing import Optional
 
 from cogs_helpers import FantasyQueryHelper, FantasyHelper
+from query_helpers.rate_limiter import background
 import utility
 
 import asyncio
@@ -109,9 +110,7 @@ class FantasyQuery(commands.Cog):
             selected_member = self.selected_members[0]
             discord_id = interaction.user.id
 
-            members = await self.bot.state.persistent_manager.load_json(filename=self.members_filename)
-            await self.outer.bind_discord(members, selected_member, discord_id)
-            await self.bot.state.persistent_manager.write_json(filename=self.members_filename, data=members)
+            await self.bot.state.state_db.bind_discord(selected_member, discord_id)
            
             label_list = [option.label for option in self.options if option.value == selected_member]
 
@@ -143,7 +142,7 @@ class FantasyQuery(commands.Cog):
     async def construct_team_select(self):
         select = self.TeamSelect(self)
 
-        members = await self.bot.state.persistent_manager.load_json(filename=self.members_filename)
+        members = await self.bot.state.state_db.load_members()
         for member in members:
             select.add_option(label=member.get('name'), value=member.get('id'), default=False)
         return select
@@ -163,14 +162,6 @@ class FantasyQuery(commands.Cog):
     # Bind Commands ADMIN        
     ###################################################
 
-    async def bind_discord(self, members:dict, draft_id:int, discord_id:int) -> dict:
-        for member in members:
-            if member.get('id') == str(draft_id):
-                member.update({'discord_id':str(discord_id)})
-                break
-        return members
-
-
     @app_commands.checks.has_role(int(os.getenv('MANAGER_ROLE')))
     @app_commands.command(name='bind_other', description= "Bind Team ID to specified Discord ID")
     @app_commands.describe(discord_user="Tagged Discord User", id="Yahoo team ID")
@@ -180,9 +171,7 @@ class FantasyQuery(commands.Cog):
             num_teams = utility.arg_to_int(self.bot.state.league.num_teams) 
 
         if id >= 1 and id <= num_teams:
-            members = await self.bot.state.persistent_manager.load_json(filename=self.members_filename)
-            updated_members = await self.bind_discord(members, id, discord_user.id)
-            await self.bot.state.persistent_manager.write_json(filename=self.members_filename, data=updated_members)
+            await self.bot.state.state_db.bind_discord(id, discord_user.id)
 
             await interaction.response.send_message(f'Team ID: {id} bound to Discord ID: {utility.id_to_mention(discord_user.id)}',ephemeral=True)
         else:
@@ -199,12 +188,7 @@ class FantasyQuery(commands.Cog):
 
 
     async def check_user_exists(self,user):
-        members = await self.bot.state.persistent_manager.load_json(filename = self.members_filename)
-
-        for member in members:
-            if 'discord_id' in member and member.get('discord_id') == user:
-                return True
-        return False
+        return await self.bot.state.state_db.get_member_by_discord(user) is not None
 
 
     @app_commands.checks.has_role(int(os.getenv('MANAGER_ROLE')))   
@@ -227,8 +211,8 @@ class FantasyQuery(commands.Cog):
             embed = discord.Embed(title = fan_league.name.decode('utf-8'), url=fan_league.url,description = 'Fantasy participants and IDs', color = self.emb_color ) 
             embed.set_thumbnail(url = fan_league.logo_url)
         
-        async with self.bot.state.fantasy_query_lock:
-            teams = self.bot.state.fantasy_query.get_teams()
+        async with self.bot.state.fantasy_query_lock.read():
+            teams = await self.bot.state.fantasy_query.get_teams()
 
         for team in teams:
             embed.add_field(name = team.name.decode("utf-8"), value = "Team ID: " + str(team.team_id),inline=False)
@@ -238,7 +222,7 @@ class FantasyQuery(commands.Cog):
 
     @app_commands.command(name="info", description = "Lists Team IDs and Discord Tags")
     async def info(self,interaction: discord.Interaction):
-        members = await self.bot.state.persistent_manager.load_json(filename = self.members_filename)
+        members = await self.bot.state.state_db.load_members()
 
         async with self.bot.state.league_lock:
             fan_league = self.bot.state.league
@@ -324,7 +308,7 @@ class FantasyQuery(commands.Cog):
 
     async def construct_chump_champ(self,chimp:str, fantasy_league, lowest_team, interaction, week, color):
         # use lowest_id to mention discord user 
-        discord_user = await utility.teamid_to_discord(lowest_team.team_id,self.bot.state.persistent_manager)
+        discord_user = await utility.teamid_to_discord(lowest_team.team_id, self.bot.state.state_db)
 
         embed_starting = await FantasyQueryHelper.init_embed(chimp, ' - STARTING', week,fantasy_league.url, lowest_team.team_points.total, color, lowest_team.team_logos[0].url)
         embed_bench = await FantasyQueryHelper.init_embed(chimp, ' - BENCH', week,fantasy_league.url, lowest_team.team_points.total, color, lowest_team.team_logos[0].url)
@@ -348,27 +332,29 @@ class FantasyQuery(commands.Cog):
                 embed_bench.set_author(name = member.display_name, url=lowest_team.url, icon_url = member.display_avatar.url)
                 embed_defense.set_author(name = member.display_name, url=lowest_team.url, icon_url = member.display_avatar.url)
 
-            async with self.bot.state.fantasy_query_lock:
+            async with self.bot.state.fantasy_query_lock.read():
                 # get and display loser's roster
-                player_list:list[Player] = self.bot.state.fantasy_query.get_team_roster(lowest_team.team_id,week).players
+                player_list:list[Player] = (await self.bot.state.fantasy_query.get_team_roster(lowest_team.team_id,week)).players
 
+                # weekly stats for the whole roster in one batch
+                players_dict = await self.bot.state.fantasy_query.get_players_week_stats([player.player_id for player in player_list], week)
         
             # sort players by position into deque
             starting_deque, bench_deque, defense_deque = await FantasyQueryHelper.construct_roster_lists(player_list)
             
             # add fields and send
             if starting_deque:
-                await FantasyQueryHelper.add_player_fields(embed_starting, starting_deque, week, self.bot.state)
+                await FantasyQueryHelper.add_player_fields(embed_starting, starting_deque, players_dict)
                 embed_starting.set_footer(text = lowest_team.name.decode('utf-8'))
                 await interaction.followup.send(embed = embed_starting,ephemeral=False)
 
             if defense_deque:
-                await FantasyQueryHelper.add_defense_fields(embed_defense, defense_deque, week, self.bot.state)
+                await FantasyQueryHelper.add_defense_fields(embed_defense, defense_deque, players_dict)
                 embed_defense.set_footer(text = lowest_team.name.decode('utf-8'))
                 await interaction.followup.send(embed = embed_defense,ephemeral=False)
 
             if bench_deque:
-                await FantasyQueryHelper.add_player_fields(embed_bench, bench_deque, week, self.bot.state)
+                await FantasyQueryHelper.add_player_fields(embed_bench, bench_deque, players_dict)
                 embed_bench.set_footer(text = lowest_team.name.decode('utf-8'))
                 await interaction.followup.send(embed = embed_bench,ephemeral=False)
 
@@ -392,8 +378,8 @@ class FantasyQuery(commands.Cog):
             return
 
         # lowest team
-        async with self.bot.state.fantasy_query_lock:
-            matchups_list:list[Matchup] = self.bot.state.fantasy_query.get_scoreboard(week).matchups
+        async with self.bot.state.fantasy_query_lock.read():
+            matchups_list:list[Matchup] = (await self.bot.state.fantasy_query.get_scoreboard(week)).matchups
         lowest_team:Team = await FantasyQueryHelper.lowest_points_matchup_list(matchups_list)
 
         await self.construct_chump_champ('Chump', league,lowest_team,interaction, week, self.loser_color)
@@ -407,8 +393,8 @@ class FantasyQuery(commands.Cog):
             fantasy_league:League = self.bot.state.league
 
         week = fantasy_league.current_week
-        async with self.bot.state.fantasy_query_lock:
-            matchups_list = self.bot.state.fantasy_query.get_scoreboard(week).matchups
+        async with self.bot.state.fantasy_query_lock.read():
+            matchups_list = (await self.bot.state.fantasy_query.get_scoreboard(week)).matchups
         lowest_team:Team = await FantasyQueryHelper.lowest_points_matchup_list(matchups_list)
 
         await self.construct_chump_champ('Chump', fantasy_league, lowest_team, interaction, week, self.loser_color)
@@ -432,8 +418,8 @@ class FantasyQuery(commands.Cog):
             await interaction.followup.send(f'Invalid Input: current_week={league.current_week}', ephemeral=True)
             return
 
-        async with self.bot.state.fantasy_query_lock:
-            matchups_list:list[Matchup] = self.bot.state.fantasy_query.get_scoreboard(week).matchups
+        async with self.bot.state.fantasy_query_lock.read():
+            matchups_list:list[Matchup] = (await self.bot.state.fantasy_query.get_scoreboard(week)).matchups
         highest_team:Team = await FantasyQueryHelper.highest_points_matchup_list(matchups_list)
 
         await self.construct_chump_champ('Champ',league, highest_team, interaction, week, self.winner_color)
@@ -448,8 +434,8 @@ class FantasyQuery(commands.Cog):
 
         week = league.current_week
 
-        async with self.bot.state.fantasy_query_lock:
-            matchups_list:list[Matchup] = self.bot.state.fantasy_query.get_scoreboard(week).matchups
+        async with self.bot.state.fantasy_query_lock.read():
+            matchups_list:list[Matchup] = (await self.bot.state.fantasy_query.get_scoreboard(week)).matchups
         highest_team:Team = await FantasyQueryHelper.highest_points_matchup_list(matchups_list)
 
         await self.construct_chump_champ('Champ',league, highest_team, interaction, week, self.winner_color)
@@ -463,8 +449,8 @@ class FantasyQuery(commands.Cog):
             fan_league:League = self.bot.state.league
 
         embed = discord.Embed(title = f'Week {week} Matchups', url=fan_league.url, description = '', color = self.emb_color)
-        async with self.bot.state.fantasy_query_lock:
-            matchups_list = self.bot.state.fantasy_query.get_scoreboard(week).matchups
+        async with self.bot.state.fantasy_query_lock.read():
+            matchups_list = (await self.bot.state.fantasy_query.get_scoreboard(week)).matchups
 
         await FantasyQueryHelper.add_matchup_fields(matchups_list, embed)
         await interaction.followup.send(embed = embed,ephemeral=False)
@@ -479,8 +465,8 @@ class FantasyQuery(commands.Cog):
 
         embed = discord.Embed(title = f'Week {week} Matchups', url=fan_league.url, description = '', color = self.emb_color)
 
-        async with self.bot.state.fantasy_query_lock:
-            matchups_list = self.bot.state.fantasy_query.get_scoreboard(week).matchups
+        async with self.bot.state.fantasy_query_lock.read():
+            matchups_list = (await self.bot.state.fantasy_query.get_scoreboard(week)).matchups
 
         await FantasyQueryHelper.add_matchup_fields(matchups_list, embed)
         await interaction.followup.send(embed = embed,ephemeral=False)
@@ -500,9 +486,13 @@ class FantasyQuery(commands.Cog):
             await interaction.followup.send("This Player either doesn't exist or you need to spell better.")
             return
 
-        async with self.bot.state.fantasy_query_lock:
-            # weekly stats
-            player = self.bot.state.fantasy_query.get_player_stats(player_id)
+        async with self.bot.state.fantasy_query_lock.read():
+            # season stats, ownership and percent owned in one request
+            player:Player = (await self.bot.state.fantasy_query.get_player_profiles([player_id])).get(int(player_id))
+
+        if player is None:
+            await interaction.followup.send('Failed to Construct Player Profile.')
+            return
 
         # create embed
         embed = discord.Embed(title = f'{name}', url=player.url, description = f'#{player.uniform_number}, {player.display_position}, {player.editorial_team_full_name}', color = self.emb_color)
@@ -512,26 +502,24 @@ class FantasyQuery(commands.Cog):
             embed.add_field(name = 'Status',value =utility.to_red_text(f'{player.status_full} {player.injury_note}'),inline=True)
 
         # season points
-        async with self.bot.state.fantasy_query_lock:
-            season_league = self.bot.state.fantasy_query.get_league_stats(player_id)['league']
-
-        season_stats = season_league.players[0]
-        embed.add_field(name = 'Season Pts', value = utility.to_block(season_stats.player_points.total))
+        embed.add_field(name = 'Season Pts', value = utility.to_block(player.player_points.total))
+        if player.percent_owned:
+            embed.add_field(name = 'Rostered', value = utility.to_block(f'{player.percent_owned.value}%'))
         embed.add_field(name = '\u200b', value = '\u200b', inline= False) 
 
         # footer
-        async with self.bot.state.fantasy_query_lock:
-            ownership_result:League = self.bot.state.fantasy_query.get_ownership(player_id)['league']  
-
-        # ownership result always list of size 1
-        if len(ownership_result.players[0].ownership.teams) != 0:
-            embed.set_footer(text = 'Manager: ' + ownership_result.players[0].ownership.teams[0].name.decode('utf-8'))
+        owner_team_name = player.ownership.owner_team_name if player.ownership else None
+        if owner_team_name:
+            if isinstance(owner_team_name, bytes):
+                owner_team_name = owner_team_name.decode('utf-8')
+            embed.set_footer(text = 'Manager: ' + owner_team_name)
         
         # List Stats
         stats_player = player.player_stats.stats
+        async with self.bot.state.fantasy_query_lock.read():
+            stat_dict = self.bot.state.fantasy_query.stat_dict
         for i in range(len(stats_player)):
-            async with self.bot.state.fantasy_query_lock:
-                embed.add_field(name = self.bot.state.fantasy_query.stat_dict.get(str(stats_player[i].stat_id)), value = utility.to_block(f'{stats_player[i].value:3.1f}'), inline = True)
+            embed.add_field(name = stat_dict.get(str(stats_player[i].stat_id)), value = utility.to_block(f'{stats_player[i].value:3.1f}'), inline = True)
 
         await interaction.followup.send(embed=embed,ephemeral=False)
 
@@ -539,13 +527,13 @@ class FantasyQuery(commands.Cog):
     @app_commands.command(name="leaderboard",description="Fantasy Leaderboard")
     async def leaderboard(self,interaction:discord.Interaction):
         await interaction.response.defer()
-        async with self.bot.state.fantasy_query_lock:
-            standings = self.bot.state.fantasy_query.get_all_standings(self.bot.state.league.num_teams)
+        async with self.bot.state.fantasy_query_lock.read():
+            standings = await self.bot.state.fantasy_query.get_all_standings()
 
         sorted_standings = sorted(standings, key = lambda tup: int(tup[1].rank) if tup[1].rank is not None else float('inf'))
 
         # load names 
-        players_dict_list = await self.bot.state.persistent_manager.load_json(filename=self.members_filename)
+        players_dict_list = await self.bot.state.state_db.load_members()
         
         embed = discord.Embed(title = 'Current Rankings', url='', description = '', color = self.emb_color)
         for players in sorted_standings:
@@ -570,14 +558,14 @@ class FantasyQuery(commands.Cog):
     @app_commands.command(name="most_points",description="Standings by most points")
     async def most_points(self,interaction:discord.Interaction):
         await interaction.response.defer()
-        async with self.bot.state.fantasy_query_lock:
-            standings = self.bot.state.fantasy_query.get_all_standings(self.bot.state.league.num_teams)
+        async with self.bot.state.fantasy_query_lock.read():
+            standings = await self.bot.state.fantasy_query.get_all_standings()
 
         #sorted_standings = sorted(standings, key = lambda tup: int(tup[1].points_for), reverse = True)
         sorted_standings = sorted(standings, key = lambda tup: int(tup[1].points_for), reverse = True)
 
         # load names 
-        players_dict_list = await self.bot.state.persistent_manager.load_json(filename=self.members_filename)
+        players_dict_list = await self.bot.state.state_db.load_members()
 
         embed = discord.Embed(title = 'Current Rankings', url='', description = '', color = self.emb_color)
         for players in sorted_standings:
@@ -602,13 +590,13 @@ class FantasyQuery(commands.Cog):
     @app_commands.command(name="points_against",description="Standings by points against")
     async def points_against(self,interaction:discord.Interaction):
         await interaction.response.defer()
-        async with self.bot.state.fantasy_query_lock:
-            standings = self.bot.state.fantasy_query.get_all_standings(self.bot.state.league.num_teams)
+        async with self.bot.state.fantasy_query_lock.read():
+            standings = await self.bot.state.fantasy_query.get_all_standings()
 
         sorted_standings = sorted(standings, key = lambda tup: int(tup[1].points_against), reverse = True)
 
         # load names 
-        players_dict_list = await self.bot.state.persistent_manager.load_json(filename=self.members_filename)
+        players_dict_list = await self.bot.state.state_db.load_members()
 
         embed = discord.Embed(title = 'Current Rankings', url='', description = '', color = self.emb_color)
         for players in sorted_standings:
@@ -735,9 +723,8 @@ class FantasyQuery(commands.Cog):
         await interaction.response.defer()
         newln = '\n'
 
-        async with self.bot.state.fantasy_query_lock:
-            fantasy_league = self.bot.state.fantasy_query.get_league()['league']
-
+        async with self.bot.state.league_lock:
+            fantasy_league:League = self.bot.state.league
 
         week = fantasy_league.current_week
         if await FantasyHelper.season_over(fantasy_league):
@@ -748,8 +735,8 @@ class FantasyQuery(commands.Cog):
         if last_week <= 0:
             await interaction.followup.send("Error: Week 1 hasn't ended.",ephemeral=False)
 
-        async with self.bot.state.fantasy_query_lock:
-            matchups_list = self.bot.state.fantasy_query.get_scoreboard(last_week).matchups
+        async with self.bot.state.fantasy_query_lock.read():
+            matchups_list = (await self.bot.state.fantasy_query.get_scoreboard(last_week)).matchups
 
         # search for lowest points and highest
         highest_scoring_team_pts, highest_scoring_team, highest_scoring_url = await self.highest_scoring(matchups_list)
@@ -858,6 +845,24 @@ class FantasyQuery(commands.Cog):
             roster_list.append(serialized_player)
 
 
+    async def serialize_league_rosters(self, rosters:dict[int,Roster], members:list[dict], week:int) -> list[dict]:
+        """
+        Serialize every team's roster for a week.
+            Args:
+                rosters (dict): team_id -> YFPY Roster, from get_league_rosters
+                members (list): members.json entries, used for owner names
+            Returns:
+                list: Serialized players of all rosters
+        """
+        owner_names = {str(member.get('id')): member.get('name') for member in members}
+
+        roster_list = []
+        for team_id, roster in rosters.items():
+            owner_id = str(team_id)
+            await self.serialize_roster(roster_list, roster, owner_id, owner_names.get(owner_id), week)
+        return roster_list
+
+
     async def serialize_matchups(self,scoreboard:Scoreboard):
         """
         Serialize matchups data to a dictionary.
@@ -919,8 +924,8 @@ class FantasyQuery(commands.Cog):
         if await self.bot.state.recap_manager.path_exists(filename):
             return
         
-        async with self.bot.state.fantasy_query_lock:  
-            current_week_obj = self.bot.state.fantasy_query.get_scoreboard(week)
+        async with self.bot.state.fantasy_query_lock.read():  
+            current_week_obj = await self.bot.state.fantasy_query.get_scoreboard(week)
 
         serialized_data = await self.serialize_matchups(current_week_obj)
         logger.info(f"creating {filename}")
@@ -936,22 +941,12 @@ class FantasyQuery(commands.Cog):
             return
         
         logger.info(f'[FantasyQuery][store_roster] - Constructing {filename}')
-        async with self.bot.state.league_lock:
-            fantasy_league = self.bot.state.league
-        number_of_teams = int(fantasy_league.num_teams)
-        
-        roster_list = []
-        for i in range(number_of_teams):
-            owner_id = i + 1
-            members = await self.bot.state.persistent_manager.load_json(filename=self.members_filename)
-            for member in members: 
-                if str(owner_id) == member.get('id'):
-                    team_name = member.get('name')
-        
-            async with self.bot.state.fantasy_query_lock:  
-                current_week_roster = self.bot.state.fantasy_query.get_roster(str(owner_id), week)
-            await self.serialize_roster(roster_list, current_week_roster, str(owner_id), team_name, week)
-            await asyncio.sleep(1)
+
+        # every team's roster in one request
+        async with self.bot.state.fantasy_query_lock.read():  
+            rosters = await self.bot.state.fantasy_query.get_league_rosters(week)
+        members = await self.bot.state.state_db.load_members()
+        roster_list = await self.serialize_league_rosters(rosters, members, week)
 
         logger.info(f"creating {filename}")
         await self.bot.state.recap_manager.write_json(filename=filename, data=roster_list)
@@ -981,7 +976,7 @@ class FantasyQuery(commands.Cog):
         df_player_stats[stats_columns] = df_player_stats[stats_columns][stats_columns].fillna(-1).astype(int)
         
         logger.info(f'[FantasyQuery][construct_roster_dataframe] - Writing {self._roster_csv}.')
-        await self.bot.state.recap_manager.write_csv_formatted(self._roster_csv, df_player_stats)
+        await self.bot.state.recap_manager.write_table(self._roster_csv, df_player_stats)
 
 
     ###################################################
@@ -1077,7 +1072,7 @@ class FantasyQuery(commands.Cog):
 
         df_final = await self.modify_data_frame_winlosstie(df_matchups_raw)
 
-        await self.bot.state.recap_manager.write_csv_formatted(self._matchup_csv, df_final)
+        await self.bot.state.recap_manager.write_table(self._matchup_csv, df_final)
 
 
     ###################################################
@@ -1085,8 +1080,8 @@ class FantasyQuery(commands.Cog):
     ###################################################
 
     async def add_team_urls(self, entry:dict):
-        async with self.bot.state.fantasy_query_lock:
-            team_list:list[Team] = self.bot.state.fantasy_query.get_league_teams()
+        async with self.bot.state.fantasy_query_lock.read():
+            team_list:list[Team] = await self.bot.state.fantasy_query.get_league_teams()
 
         id = entry.get('id')
         for team in team_list:
@@ -1110,14 +1105,14 @@ class FantasyQuery(commands.Cog):
             logger.info(f"[FantasyQuery][log_season] - {filename} already exists.")
             return
 
-        async with self.bot.state.fantasy_query_lock:
-            standings = self.bot.state.fantasy_query.get_all_standings(self.bot.state.league.num_teams)
+        async with self.bot.state.fantasy_query_lock.read():
+            standings = await self.bot.state.fantasy_query.get_all_standings()
 
         sorted_standings:list[tuple[int,TeamStandings]] = sorted(standings, key = lambda tup: int(tup[1].rank))
 
         standings_list = []
         for owner_id, standing in sorted_standings:
-            team_name = await utility.teamid_to_name(owner_id, self.bot.state.persistent_manager)
+            team_name = await utility.teamid_to_name(owner_id, self.bot.state.state_db)
             entry = {
                 'id':owner_id,
                 'team_name':team_name,
@@ -1165,6 +1160,7 @@ class FantasyQuery(commands.Cog):
 
 
     @tasks.loop(minutes=360)
+    @background
     async def store_data(self):
         if not self.bot.state.bot_features.log_season_enabled:
             logger.info("[FantasyQuery][store_data] - Season Log disabled.\n To resolve, run the 'enable_log' Command." )
@@ -1700,7 +1696,7 @@ class FantasyQuery(commands.Cog):
 
 
         # Generate rankings visualization for non-playoff weeks
-        df_raw = await self.bot.state.recap_manager.load_csv_formatted(self._matchup_csv)
+        df_raw = await self.bot.state.recap_manager.load_table(self._matchup_csv)
 
         # Generate cumulative points chart
         df = df_raw.copy()
@@ -1784,7 +1780,7 @@ class FantasyQuery(commands.Cog):
 
     async def wait_for_fantasy(self):
         while not self._ready:
-            async with self.bot.state.fantasy_query_lock:
+            async with self.bot.state.fantasy_query_lock.read():
                 fantasy_query = self.bot.state.fantasy_query
             if fantasy_query is not None:
                 self._ready = True
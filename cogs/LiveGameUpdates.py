@@ -192,7 +192,7 @@ class LiveGameUpdates(commands.Cog):
 
     async def wait_for_fantasy(self):
         while not self._ready:
-            async with self.bot.state.fantasy_query_lock:
+            async with self.bot.state.fantasy_query_lock.read():
                 fantasy_query = self.bot.state.fantasy_query
             if fantasy_query is not None:
                 self._ready = True
@@ -1,9 +1,11 @@
+import discord
+from discord import app_commands
 from discord.ext import  tasks,commands
 
 from pathlib import Path
 
 from yfpy.query import YahooFantasySportsQuery
-from fantasy import fantasyQuery
+from fantasy import AsyncFantasyQuery
 from datetime import datetime
 from zoneinfo import ZoneInfo
 
@@ -25,8 +27,15 @@ class MaintainFantasy(commands.Cog):
         self.parent_dir = self.current_dir.parent
         self._player_ids_filename = bot.state.player_ids_filename
         self._private_filename = bot.state.private_filename
+        self._stat_dict_template = bot.state.stat_dict_template
 
         self._bot_features = self.bot.state.bot_features
+        self.emb_color = self.bot.state.emb_color
+
+        # yahoo worker threads and shared rate limit (requests per second, burst)
+        self._query_workers = 4
+        self._query_rate = 1.0
+        self._query_burst = 5
 
 
     ###################################################
@@ -63,41 +72,149 @@ class MaintainFantasy(commands.Cog):
         elif time_remaining < 180:
             logger.info(f"[MaintainFantasy] - Token Valid: {time_remaining:.2f} seconds remaining until token refresh.")
 
+        await self.refresh_league_metadata()
 
-    async def refresh_fantasy(self):
-        """Refresh the fantasy object every hour."""
-        async with self.bot.state.fantasy_query_lock:
-            # set directory location of private.json for authentication
-            auth_dir = self.parent_dir / 'yfpyauth' 
 
+    async def refresh_league_metadata(self):
+        """Refetch the league when its metadata is stale, e.g. the week rolled over."""
+        async with self.bot.state.fantasy_query_lock.read():
+            fantasy_query = self.bot.state.fantasy_query
+            if fantasy_query is None or not fantasy_query.metadata.is_stale():
+                return
             try:
-                # game_id = None, defaults to the game ID for the current year.
-                yahoo_query = YahooFantasySportsQuery(
-                    league_id = os.getenv('LEAGUE_ID'),
-                    game_code = os.getenv('GAME_CODE').lower(),
-                    game_id = os.getenv('GAME_ID'),
-                    yahoo_consumer_key=os.getenv('CONSUMER_KEY'),
-                    yahoo_consumer_secret=os.getenv('CONSUMER_SECRET'),
-                    save_token_data_to_env_file=True,
-                    env_file_location=auth_dir,
-                )
-                
-                if yahoo_query is None:
-                    raise ValueError('Failed to initialize YahooFantasySportsQuery')
-                
+                await fantasy_query.refresh_league()
             except Exception as e:
-                logger.error(f'[MaintainFantasy] - Error: {e}')
-                logger.error(f'[MaintainFantasy] - Verify elements within yfpyauth/config.json and yfpyauth/{self._private_filename}')
-                await self.bot.close()
+                logger.error(f'[MaintainFantasy][refresh_league_metadata] - Error: {e}')
                 return
+
+            async with self.bot.state.league_lock:
+                self.bot.state.league = fantasy_query.league
+
+
+    async def refresh_fantasy(self):
+        """Refresh the yahoo token every hour, only rebuilding the fantasy object on first run or when rotation fails."""
+        # set directory location of private.json for authentication
+        auth_dir = self.parent_dir / 'yfpyauth' 
+
+        if self.bot.state.fantasy_query is not None:
+            # rotate credentials on the live query, readers keep going
+            try:
+                async with self.bot.state.fantasy_query_lock.read():
+                    await self.bot.state.fantasy_query.refresh_credentials(auth_dir)
+                logger.info('[MaintainFantasy] - Token Refreshed')
+                return
+            except Exception as e:
+                logger.error(f'[MaintainFantasy][refresh_fantasy] - Token refresh failed, re-authenticating. Error: {e}')
+
+        try:
+            # game_id = None, defaults to the game ID for the current year.
+            # OAuth handshake is blocking, keep it off the event loop
+            yahoo_query = await asyncio.to_thread(
+                YahooFantasySportsQuery,
+                league_id = os.getenv('LEAGUE_ID'),
+                game_code = os.getenv('GAME_CODE').lower(),
+                game_id = os.getenv('GAME_ID'),
+                yahoo_consumer_key=os.getenv('CONSUMER_KEY'),
+                yahoo_consumer_secret=os.getenv('CONSUMER_SECRET'),
+                save_token_data_to_env_file=True,
+                env_file_location=auth_dir,
+            )
+            
+            if yahoo_query is None:
+                raise ValueError('Failed to initialize YahooFantasySportsQuery')
             
-            # Set bot state to the new fantasy query object
-            self.bot.state.fantasy_query = fantasyQuery(yahoo_query)
+        except Exception as e:
+            logger.error(f'[MaintainFantasy] - Error: {e}')
+            logger.error(f'[MaintainFantasy] - Verify elements within yfpyauth/config.json and yfpyauth/{self._private_filename}')
+            await self.bot.close()
+            return
+
+        async with self.bot.state.fantasy_query_lock.write():
+            # Set bot state to the new fantasy query object, reusing the worker pool after the first run
+            if self.bot.state.fantasy_query is None:
+                stat_dict = await self.load_stat_dict(yahoo_query.game_id)
+                self.bot.state.fantasy_query = await AsyncFantasyQuery.create(
+                    yahoo_query,
+                    max_workers=self._query_workers,
+                    rate=self._query_rate,
+                    burst=self._query_burst,
+                    payload_store=self.bot.state.yahoo_cache_manager,
+                    stat_dict=stat_dict,
+                )
+                if not stat_dict:
+                    await self.store_stat_dict(yahoo_query.game_id, self.bot.state.fantasy_query.stat_dict)
+            else:
+                await self.bot.state.fantasy_query.rebind(yahoo_query)
+
+            # Set current League, fetched by the fantasyQuery constructor
+            async with self.bot.state.league_lock:
+                self.bot.state.league = self.bot.state.fantasy_query.league
+
+        lock_stats = self.bot.state.fantasy_query_lock.stats()
+        logger.info(f"[MaintainFantasy] - Fantasy Refesh Done. Lock wait avg read {lock_stats['read']['avg_wait']:.3f}s, max write {lock_stats['write']['max_wait']:.3f}s")
 
-            # Set current League
-            self.bot.state.league = self.bot.state.fantasy_query.get_league()['league']
 
-        logger.info('[MaintainFantasy] - Fantasy Refesh Done')
+    async def load_stat_dict(self, game_id) -> dict:
+        if game_id is None:
+            return {}
+        return await self.bot.state.persistent_manager.load_json(filename=self._stat_dict_template.format(game_id=game_id))
+
+
+    async def store_stat_dict(self, game_id, stat_dict:dict) -> None:
+        if game_id is None or not stat_dict:
+            return
+        await self.bot.state.persistent_manager.write_json(filename=self._stat_dict_template.format(game_id=game_id), data=stat_dict)
+        logger.info(f'[MaintainFantasy] - Stat categories stored for game {game_id}')
+
+
+    ###################################################
+    # Query Metrics
+    ###################################################
+
+    @tasks.loop(hours=1)
+    async def log_query_metrics(self):
+        fantasy_query = self.bot.state.fantasy_query
+        if fantasy_query is None:
+            return
+        logger.info(f'[MaintainFantasy][query_metrics]\n{fantasy_query.metrics().summary()}\n'
+                    f'cache {fantasy_query.cache_stats()}\n'
+                    f'lock {self.bot.state.fantasy_query_lock.stats()}')
+
+
+    @app_commands.checks.has_role(int(os.getenv('MANAGER_ROLE')))
+    @app_commands.command(name="query_metrics", description="Yahoo latency, errors and call volume per endpoint.")
+    async def query_metrics(self, interaction:discord.Interaction):
+        fantasy_query = self.bot.state.fantasy_query
+        if fantasy_query is None:
+            await interaction.response.send_message('Fantasy query not initialized yet.', ephemeral=True)
+            return
+
+        snapshot = fantasy_query.metrics().snapshot()
+        cache_stats = fantasy_query.cache_stats()
+        lock_stats = self.bot.state.fantasy_query_lock.stats()
+        token_wait = snapshot['token_wait']
+
+        embed = discord.Embed(title='Yahoo Query Metrics', description=f"Uptime {snapshot['uptime'] / 3600:.1f}h", color=self.emb_color)
+        embed.add_field(name='Cache', value=f"hit ratio {cache_stats['hit_ratio']:.0%}, {cache_stats['entries']} entries", inline=True)
+        embed.add_field(name='Token wait', value=f"p95 {token_wait['p95']:.2f}s, max {token_wait['max']:.2f}s", inline=True)
+        embed.add_field(name='Lock wait', value=f"read avg {lock_stats['read']['avg_wait']:.3f}s, write max {lock_stats['write']['max_wait']:.3f}s", inline=True)
+
+        callers = '\n'.join(f"{caller}: {counts['calls']} ({counts['per_day']:.0f}/day)" for caller, counts in snapshot['callers'].items())
+        embed.add_field(name='Calls by cog', value=callers or 'None', inline=False)
+
+        # embeds hold 25 fields, slowest endpoints first
+        endpoints = sorted(snapshot['endpoints'].items(), key = lambda item: item[1]['latency']['p95'], reverse=True)
+        for name, metrics in endpoints[:20]:
+            latency = metrics['latency']
+            hit_ratio = f"{metrics['hit_ratio']:.0%}" if metrics['hit_ratio'] is not None else '-'
+            embed.add_field(
+                name=name,
+                value=f"{latency['count']} req, p50 {latency['p50']:.2f}s, p95 {latency['p95']:.2f}s\n"
+                      f"{metrics['errors']} err, {metrics['retries']} retry, cache {hit_ratio}",
+                inline=True,
+            )
+
+        await interaction.response.send_message(embed=embed, ephemeral=True)
 
 
     ###################################################
@@ -110,6 +227,7 @@ class MaintainFantasy(commands.Cog):
         await self.bot.state.bot_features.setup_features()
 
         self.token_expiration.start()
+        self.log_query_metrics.start()
         logger.info('[MaintainFantasy] - Yahoo Fantasy Initialized\n  ..')
 
 
@@ -122,12 +240,20 @@ class MaintainFantasy(commands.Cog):
         logger.info(f'[MaintainFantasy][token_expiration] - Error: {error}\n')
 
 
+    @log_query_metrics.error
+    async def log_query_metrics_error(self,error):
+        logger.info(f'[MaintainFantasy][log_query_metrics] - Error: {error}\n')
+
+
     ###################################################
     # Handle Exit           
     ###################################################
 
     def cog_unload(self):
         self.token_expiration.cancel()
+        self.log_query_metrics.cancel()
+        if self.bot.state.fantasy_query is not None:
+            self.bot.state.fantasy_query.close()
         logger.info('[MaintainFantasy] - Cog Unload')
 
 
@@ -11,8 +11,10 @@ from bet_vault.vault import Vault
 from datetime import datetime, timedelta, date
 
 from yfpy.models import Matchup
+from query_helpers.raw_records import MatchupRecord
 
 from cogs_helpers import FantasyHelper
+from query_helpers.rate_limiter import background
 from collections import deque
 import utility
 
@@ -46,8 +48,8 @@ class MaintainVault(commands.Cog):
 
         # file managers
         self._persistent_manager = self.bot.state.persistent_manager
-        self._vault_manager = self.bot.state.vault_manager
         self._discord_auth_manager = self.bot.state.discord_auth_manager
+        self._state_db = self.bot.state.state_db
 
         # vault 
         self._vault:Vault = None
@@ -60,9 +62,6 @@ class MaintainVault(commands.Cog):
         self._members_filename = bot.state.members_filename
         self._funds_distribution_log = bot.state.weekly_funds_filename
         self._week_dates_filename = bot.state.week_dates_filename
-        self._vault_accounts_filename = bot.state.vault_accounts_filename
-        self._vault_slap_contracts_filename = bot.state.vault_slap_contracts_filename
-        self._vault_wager_contracts_filename = bot.state.vault_wager_contracts_filename
         self._challenge_filename = bot.state.challenge_config_filename
         
 
@@ -103,7 +102,7 @@ class MaintainVault(commands.Cog):
     # Format matchup dict
     ###################################################
 
-    async def format_matchups_to_dict(self, matchups_list:list[Matchup]):
+    async def format_matchups_to_dict(self, matchups_list:list[Matchup | MatchupRecord]):
         data_dict = {}
         try:
             for matchup in matchups_list:
@@ -147,8 +146,9 @@ class MaintainVault(commands.Cog):
 
 
     async def get_matchup_data(self, week) -> dict[str:int]:
-        async with self.bot.state.fantasy_query_lock:
-            matchups_list:list[Matchup] = self.bot.state.fantasy_query.get_scoreboard(week).matchups
+        # only a few fields are read, skip the yfpy model graph
+        async with self.bot.state.fantasy_query_lock.read():
+            matchups_list:list[MatchupRecord] = await self.bot.state.fantasy_query.get_scoreboard_records(week)
         
         if matchups_list is None:
             raise ValueError('match_ups list is None.')
@@ -165,11 +165,11 @@ class MaintainVault(commands.Cog):
 
 
     async def display_wager_results(self, contract:Vault.GroupWagerContract, team_1_pts:float, team_2_pts:float, total_points:float, closest_prediction:Vault.GroupWagerContract.Prediction, winners_list:list[Vault.GroupWagerContract.Prediction]):
-        team_1_discord = await utility.teamid_to_discord(team_id=contract.team_1_id, file_manager=self._persistent_manager)
-        team_2_discord = await utility.teamid_to_discord(team_id=contract.team_2_id, file_manager=self._persistent_manager)
+        team_1_discord = await utility.teamid_to_discord(team_id=contract.team_1_id, state_db=self._state_db)
+        team_2_discord = await utility.teamid_to_discord(team_id=contract.team_2_id, state_db=self._state_db)
 
-        team_1_name = await utility.discord_to_name(discord_id=team_1_discord, file_manager=self._persistent_manager)
-        team_2_name = await utility.discord_to_name(discord_id=team_2_discord, file_manager=self._persistent_manager)
+        team_1_name = await utility.discord_to_name(discord_id=team_1_discord, state_db=self._state_db)
+        team_2_name = await utility.discord_to_name(discord_id=team_2_discord, state_db=self._state_db)
         title = f"{team_1_name} VS {team_2_name}"
         if len(title) >= 40:
             title = f"{team_1_name.split(" ")[-1]} VS {team_2_name.split(" ")[-1]}"
@@ -206,8 +206,8 @@ class MaintainVault(commands.Cog):
             description = f"{contract.challenger.discord_tag} defeated by {contract.challengee.discord_tag} 🏆\nWinner takes {contract.winnings} tokens."
             image = self.challengee_wins_link
 
-        challenger_team_name = await utility.discord_to_name(discord_id=contract.challenger.discord_id, file_manager=self._persistent_manager)
-        challengee_team_name = await utility.discord_to_name(discord_id=contract.challengee.discord_id, file_manager=self._persistent_manager)
+        challenger_team_name = await utility.discord_to_name(discord_id=contract.challenger.discord_id, state_db=self._state_db)
+        challengee_team_name = await utility.discord_to_name(discord_id=contract.challengee.discord_id, state_db=self._state_db)
 
         title = f"{challenger_team_name} VS {challengee_team_name}"
         if len(title) >= 40:
@@ -442,7 +442,7 @@ class MaintainVault(commands.Cog):
             prediction = self.wagers_deque[int(self.selected_matchups_index)]
             chosen_yahoo_id = prediction.team_1_id
 
-            chosen_discord_id = await utility.teamid_to_discord(chosen_yahoo_id,self.outer._persistent_manager)
+            chosen_discord_id = await utility.teamid_to_discord(chosen_yahoo_id, self.outer._state_db)
             prediction_bank_account:Vault.BankAccount = await Vault.bank_account_by_discord_id(discord_id=str(chosen_discord_id))
             wager:Vault.GroupWagerContract = await Vault.get_wager(fantasy_id = prediction_bank_account.fantasy_id)
             
@@ -460,7 +460,7 @@ class MaintainVault(commands.Cog):
             prediction = self.wagers_deque[int(self.selected_matchups_index)]
             chosen_yahoo_id = prediction.team_2_id
 
-            chosen_discord_id = await utility.teamid_to_discord(chosen_yahoo_id,self.outer._persistent_manager)
+            chosen_discord_id = await utility.teamid_to_discord(chosen_yahoo_id, self.outer._state_db)
             prediction_bank_account:Vault.BankAccount = await Vault.bank_account_by_discord_id(discord_id=str(chosen_discord_id))
             wager:Vault.GroupWagerContract = await Vault.get_wager(fantasy_id = prediction_bank_account.fantasy_id)
             
@@ -494,8 +494,8 @@ class MaintainVault(commands.Cog):
         async def callback(self, interaction: discord.Interaction):
             index = int(self.values[0])
             wager = self.wagers_deque[index]
-            team_1_name = await utility.teamid_to_name(int(wager.team_1_id), self.outer._persistent_manager)
-            team_2_name = await utility.teamid_to_name(int(wager.team_2_id), self.outer._persistent_manager)
+            team_1_name = await utility.teamid_to_name(int(wager.team_1_id), self.outer._state_db)
+            team_2_name = await utility.teamid_to_name(int(wager.team_2_id), self.outer._state_db)
 
             view = MaintainVault.MatchupSelectConfirmView(self.outer,self.values, self.options, self.wagers_deque, team_1_name, team_2_name)
             await interaction.response.send_message("Place your wager.", view=view, ephemeral=True)
@@ -510,8 +510,8 @@ class MaintainVault(commands.Cog):
             team_1_id = value.team_1_id
             team_2_id = value.team_2_id
 
-            team_1_name = await utility.teamid_to_name(team_1_id, self._persistent_manager)
-            team_2_name = await utility.teamid_to_name(team_2_id, self._persistent_manager)
+            team_1_name = await utility.teamid_to_name(team_1_id, self._state_db)
+            team_2_name = await utility.teamid_to_name(team_2_id, self._state_db)
 
             select.add_option(label=f"{team_1_name} VS {team_2_name}", value=f'{i}', default=False)
         return select
@@ -564,7 +564,7 @@ class MaintainVault(commands.Cog):
         today = datetime.today()
         embed = discord.Embed(title='Token Leaderboard', description='Current token standings.', color=self.emb_color, timestamp=today)
 
-        accounts = await self._vault_manager.load_json(filename=self._vault_accounts_filename)
+        accounts = await self._state_db.load_accounts()
         sorted_accounts = sorted(accounts, key=lambda x:int(x.get('money')), reverse=True)
 
         for account in sorted_accounts:
@@ -582,7 +582,7 @@ class MaintainVault(commands.Cog):
     @app_commands.command(name='enable_vault', description='Enables Vault and wagers. Only run after binding all users.')
     async def enable_vault(self,interaction:discord.Interaction):
         await interaction.response.defer()
-        members = await self._persistent_manager.load_json(self._members_filename)
+        members = await self._state_db.load_members()
         for member in members:
             id = member.get('discord_id')
             if not id:
@@ -713,6 +713,7 @@ class MaintainVault(commands.Cog):
 
 
     @tasks.loop(minutes=1440)
+    @background
     async def update_wagers(self):
         await self.create_current_week_wagers()
         
@@ -744,6 +745,7 @@ class MaintainVault(commands.Cog):
     
 
     @tasks.loop(minutes=1440)
+    @background
     async def week_start_check(self):
         data = await self._persistent_manager.load_json(filename=self._funds_distribution_log)
 
@@ -872,7 +874,7 @@ class MaintainVault(commands.Cog):
     ###################################################
 
     async def construct_new_bank_accounts(self) -> dict[str,Vault.BankAccount]:
-        members:list[dict] = await self._persistent_manager.load_json(filename = self._members_filename)
+        members:list[dict] = await self._state_db.load_members()
 
         if not members:
             raise AttributeError(f'[MaintainVault][construct_new_bank_accounts] - Error: expected {self._members_filename} to be populated.' )
@@ -894,10 +896,7 @@ class MaintainVault(commands.Cog):
         
 
     async def get_member_dict(self, fantasy_id:str):
-        members:list[dict] = await self._persistent_manager.load_json(filename = self._members_filename)
-        for member in members:
-            if member.get('id') == fantasy_id:
-                return member
+        return await self._state_db.get_member(fantasy_id)
 
 
     async def update_account_names(self):
@@ -912,14 +911,14 @@ class MaintainVault(commands.Cog):
 
     async def store_accounts(self):
         serialized_accounts = await self._vault.serialize_accounts()
-        await self._vault_manager.write_json(self._vault_accounts_filename, serialized_accounts)
+        await self._state_db.store_accounts(serialized_accounts)
         
 
     async def store_contracts(self):
         serialized_slap_contracts = await self._vault.serialize_contracts(contract_type=Vault.SlapContract.__name__)
         serialized_wager_contracts = await self._vault.serialize_contracts(contract_type=Vault.GroupWagerContract.__name__)
-        await self._vault_manager.write_json(self._vault_slap_contracts_filename, serialized_slap_contracts)
-        await self._vault_manager.write_json(self._vault_wager_contracts_filename, serialized_wager_contracts)
+        await self._state_db.store_contracts(Vault.SlapContract.__name__, serialized_slap_contracts)
+        await self._state_db.store_contracts(Vault.GroupWagerContract.__name__, serialized_wager_contracts)
 
 
     async def store_all(self):
@@ -928,16 +927,10 @@ class MaintainVault(commands.Cog):
         logger.info('[MaintainVault][store_accounts] - Bank accounts, slap contracts and wagers saved.')
 
 
-    async def load_filename(self, filename):
-        data = await self._vault_manager.load_json(filename)
-        if data:
-            return data
-        return None
-
     async def load_all(self) -> Vault:
-        serialized_accounts = await self.load_filename(self._vault_accounts_filename)
-        serialized_slap_contracts = await self.load_filename(self._vault_slap_contracts_filename)
-        serialized_wager_contracts = await self.load_filename(self._vault_wager_contracts_filename)
+        serialized_accounts = await self._state_db.load_accounts()
+        serialized_slap_contracts = await self._state_db.load_contracts(Vault.SlapContract.__name__) or None
+        serialized_wager_contracts = await self._state_db.load_contracts(Vault.GroupWagerContract.__name__) or None
 
         if not serialized_accounts:
             return None
@@ -979,7 +972,7 @@ class MaintainVault(commands.Cog):
 
     async def wait_for_fantasy_and_memlist(self):
         while not self._ready_to_init:
-            async with self.bot.state.fantasy_query_lock:
+            async with self.bot.state.fantasy_query_lock.read():
                 fantasy_query = self.bot.state.fantasy_query
             async with self.bot.state.memlist_ready_lock:
                 memlist_ready = self.bot.state.memlist_ready
@@ -5,6 +5,7 @@ from discord.ext import  commands
 from pathlib import Path
 
 from yfpy.models import League, Player
+from query_helpers.rate_limiter import background
 
 import asyncio
 import os
@@ -41,12 +42,13 @@ class PlayerIDs(commands.Cog):
             return True
 
 
+    @background
     async def request_player_info(self):
         start = 0
         found = False
         while found is False:
-            async with self.bot.state.fantasy_query_lock:
-                league:League = self.bot.state.fantasy_query.get_players(start=start)['league']
+            async with self.bot.state.fantasy_query_lock.read():
+                league:League = (await self.bot.state.fantasy_query.get_players(start=start))['league']
             players_list:list[Player] = league.players
 
             # check if null or empty league or players_list
@@ -63,9 +65,6 @@ class PlayerIDs(commands.Cog):
 
             await self.bot.state.persistent_manager.write_json(self._player_data_filename, self._players)
             start += 25
-
-            # pace requests to avoid rate limit
-            await asyncio.sleep(2)
             
 
     ############################################################################
@@ -135,7 +134,7 @@ class PlayerIDs(commands.Cog):
     
     async def wait_for_fantasy(self):
         while not self._ready:
-            async with self.bot.state.fantasy_query_lock:
+            async with self.bot.state.fantasy_query_lock.read():
                 fantasy_query = self.bot.state.fantasy_query
             if fantasy_query is not None:
                 self._ready = True
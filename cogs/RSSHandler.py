@@ -182,7 +182,7 @@ class RSSHandler(commands.Cog):
 
 
     async def update_names(self, team_list:list[Team]) -> list[dict]:
-        members_list = await self.bot.state.persistent_manager.load_json(self._members_filename)
+        members_list = await self.bot.state.state_db.load_members()
 
         for team in team_list:
             for member in members_list:
@@ -192,19 +192,19 @@ class RSSHandler(commands.Cog):
 
 
     async def update_memlist(self, team_list:list[Team]) -> None:
-        if await self.bot.state.persistent_manager.path_exists(self._members_filename):
+        if await self.bot.state.state_db.has_members():
             # update player names in list
             members_list = await self.update_names(team_list)
         else:
             # compose new member list and store it
             members_list = await self.compose_memlist(team_list)
 
-        await self.bot.state.persistent_manager.write_json(filename=self._members_filename, data=members_list)
+        await self.bot.state.state_db.store_members(members_list)
 
 
     async def wait_for_fantasy(self):
         while not self._ready:
-            async with self.bot.state.fantasy_query_lock:
+            async with self.bot.state.fantasy_query_lock.read():
                 fantasy_query = self.bot.state.fantasy_query
             if fantasy_query is not None:
                 self._ready = True
@@ -216,8 +216,8 @@ class RSSHandler(commands.Cog):
     async def on_ready(self):
         await self.wait_for_fantasy()
 
-        async with self.bot.state.fantasy_query_lock:
-            team_list:list[Team] =self.bot.state.fantasy_query.get_teams()
+        async with self.bot.state.fantasy_query_lock.read():
+            team_list:list[Team] = await self.bot.state.fantasy_query.get_teams()
         await self.update_memlist(team_list)
         async with self.bot.state.memlist_ready_lock:
             self.bot.state.memlist_ready = True
@@ -47,10 +47,17 @@ class TradeValue(commands.Cog):
         self._trade_value_config_filename = bot.state.trade_value_config_filename
         self._trade_transactions_filename = bot.state.trade_transactions_filename
 
+        # trade_transactions.csv indexed by transaction id, rebuilt when the file changes
+        self._trades_by_id:pd.DataFrame = None
+        self._trades_version:tuple = None
+
         # Log data
         self._roster_csv = bot.state.roster_csv
         self._matchup_csv = bot.state.matchup_csv
 
+        # roster_value columns the radar charts read
+        self.RADAR_COLUMNS = ['owner_id', 'owner_name', 'week', 'primary_position', 'name', 'redraft_value']
+
 
     async def request_values(self, url ="https://api.fantasycalc.com/values/current?isDynasty=True&numQbs=1&numTeams=10&ppr=0.5"):
         
@@ -528,18 +535,28 @@ class TradeValue(commands.Cog):
     # add players to compare    
     ###################################################
 
-    async def refine_transaction_df(self, transaction_id:int):
-        df_raw = await self.bot.state.persistent_manager.load_csv_formatted(filename=self._trade_transactions_filename)
-        df = df_raw.copy()
-
-        df['id'] = pd.to_numeric(df['id'], errors='coerce').fillna(-1).astype(int)
-        df['value'] = pd.to_numeric(df['value'], errors='coerce').fillna(-1).astype(int)
-        
-        exists = (df['id'] == transaction_id).any()
-        if not exists:
+    async def trades_by_id(self) -> Optional[pd.DataFrame]:
+        version = self.bot.state.persistent_manager.file_version(self._trade_transactions_filename)
+        if version is None:
             return None
 
-        df = df[df['id'] == transaction_id]
+        if version != self._trades_version:
+            df = await self.bot.state.persistent_manager.load_csv_formatted(filename=self._trade_transactions_filename)
+            if df is None:
+                return None
+            df['id'] = pd.to_numeric(df['id'], errors='coerce').fillna(-1).astype(int)
+            df['value'] = pd.to_numeric(df['value'], errors='coerce').fillna(-1).astype(int)
+            self._trades_by_id = df.set_index('id', drop=False).sort_index(kind='stable')
+            self._trades_version = version
+        return self._trades_by_id
+
+
+    async def refine_transaction_df(self, transaction_id:int):
+        trades = await self.trades_by_id()
+        if trades is None or transaction_id not in trades.index:
+            return None, None, None
+
+        df = trades.loc[[transaction_id]].reset_index(drop=True)
         df['cumulative_value'] =  df.groupby(['source_team_key'])['value'].cumsum()
         df = df.sort_values(by='cumulative_value', ascending=False).reset_index(drop=True)
 
@@ -787,14 +804,14 @@ class TradeValue(commands.Cog):
             logger.warning('[TradeValue][season_team_value_comparison] - Attempt failed. Season has not begun.')
             return
 
-        user_team_id:str = await utility.discord_to_teamid(interaction.user.id, self.bot.state.persistent_manager)
-        opponent_team_id:str = await utility.discord_to_teamid(discord_user.id, self.bot.state.persistent_manager)
+        user_team_id:str = await utility.discord_to_teamid(interaction.user.id, self.bot.state.state_db)
+        opponent_team_id:str = await utility.discord_to_teamid(discord_user.id, self.bot.state.state_db)
 
         if not user_team_id or not opponent_team_id:
             await interaction.followup.send('Unable to find valid user IDs.')
             return
 
-        df_roster = await self.bot.state.recap_manager.load_csv_formatted(self._roster_csv)
+        df_roster = await self.bot.state.recap_manager.load_table(self._roster_csv, columns=self.RADAR_COLUMNS)
 
         df_plot_ready, df_cleaned_full, all_weeks, all_positions = await self.radar_DataFrame(df_roster)
         buffer_list = await self.generate_season_radar_chart(df_plot_ready, df_cleaned_full, all_weeks, all_positions, [int(user_team_id), int(opponent_team_id)])
@@ -814,8 +831,8 @@ class TradeValue(commands.Cog):
     @app_commands.describe(discord_user="Discord Tag")
     async def team_value_comparison(self, interaction:discord.Interaction, discord_user:discord.User):
         await interaction.response.defer()
-        user_team_id:str = await utility.discord_to_teamid(interaction.user.id, self.bot.state.persistent_manager)
-        opponent_team_id:str = await utility.discord_to_teamid(discord_user.id, self.bot.state.persistent_manager)
+        user_team_id:str = await utility.discord_to_teamid(interaction.user.id, self.bot.state.state_db)
+        opponent_team_id:str = await utility.discord_to_teamid(discord_user.id, self.bot.state.state_db)
 
         if not user_team_id or not opponent_team_id:
             await interaction.followup.send('Unable to find valid user IDs.')
@@ -830,7 +847,7 @@ class TradeValue(commands.Cog):
             logger.warning('[TradeValue][season_team_value_comparison] - Attempt failed. Season has not begun.')
             return
         
-        df_roster = await self.bot.state.recap_manager.load_csv_formatted(self._roster_csv)
+        df_roster = await self.bot.state.recap_manager.load_table(self._roster_csv, columns=self.RADAR_COLUMNS)
 
         df_plot_ready, df_cleaned_full, _, all_positions = await self.radar_DataFrame(df_roster)
         buffer = await self.generate_radar_chart(df_plot_ready, df_cleaned_full, current_week, all_positions, [int(user_team_id), int(opponent_team_id)])
@@ -911,7 +928,7 @@ class TradeValue(commands.Cog):
 
     async def wait_for_fantasy(self):
         while not self._ready:
-            async with self.bot.state.fantasy_query_lock:
+            async with self.bot.state.fantasy_query_lock.read():
                 fantasy_query = self.bot.state.fantasy_query
             if fantasy_query is not None:
                 self._ready = True
@@ -2,9 +2,12 @@ import discord
 from discord.ext import  tasks,commands
 
 from pathlib import Path
+from typing import Optional
 
 from yfpy import utils
 from yfpy.models import League, Transaction
+from query_helpers.rate_limiter import background
+from query_helpers.transaction_cache import TransactionCache
 
 from difflib import get_close_matches
 from datetime import datetime
@@ -26,13 +29,28 @@ class TransactionsLog(commands.Cog):
 
         self.emb_color = self.bot.state.emb_color
 
-        self._transactions_filename = bot.state.transactions_filename
         self._private_filename = bot.state.private_filename
         self._trade_transactions_filename = bot.state.trade_transactions_filename
 
         self._persistent_manager = bot.state.persistent_manager
+        self._state_db = bot.state.state_db
 
-        self.transactions:dict = None
+        # ids already in state_db, loaded once, polls only check new pages against it
+        self._transaction_ids:set[int] = None
+        # recent transactions decoded at ingest, for posting and trade rows
+        self._decoded = TransactionCache(max_entries=512)
+        self.PAGE_SIZE = 25
+        self.WATERMARK_KEY = 'transactions_watermark'
+        self.BACKFILL_KEY = 'transactions_backfill'
+
+        # trade table, appended to from new trades only, rebuilt when missing or from an older version
+        self.TRADE_COLUMNS = ['source_team', 'source_team_key', 'destination_team', 'destination_team_key', 'name', 'id', 'value', 'timestamp']
+        self._trade_csv_checked = False
+        self._new_trades:list[dict] = []
+
+        # fuzzy matched player values, reset when TradeValue swaps in a new value_map
+        self._player_values:dict[str, Optional[int]] = {}
+        self._player_values_source:dict = None
 
 
     ###################################################
@@ -40,16 +58,20 @@ class TransactionsLog(commands.Cog):
     ###################################################
 
     async def get_player_value(self, full_name:str):
+        # value_map is replaced on refresh, never mutated
         async with self.bot.state.value_map_lock:
-            closest_key = get_close_matches(full_name,self.bot.state.value_map,n=1,cutoff=0.6)
+            value_map = self.bot.state.value_map
 
-        if not closest_key:
+        if value_map is None:
             return None
+        if value_map is not self._player_values_source:
+            self._player_values = {}
+            self._player_values_source = value_map
 
-        async with self.bot.state.value_map_lock:
-            player_obj = self.bot.state.value_map[closest_key[0]]
-        
-        return player_obj['redraftValue']
+        if full_name not in self._player_values:
+            closest_key = get_close_matches(full_name,value_map,n=1,cutoff=0.6)
+            self._player_values[full_name] = value_map[closest_key[0]]['redraftValue'] if closest_key else None
+        return self._player_values[full_name]
 
 
     async def formatted_trade_entry(self, player:dict, id:str, timestamp):
@@ -111,31 +133,47 @@ class TransactionsLog(commands.Cog):
         return entries
 
 
-    async def transactions_dict_to_list(self):
+    async def trade_rows(self, transactions:list[dict]) -> pd.DataFrame:
         all_trades:list = []
-        for id,_ in self.transactions.items():
-            transaction:dict = await self.unpack_transaction(id)
-            timestamp = transaction.get('timestamp')
-            entry = await self.parse_trade_players(transaction.get('players'), id, timestamp)
+        for transaction in transactions:
+            if transaction.get('type') != 'trade':
+                continue
+            entry = await self.parse_trade_players(transaction.get('players'), str(transaction.get('transaction_id')), transaction.get('timestamp'))
 
             if entry:
-                all_trades = all_trades + entry
-        return pd.DataFrame(all_trades)
+                all_trades.extend(entry)
+        return pd.DataFrame(all_trades, columns=self.TRADE_COLUMNS)
 
 
     async def create_new_trades_csv(self):
-        if not self.transactions:
-            empty_df = pd.DataFrame(columns=['source_team', 'source_team_key', 'destination_team', 'destination_team_key', 'name', 'id']) 
-            await self._persistent_manager.write_csv_formatted(self._trade_transactions_filename, empty_df)
-        else:
-            df = await self.transactions_dict_to_list()
-            await self._persistent_manager.write_csv_formatted(self._trade_transactions_filename, df)
+        transactions = await self._state_db.load_transactions()
+        decoded = []
+        for transaction_id, payload in transactions.items():
+            transaction = self._decoded.get(transaction_id) or self.decode_transaction(payload)
+            if transaction is not None:
+                decoded.append(transaction)
+        df = await self.trade_rows(decoded)
+        await self._persistent_manager.write_csv_formatted(self._trade_transactions_filename, df)
 
 
     async def update_trade_csv(self):
-        # check if csv is already created
-        logger.info('[TransactionsLog] - .. Done')
-        await self.create_new_trades_csv()
+        # trades stored while this runs stay queued for the next update
+        pending = len(self._new_trades)
+
+        header = await self._persistent_manager.csv_header(self._trade_transactions_filename)
+        if header != self.TRADE_COLUMNS:
+            # missing, or written by an older version, the rebuild includes the queued trades
+            logger.info('[TransactionsLog] - Rebuilding trade table.')
+            await self.create_new_trades_csv()
+        else:
+            df = await self.trade_rows(self._new_trades[:pending])
+            if not df.empty:
+                await self._persistent_manager.append_csv_formatted(self._trade_transactions_filename, df)
+
+        # dropped only once written, a failure above leaves them queued
+        del self._new_trades[:pending]
+        self._trade_csv_checked = True
+        logger.info('[TransactionsLog] - Trade table updated.')
 
 
 
@@ -212,7 +250,7 @@ class TransactionsLog(commands.Cog):
             logger.error(f'[TransactionLog] - Error: {e}')
             
 
-    async def post_transaction(self, transaction_id:str):
+    async def post_transaction(self, transaction_id:str, transaction:dict = None):
         """Post a transaction to the transactions channel."""
         logger.info('[TransactionLog] - Posting Transaction')
         async with self.bot.state.transactions_channel_id_lock:
@@ -224,8 +262,9 @@ class TransactionsLog(commands.Cog):
 
         logger.info(f'[TransactionLog] - send channel : {channel}')
 
-        # Unpack transaction
-        transaction:dict = await self.unpack_transaction(str(transaction_id))
+        # Unpack transaction unless the caller already has it
+        if transaction is None:
+            transaction = await self.unpack_transaction(str(transaction_id))
         if transaction is None:
             logger.warning(f'[TransactionLog] - Transaction not found: {transaction_id}')
             return
@@ -246,72 +285,161 @@ class TransactionsLog(commands.Cog):
         await channel.send(embed = embed)
 
 
-    async def add_new_transactions(self,transaction):
-        """Check if a transaction is new."""
-        if not self.transactions or str(transaction.transaction_id) not in self.transactions:
-            # Convert to dict entry with transaction_id as key
-            dict_entry = utils.jsonify_data(transaction)
+    async def load_transaction_ids(self):
+        if self._transaction_ids is None:
+            self._transaction_ids = await self._state_db.transaction_ids()
+            logger.info(f'[TransactionsLog] - {len(self._transaction_ids)} stored transactions indexed.')
 
-            # Add transaction to self.transactions
-            self.transactions[str(transaction.transaction_id)] = dict_entry
-            logger.info(f'[TransactionsLog] - New transaction found: {transaction.transaction_id}')
 
-            # Post transaction to channel
-            await self.post_transaction(transaction.transaction_id)
-            
+    async def load_watermark(self) -> dict:
+        """Newest stored transaction, set up from the stored ids when upgrading from a full transactions history."""
+        watermark = await self._state_db.get_meta(self.WATERMARK_KEY)
+        if watermark is None and self._transaction_ids:
+            newest_id = max(self._transaction_ids)
+            newest = await self.unpack_transaction(str(newest_id)) or {}
+            watermark = {'transaction_id': newest_id, 'timestamp': newest.get('timestamp')}
+            await self._state_db.set_meta(self.WATERMARK_KEY, watermark)
+            await self._state_db.set_meta(self.BACKFILL_KEY, {'start': 0, 'complete': True})
+        return watermark
+
+
+    async def advance_watermark(self, watermark:dict, transactions:list[Transaction]) -> dict:
+        newest = max(transactions, key = lambda transaction: int(transaction.transaction_id))
+        if watermark is None or int(newest.transaction_id) > watermark.get('transaction_id', 0):
+            watermark = {'transaction_id': int(newest.transaction_id), 'timestamp': newest.timestamp}
+            await self._state_db.set_meta(self.WATERMARK_KEY, watermark)
+        return watermark
+
+
+    async def fetch_transactions(self, start:int) -> list[Transaction]:
+        """One page of league transactions, newest first."""
+        async with self.bot.state.fantasy_query_lock.read():
+            league:League = (await self.bot.state.fantasy_query.check_recent_transactions(start=start, count=self.PAGE_SIZE))['league']
+
+        transactions = league.transactions if league is not None else None
+        if not transactions:
+            return []
+        # yfpy unpacks a single entry page to the entry itself
+        return transactions if isinstance(transactions, list) else [transactions]
+
+
+    async def add_new_transactions(self, transaction, post:bool = True) -> bool:
+        """Append a transaction unless it is already stored, posting it when asked. True when it was new."""
+        transaction_id = int(transaction.transaction_id)
+        if transaction_id in self._transaction_ids:
             return False
-        else:
-            logger.info(f'[TransactionsLog] - Transaction already exists: {transaction.transaction_id}')
-            return True
 
+        # Convert to a JSON entry, appended under its transaction_id
+        dict_entry = self.encode_transaction(transaction)
+        if not await self._state_db.add_transaction(transaction_id, dict_entry):
+            return False
+        # indexed once stored, a failed insert is retried next poll
+        self._transaction_ids.add(transaction_id)
+
+        logger.info(f'[TransactionsLog] - New transaction found: {transaction.transaction_id}')
+        transaction_dict = json.loads(dict_entry)
+        self._decoded.set(transaction_id, transaction_dict)
+        if transaction_dict.get('type') == 'trade':
+            self._new_trades.append(transaction_dict)
 
-    async def update_transactions(self):
-        """Get recent transactions."""
+        if post:
+            # Post transaction to channel
+            await self.post_transaction(transaction.transaction_id, transaction_dict)
+        return True
+
+
+    async def update_transactions(self) -> bool:
+        """Store and post transactions newer than the watermark, then resume any unfinished backfill. True when anything was stored."""
+        await self.load_transaction_ids()
+        watermark = await self.load_watermark()
+        if watermark is None:
+            # fresh install, history is stored without being posted
+            return await self.backfill_transactions()
+
+        new_transactions = []
         start = 0
-        found = False
-        while found is False:
-            async with self.bot.state.fantasy_query_lock:
-                league:League = self.bot.state.fantasy_query.check_recent_transactions(start=start)['league']
-            transactions:Transaction = league.transactions
-
-            if league is None or transactions is None:
-                logger.info('[TransactionsLog] - No transactions found')
+        while True:
+            page = await self.fetch_transactions(start)
+            newer = [transaction for transaction in page if int(transaction.transaction_id) > watermark['transaction_id']]
+            new_transactions += newer
+
+            # steady state is a single page, more only when over PAGE_SIZE arrived between polls
+            if len(newer) < self.PAGE_SIZE:
+                break
+            start += self.PAGE_SIZE
+
+        # oldest first, so the channel reads in order
+        stored = 0
+        for transaction in reversed(new_transactions):
+            stored += await self.add_new_transactions(transaction)
+        if new_transactions:
+            await self.advance_watermark(watermark, new_transactions)
+        logger.info(f'[TransactionsLog] - Updated Transactions, {stored} new.')
+
+        backfill = await self._state_db.get_meta(self.BACKFILL_KEY, {})
+        if not backfill.get('complete'):
+            stored += await self.backfill_transactions()
+        return stored > 0
+
+
+    async def backfill_transactions(self) -> int:
+        """
+        Walk the league history from the saved checkpoint, storing without posting.
+            Pages go through the shared rate limiter at background priority. The checkpoint is
+            saved after every page, so a restart picks up where it stopped. New transactions only
+            push history deeper, so resuming at the saved offset may re-read entries but never skips one.
+        """
+        checkpoint = await self._state_db.get_meta(self.BACKFILL_KEY) or {'start': 0, 'complete': False}
+        start = checkpoint['start']
+        watermark = await self._state_db.get_meta(self.WATERMARK_KEY)
+        logger.info(f'[TransactionsLog][backfill] - Resuming transaction history at {start}.')
+
+        stored = 0
+        while True:
+            page = await self.fetch_transactions(start)
+            for transaction in page:
+                stored += await self.add_new_transactions(transaction, post=False)
+            if page:
+                watermark = await self.advance_watermark(watermark, page)
+
+            start += len(page)
+            complete = len(page) < self.PAGE_SIZE or min(int(transaction.transaction_id) for transaction in page) <= 1
+            await self._state_db.set_meta(self.BACKFILL_KEY, {'start': start, 'complete': complete})
+            if complete:
                 break
 
-            for transaction in transactions:
-                found = await self.add_new_transactions(transaction)
-                
-                if int(transaction.transaction_id) <= 1:
-                    found = True
-                
-                if found:
-                    break
-
-            # Increment start by 25
-            start += 25
-
-            # Pace api calls
-            await asyncio.sleep(10)
-         
-            # Update transactions .json file
-            await self.bot.state.persistent_manager.write_json(filename=self._transactions_filename, data=self.transactions)
-            logger.info('[TransactionsLog] - Updated Transactions.')
-        
-        return found
+        logger.info(f'[TransactionsLog][backfill] - Transaction history stored, {stored} transactions added.')
+        return stored
+
+
+    @staticmethod
+    def encode_transaction(transaction:Transaction) -> str:
+        """jsonify_data without the indent, the stored form is read back with json.loads alone"""
+        return json.dumps(transaction, separators=(',', ':'), ensure_ascii=False, default=utils.complex_json_handler)
+
+
+    def decode_transaction(self, payload:str):
+        """Decode a stored transaction payload"""
+        try:
+            return json.loads(payload)
+        except Exception as e:
+            logger.error(f'[TransactionsLog] - Error unpacking transaction: {e}')
+            return None
 
 
     async def unpack_transaction(self, transaction_id:str):
-        """Unpack a transaction"""
-        if transaction_id in self.transactions:
-            try:
-                transactions_string = utils.unpack_data(self.transactions[transaction_id], parent_class=Transaction)
-                transaction_dict = json.loads(transactions_string)
-                return transaction_dict
-            except Exception as e:
-                logger.error(f'[TransactionsLog] - Error unpacking transaction: {e}')
-                return None
-        else:
+        """Unpack a transaction, decoded once and kept in the store"""
+        transaction = self._decoded.get(transaction_id)
+        if transaction is not None:
+            return transaction
+
+        payload = await self._state_db.get_transaction(transaction_id)
+        if payload is None:
             return None
+        transaction = self.decode_transaction(payload)
+        if transaction is not None:
+            self._decoded.set(transaction_id, transaction)
+        return transaction
         
 
     async def verify_transactions_channel(self):
@@ -330,23 +458,20 @@ class TransactionsLog(commands.Cog):
     ###################################################
 
     @tasks.loop(minutes=10)
+    @background
     async def check_transactions(self):
         """Check for new transactions every 10 minutes."""
         channel_set = await self.verify_transactions_channel()
         if not channel_set:
             logger.warning('[TransactionsLog][Check_Transactions] - Transactions channel not set')
             return
-        
-        # Load transactions from file
-        self.transactions = await self.bot.state.persistent_manager.load_json(filename=self._transactions_filename)
 
-        # Get check_if_new_entry
-        found = await self.update_transactions()
+        # Get new entries since the watermark
+        await self.update_transactions()
         logger.info('[TransactionsLog] - .. Done')
 
-        if found:
+        if self._new_trades or not self._trade_csv_checked:
             await self.update_trade_csv()
-            found = False
 
 
     ###################################################
@@ -390,7 +515,7 @@ class TransactionsLog(commands.Cog):
 
     async def wait_for_fantasy(self):
         while not self._ready:
-            async with self.bot.state.fantasy_query_lock:
+            async with self.bot.state.fantasy_query_lock.read():
                 fantasy_query = self.bot.state.fantasy_query
             if fantasy_query is not None:
                 self._ready = True
@@ -406,6 +531,7 @@ class TransactionsLog(commands.Cog):
         await self.is_enabled()
         logger.info('[TransactionsLog] - Enabled')
 
+        await self.load_transaction_ids()
         self.check_transactions.start()
         logger.info('[TransactionsLog] - Ready')
 
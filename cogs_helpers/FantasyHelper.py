@@ -34,8 +34,8 @@ async def construct_date_list(gameweek_list:list[GameWeek]) -> dict:
 async def load_week_dates(bot, week_dates_filename:str = _week_dates_filename) -> dict:
     exists = await bot.state.persistent_manager.path_exists(filename=week_dates_filename)
     if not exists:
-        async with bot.state.fantasy_query_lock:
-            dates_dict = await construct_date_list(bot.state.fantasy_query.get_game_weeks_by_game_id())
+        async with bot.state.fantasy_query_lock.read():
+            dates_dict = await construct_date_list(await bot.state.fantasy_query.get_game_weeks_by_game_id())
         await bot.state.persistent_manager.write_json(filename=week_dates_filename, data=dates_dict)
         logger.info("[FantasyHelper] - Week Dates File Created.")
 
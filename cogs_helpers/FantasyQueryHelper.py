@@ -71,29 +71,31 @@ async def init_embed(chimp:str,extra:str, week:int, url, total_points, color, lo
     return embed
 
 
-async def add_player_fields(embed:discord.Embed, queue:deque[int], week, state) -> None:
-    async with state.fantasy_query_lock:
-        while queue:
-            id = queue.popleft()
-            player_stats:Player = state.fantasy_query.team_stats(id,week)
-            embed.add_field(name = f'{player_stats.name.full}',
-                            value = (
-                                f'#{player_stats.uniform_number}, {player_stats.primary_position}, {player_stats.editorial_team_full_name}\n'
-                                f'Total Pts: [{player_stats.player_points.total:4.2f}]({player_stats.url})'
-                            ), 
-                            inline = False)   
-
-
-async def add_defense_fields(embed:discord.Embed, queue:deque[int], week, state) -> None:
-    async with state.fantasy_query_lock:
-        while queue:
-            id = queue.popleft()
-            player_stats:Player = state.fantasy_query.team_stats(id,week)
-            embed.add_field(name = f'{player_stats.name.full}', 
-                            value = (
-                                f'{player_stats.primary_position}, {player_stats.editorial_team_full_name}\n'
-                                f'Total Pts: [{player_stats.player_points.total:4.2f}]({player_stats.url})'),
-                            inline = False) 
+async def add_player_fields(embed:discord.Embed, queue:deque[int], players_dict:dict[int,Player]) -> None:
+    while queue:
+        id = queue.popleft()
+        player_stats:Player = players_dict.get(int(id))
+        if player_stats is None:
+            continue
+        embed.add_field(name = f'{player_stats.name.full}',
+                        value = (
+                            f'#{player_stats.uniform_number}, {player_stats.primary_position}, {player_stats.editorial_team_full_name}\n'
+                            f'Total Pts: [{player_stats.player_points.total:4.2f}]({player_stats.url})'
+                        ), 
+                        inline = False)   
+
+
+async def add_defense_fields(embed:discord.Embed, queue:deque[int], players_dict:dict[int,Player]) -> None:
+    while queue:
+        id = queue.popleft()
+        player_stats:Player = players_dict.get(int(id))
+        if player_stats is None:
+            continue
+        embed.add_field(name = f'{player_stats.name.full}', 
+                        value = (
+                            f'{player_stats.primary_position}, {player_stats.editorial_team_full_name}\n'
+                            f'Total Pts: [{player_stats.player_points.total:4.2f}]({player_stats.url})'),
+                        inline = False) 
 
 
 async def construct_roster_lists(player_list:list[Player]) -> tuple[deque[int], deque[int], deque[int]]:
@@ -1,4 +1,95 @@
 import utility
+from query_helpers.response_cache import ResponseCache
+from query_helpers.single_flight import SingleFlight
+from query_helpers.rate_limiter import RateLimiter, SharedPriority, is_rate_limited, query_priority
+from query_helpers.metrics import QueryMetrics, caller_cog
+from query_helpers import raw_records
+
+import asyncio
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from datetime import date, datetime
+from functools import partial
+from typing import Callable
+
+import logging
+logger = logging.getLogger(__name__)
+
+
+# (ttl, max_stale) in seconds per endpoint. Weeks before league.current_week never expire.
+QUERY_TTLS = {
+    'scoreboard': (60, 600),
+    'roster': (300, 1800),
+    'player_week': (300, 1800),
+    'player_season': (900, 3600),
+    # season stats plus ownership and percent owned, which move with every add/drop
+    'player_profile': (120, 600),
+    'league_stats': (900, 3600),
+    'ownership': (900, 3600),
+    'teams': (3600, 86400),
+    'standings': (600, 3600),
+    'game_weeks': (None, 0),
+}
+
+# Yahoo rejects player_keys collections longer than this
+PLAYER_KEY_LIMIT = 25
+
+# attempts after a 999/429 before the error reaches the caller
+RATE_LIMIT_RETRIES = 3
+
+# league metadata older than this (seconds) is refetched, as is metadata past its week's end date
+LEAGUE_METADATA_TTL = 3600
+
+
+class StoredResponse:
+    """Stand-in for requests.Response built from a payload in the disk cache."""
+    status_code = 200
+
+    def __init__(self, url:str, content:bytes):
+        self.url = url
+        self.content = content
+
+    def json(self):
+        return json.loads(self.content)
+
+
+class LeagueMetadata:
+    """Snapshot of the league fields hot paths need, read without touching Yahoo."""
+    __slots__ = ('league_key', 'season', 'num_teams', 'current_week', 'start_week', 'end_week',
+                 'start_date', 'end_date', 'week_end_date', 'fetched_at', 'fetched_on')
+
+    def __init__(self, league, week_end_date:str = None, fetched_at:float = None, fetched_on:date = None):
+        self.league_key = league.league_key
+        self.season = league.season
+        self.num_teams = int(league.num_teams)
+        self.current_week = int(league.current_week)
+        self.start_week = int(league.start_week)
+        self.end_week = int(league.end_week)
+        self.start_date = league.start_date
+        self.end_date = league.end_date
+        self.week_end_date = week_end_date
+        self.fetched_at = time.monotonic() if fetched_at is None else fetched_at
+        self.fetched_on = date.today() if fetched_on is None else fetched_on
+
+
+    def is_stale(self, now:float = None, today:date = None) -> bool:
+        """
+        Older than LEAGUE_METADATA_TTL, or fetched before the current week ended.
+            A fetch after the end date that still reports the old week (Yahoo rolls over late)
+            only expires by ttl, so the rollover check doesn't refetch on every call.
+        """
+        now = time.monotonic() if now is None else now
+        if now - self.fetched_at >= LEAGUE_METADATA_TTL:
+            return True
+
+        if self.week_end_date is None or self.current_week >= self.end_week:
+            return False
+        today = date.today() if today is None else today
+        week_end = datetime.strptime(self.week_end_date, '%Y-%m-%d').date()
+        return self.fetched_on <= week_end < today
 
 
 class fantasyQuery:
@@ -20,6 +111,11 @@ class fantasyQuery:
     @property
     def TRANSACTIONS_URL(self):
         return 'https://fantasysports.yahooapis.com/fantasy/v2/league/' + self.yahoo_query.get_league_key() + '/transactions'
+
+
+    @property
+    def TEAM_URL(self):
+        return 'https://fantasysports.yahooapis.com/fantasy/v2/team/'
     
 
     @property
@@ -27,11 +123,108 @@ class fantasyQuery:
         return self.league.season
 
 
-    def __init__(self, yahoo_query):
+    def __init__(self, yahoo_query, payload_store = None, stat_dict:dict = None, throttle:Callable[[], None] = None):
         self.yahoo_query = yahoo_query  
-        self.stat_dict = self.create_stat_file(self.get_stat_categories())
+        self.league = None
+        self.metadata:LeagueMetadata = None
+        self._game_weeks = None
+
+        # blocks before each request that reaches Yahoo, set while nothing else rate limits this instance
+        self.throttle = throttle
+
+        # raw payloads of immutable queries go through the disk cache
+        self._payload_store = payload_store
+        self._immutable_state = threading.local()
+        if payload_store is not None or throttle is not None:
+            self._fetch_response = yahoo_query.get_response
+            yahoo_query.get_response = self._get_response
+
+        # stat categories only change with the game_id, reuse a persisted copy when given one
+        self.stat_dict = stat_dict if stat_dict else self.create_stat_file(self.get_stat_categories())
         self.league_key = self.yahoo_query.get_league_key()
+        self.refresh_league()
+
+
+    def refresh_credentials(self, env_file_location = None) -> None:
+        """
+        Rotate the OAuth access token on the live yahoo_query.
+            Nothing fantasy related is refetched, stat_dict and the league stay as they are.
+            Args:
+                env_file_location (Path): Directory of the .env the new token is saved to
+        """
+        oauth = self.yahoo_query.oauth
+        oauth.refresh_access_token()
+        oauth.session = oauth.oauth.get_session(token=oauth.access_token)
+
+        # yfpy saves the token from this dict
+        self.yahoo_query._yahoo_access_token_dict.update({
+            'access_token': oauth.access_token,
+            'guid': oauth.guid,
+            'refresh_token': oauth.refresh_token,
+            'token_time': oauth.token_time,
+            'token_type': oauth.token_type,
+        })
+        if env_file_location is not None:
+            self.yahoo_query.save_access_token_data_to_env_file(env_file_location)
+
+
+    def refresh_league(self) -> LeagueMetadata:
         self.league = self.get_league()['league']
+        self.metadata = LeagueMetadata(self.league, self._week_end_date(self.league.current_week))
+        return self.metadata
+
+
+    def _week_end_date(self, week):
+        # game weeks never change for a game_id, fetch them once per fantasyQuery
+        try:
+            if self._game_weeks is None:
+                self._game_weeks = self.get_game_weeks_by_game_id()
+        except Exception as e:
+            logger.warning(f'[Fantasy][refresh_league] - Game weeks unavailable, week rollover check off. Error: {e}')
+            return None
+
+        for gameweek in self._game_weeks:
+            if int(gameweek.week) == int(week):
+                return gameweek.end
+        return None
+
+
+    @contextmanager
+    def _immutable(self, week = None):
+        """
+        Mark the Yahoo requests made inside the block as cacheable on disk.
+            Without a week the payload never changes (stat categories, game weeks), otherwise
+            only weeks before league.current_week qualify.
+        """
+        if week is not None and (self.metadata is None or int(week) >= self.metadata.current_week):
+            yield
+            return
+
+        previous = getattr(self._immutable_state, 'active', False)
+        self._immutable_state.active = True
+        try:
+            yield
+        finally:
+            self._immutable_state.active = previous
+
+
+    def _fetch(self, url:str):
+        if self.throttle is not None:
+            self.throttle()
+        return self._fetch_response(url)
+
+
+    def _get_response(self, url:str):
+        if self._payload_store is None or not getattr(self._immutable_state, 'active', False):
+            return self._fetch(url)
+
+        content = self._payload_store.load_payload(url)
+        if content is not None:
+            return StoredResponse(url, content)
+
+        response = self._fetch(url)
+        self._payload_store.store_payload(url, response.content)
+        return response
 
 
     def create_stat_file(self,categories):
@@ -70,6 +263,33 @@ class fantasyQuery:
         return season_stats
 
 
+    def get_player_profiles(self, player_ids):
+        """
+        Season stats, ownership and percent owned for many players, one
+        players;player_keys=...;out=stats,ownership,percent_owned request per PLAYER_KEY_LIMIT ids.
+            Returns:
+                dict: player_id -> Player
+        """
+        game_id = self.yahoo_query.game_id
+        player_ids = list(player_ids)
+        profiles = {}
+
+        for start in range(0, len(player_ids), PLAYER_KEY_LIMIT):
+            chunk = player_ids[start:start + PLAYER_KEY_LIMIT]
+            player_keys = ','.join(utility.compose_player_key(game_id,player_id) for player_id in chunk)
+            profiles_url = self.LEAGUE_URL + f'/players;player_keys={player_keys};out=stats,ownership,percent_owned'
+            players = self.yahoo_query.query(profiles_url, ['league', 'players'])
+
+            # a single player comes back unwrapped
+            if not isinstance(players, list):
+                players = [players]
+            for player in players:
+                if isinstance(player, dict):
+                    player = player.get('player')
+                profiles[int(player.player_id)] = player
+        return profiles
+
+
     def get_league(self):
         league_url = self.LEAGUE_URL
         return self.yahoo_query.query(league_url,[],data_type_class=None, sort_function=None)
@@ -106,48 +326,105 @@ class fantasyQuery:
         return self.yahoo_query.query(player_url,[],data_type_class=None, sort_function=None)
 
 
-    def get_ownership(self,player_id):
+    def get_ownership(self,player_id, week = None):
         game_id = self.yahoo_query.game_id
-        week = self.get_league()['league'].current_week
+        if week is None:
+            week = self.metadata.current_week
         player_key = utility.compose_player_key(game_id,player_id)
         player_url = self.LEAGUE_URL+ f'/players;player_keys={player_key}/ownership;type=week;week={week}'
         return self.yahoo_query.query(player_url,[],data_type_class=None, sort_function=None)
 
 
     def get_team_roster(self,team_id,chosen_week):
-        return self.yahoo_query.get_team_roster_by_week(team_id, chosen_week)
+        with self._immutable(chosen_week):
+            return self.yahoo_query.get_team_roster_by_week(team_id, chosen_week)
 
 
     def get_scoreboard(self, week):
-        return self.yahoo_query.get_league_scoreboard_by_week(week)
+        with self._immutable(week):
+            return self.yahoo_query.get_league_scoreboard_by_week(week)
     
 
     def get_roster(self,team_id, chosen_week):
-        return self.yahoo_query.get_team_roster_by_week(team_id,chosen_week)
+        with self._immutable(chosen_week):
+            return self.yahoo_query.get_team_roster_by_week(team_id,chosen_week)
+    
+
+    def get_league_rosters(self, week):
+        """
+        Every team's roster for a week in one league/{key}/teams/roster;week= request.
+            Returns:
+                dict: team_id -> Roster, ordered by team_id
+        """
+        rosters_url = self.LEAGUE_URL + f'/teams/roster;week={week}'
+        with self._immutable(week):
+            teams = self.yahoo_query.query(rosters_url, ['league', 'teams'])
+
+        # a single team comes back unwrapped
+        if not isinstance(teams, list):
+            teams = [teams]
+
+        rosters = {}
+        for team in teams:
+            if isinstance(team, dict):
+                team = team.get('team')
+            rosters[int(team.team_id)] = team.roster
+        return dict(sorted(rosters.items()))
     
 
     def team_stats(self,player_id,week):
         game_id = self.yahoo_query.game_id
         player_key = utility.compose_player_key(game_id,player_id)
-        team_stats = self.yahoo_query.get_player_stats_by_week(player_key, week)
+        with self._immutable(week):
+            team_stats = self.yahoo_query.get_player_stats_by_week(player_key, week)
         return team_stats
 
 
     def get_stat_categories(self):
         game_id = self.yahoo_query.game_id
-        stat_categories = self.yahoo_query.get_game_stat_categories_by_game_id(game_id)
+        with self._immutable():
+            stat_categories = self.yahoo_query.get_game_stat_categories_by_game_id(game_id)
         return stat_categories
 
 
     def get_game_weeks_by_game_id(self):
-        return self.yahoo_query.get_game_weeks_by_game_id(self.yahoo_query.game_id)
+        with self._immutable():
+            return self.yahoo_query.get_game_weeks_by_game_id(self.yahoo_query.game_id)
 
 
     def get_team_stats(self, week, team_id):
-        team_stats = self.yahoo_query.get_team_stats_by_week(team_id, week)
+        with self._immutable(week):
+            team_stats = self.yahoo_query.get_team_stats_by_week(team_id, week)
         return team_stats
 
 
+    def get_players_week_stats(self, player_ids, week):
+        """
+        Weekly stats for many players, one players;player_keys=... request per PLAYER_KEY_LIMIT ids.
+            Returns:
+                dict: player_id -> Player
+        """
+        game_id = self.yahoo_query.game_id
+        player_ids = list(player_ids)
+        players_dict = {}
+
+        for start in range(0, len(player_ids), PLAYER_KEY_LIMIT):
+            chunk = player_ids[start:start + PLAYER_KEY_LIMIT]
+            player_keys = ','.join(utility.compose_player_key(game_id,player_id) for player_id in chunk)
+            players_url = self.LEAGUE_URL + f'/players;player_keys={player_keys}/stats;type=week;week={week}'
+            with self._immutable(week):
+                players = self.yahoo_query.query(players_url, ['league', 'players'])
+
+            # a single player comes back unwrapped
+            if not isinstance(players, list):
+                players = [players]
+            for player in players:
+                if isinstance(player, dict):
+                    player = player.get('player')
+                players_dict[int(player.player_id)] = player
+        return players_dict
+
+
     #doesnt quite work
     def get_player_week(self,player_id,week):
         game_id = self.yahoo_query.game_id
@@ -156,13 +433,398 @@ class fantasyQuery:
         return self.yahoo_query.query(player_url,[],data_type_class=None, sort_function=None)
         
         
-    def get_all_standings(self,number_of_teams):
-        i = 1
+    ###################################################
+    # Raw mode, __slots__ records without yfpy models
+    ###################################################
+
+    def _raw_content(self, url:str) -> dict:
+        # same transport as yfpy (auth, retries, disk cache), skipping unpack_data and the model graph
+        return self.yahoo_query.get_response(url).json()['fantasy_content']
+
+
+    def get_scoreboard_records(self, week) -> list[raw_records.MatchupRecord]:
+        with self._immutable(week):
+            content = self._raw_content(self.LEAGUE_URL + f'/scoreboard;week={week}')
+        return raw_records.parse_scoreboard(content)
+
+
+    def get_roster_records(self, team_id, chosen_week) -> list[raw_records.RosterPlayerRecord]:
+        team_key = f'{self.league_key}.t.{team_id}'
+        with self._immutable(chosen_week):
+            content = self._raw_content(self.TEAM_URL + f'{team_key}/roster;week={chosen_week}')
+        return raw_records.parse_roster(content)
+
+
+    def get_standings_records(self) -> list[raw_records.StandingsRecord]:
+        content = self._raw_content(self.LEAGUE_URL + '/standings')
+        return raw_records.parse_standings(content)
+
+
+    def get_all_standings(self):
+        # one league/{key}/standings request instead of one per team
+        standings = self.yahoo_query.get_league_standings()
+
         unsorted = []
-        
-        while i <= number_of_teams:
-            obj = self.yahoo_query.get_team_standings(i)
-            group = (i,obj)
+        for team in standings.teams:
+            if isinstance(team, dict):
+                team = team.get('team')
+            group = (int(team.team_id),team.team_standings)
             unsorted.append(group)
-            i += 1
-        return unsorted
+        return sorted(unsorted, key = lambda tup: tup[0])
+
+
+###################################################
+# Async facade
+###################################################
+
+class AsyncFantasyQuery:
+    """
+    Awaitable wrapper around fantasyQuery.
+        yfpy is synchronous, so every call is handed to a bounded worker pool and the
+        event loop (and the discord gateway heartbeat) stays free while Yahoo responds.
+    """
+    def __init__(self, fantasy_query:fantasyQuery, max_workers:int = 4, cache_entries:int = 512,
+                 rate:float = 1.0, burst:int = 5, payload_store = None):
+        self._query = fantasy_query
+        self._payload_store = payload_store
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='yahoo_query')
+        self._limiter = RateLimiter(rate=rate, burst=burst)
+
+        self._cache = ResponseCache(max_entries=cache_entries)
+        self._revalidating:dict[tuple, asyncio.Task] = {}
+        self._single_flight = SingleFlight()
+        # priority of each in-flight call, raised when an interactive caller joins a background one
+        self._priorities:dict[tuple, SharedPriority] = {}
+        self._metrics = QueryMetrics()
+
+
+    @classmethod
+    async def create(cls, yahoo_query, max_workers:int = 4, rate:float = 1.0, burst:int = 5,
+                     payload_store = None, stat_dict:dict = None) -> 'AsyncFantasyQuery':
+        """Build the fantasyQuery on a worker thread, its constructor hits Yahoo."""
+        instance = cls(None, max_workers=max_workers, rate=rate, burst=burst, payload_store=payload_store)
+        await instance.rebind(yahoo_query, stat_dict=stat_dict)
+        return instance
+
+
+    async def rebind(self, yahoo_query, stat_dict:dict = None) -> None:
+        """Swap in a freshly authenticated yahoo_query, keeping the worker pool and the known stat_dict."""
+        if stat_dict is None and self._query is not None:
+            stat_dict = self._query.stat_dict
+
+        # the constructor makes several requests, each takes a token from the worker thread
+        loop = asyncio.get_running_loop()
+        priority = query_priority.get()
+        def throttle():
+            asyncio.run_coroutine_threadsafe(self._limiter.acquire(priority), loop).result()
+
+        query = await self._run(fantasyQuery, yahoo_query, self._payload_store, stat_dict, throttle)
+        # from here on _call_now takes the tokens
+        query.throttle = None
+        self._query = query
+
+
+    async def refresh_credentials(self, env_file_location = None) -> None:
+        """Rotate the access token in place. Talks to the OAuth endpoint, not the fantasy API, so no rate limit token."""
+        await self._run(self._query.refresh_credentials, env_file_location)
+
+
+    def close(self) -> None:
+        for task in self._revalidating.values():
+            task.cancel()
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+    async def _run(self, func, *args, **kwargs):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, partial(func, *args, **kwargs))
+
+
+    async def _call(self, method_name:str, *args, **kwargs):
+        self._metrics.called(caller_cog())
+        return await self._coalesced(method_name, *args, **kwargs)
+
+
+    async def _coalesced(self, method_name:str, *args, **kwargs):
+        # identical calls already on the wire share the one request
+        key = (method_name, tuple(str(arg) for arg in args), tuple(sorted((k, str(v)) for k, v in kwargs.items())))
+        if key in self._single_flight:
+            shared = self._priorities.get(key)
+            if shared is not None:
+                shared.raise_to(query_priority.get())
+        else:
+            shared = SharedPriority(query_priority.get())
+            self._priorities[key] = shared
+
+        async def call():
+            try:
+                return await self._call_now(shared, method_name, *args, **kwargs)
+            finally:
+                if self._priorities.get(key) is shared:
+                    del self._priorities[key]
+        return await self._single_flight.do(key, call)
+
+
+    async def _call_now(self, shared:SharedPriority, method_name:str, *args, **kwargs):
+        attempt = 0
+        while True:
+            start = time.monotonic()
+            await self._limiter.acquire(shared=shared)
+            sent = time.monotonic()
+            self._metrics.waited(sent - start)
+
+            # resolve on every call so a rebind is picked up immediately
+            method = getattr(self._query, method_name)
+            try:
+                result = await self._run(method, *args, **kwargs)
+            except Exception as e:
+                self._metrics.observe(method_name, time.monotonic() - sent, error=True)
+                if not is_rate_limited(e) or attempt >= RATE_LIMIT_RETRIES:
+                    raise
+                attempt += 1
+                self._metrics.retried(method_name)
+                self._limiter.backoff()
+                logger.warning(f'[Fantasy][{method_name}] - Rate limited, retry {attempt}/{RATE_LIMIT_RETRIES}')
+                continue
+
+            self._metrics.observe(method_name, time.monotonic() - sent)
+            self._limiter.succeeded()
+            return result
+
+
+    ###################################################
+    # Response cache
+    ###################################################
+
+    def _ttl(self, endpoint:str, week = None) -> tuple:
+        ttl, max_stale = QUERY_TTLS[endpoint]
+        metadata = self._query.metadata
+        if week is not None and metadata is not None and int(week) < metadata.current_week:
+            # finished weeks can't change
+            return None, 0
+        return ttl, max_stale
+
+
+    async def _cached(self, endpoint:str, method_name:str, *args, week = None):
+        """
+        Serve from the response cache, revalidating stale entries in the background.
+            Args:
+                endpoint (str): Key into QUERY_TTLS
+                method_name (str): fantasyQuery method to call on a miss
+                week (int): Week the response belongs to, past weeks are cached forever
+        """
+        self._metrics.called(caller_cog())
+        key = (endpoint, method_name, tuple(str(arg) for arg in args))
+        entry = self._cache.get(key)
+        self._metrics.cache_lookup(method_name, entry is not None)
+
+        if entry is not None:
+            if not self._cache.is_fresh(entry):
+                self._revalidate(key, endpoint, method_name, args, week)
+            return entry.value
+
+        value = await self._coalesced(method_name, *args)
+        self._cache.set(key, value, *self._ttl(endpoint, week))
+        return value
+
+
+    def _revalidate(self, key:tuple, endpoint:str, method_name:str, args:tuple, week) -> None:
+        if key in self._revalidating:
+            return
+
+        async def refresh():
+            try:
+                value = await self._coalesced(method_name, *args)
+                self._cache.set(key, value, *self._ttl(endpoint, week))
+            except Exception as e:
+                logger.warning(f'[Fantasy][revalidate] - Keeping stale {endpoint}{key[2]}. Error: {e}')
+            finally:
+                self._revalidating.pop(key, None)
+
+        self._revalidating[key] = asyncio.create_task(refresh())
+
+
+    def cache_stats(self) -> dict:
+        return self._cache.stats()
+
+
+    def coalescing_stats(self) -> dict:
+        return self._single_flight.stats()
+
+
+    def rate_limit_stats(self) -> dict:
+        return self._limiter.stats()
+
+
+    def metrics(self) -> QueryMetrics:
+        """Per endpoint latency, errors and cache lookups, plus calls by cog, kept across rebinds."""
+        return self._metrics
+
+
+    def invalidate_cache(self, endpoint:str = None) -> None:
+        self._cache.invalidate(endpoint)
+
+
+    ###################################################
+    # Cached attributes - no I/O
+    ###################################################
+
+    @property
+    def yahoo_query(self):
+        return self._query.yahoo_query
+
+
+    @property
+    def stat_dict(self) -> dict:
+        return self._query.stat_dict
+
+
+    @property
+    def game_id(self):
+        return self._query.yahoo_query.game_id
+
+
+    @property
+    def league_key(self) -> str:
+        return self._query.league_key
+
+
+    @property
+    def league(self):
+        return self._query.league
+
+
+    @property
+    def metadata(self) -> LeagueMetadata:
+        return self._query.metadata
+
+
+    async def league_metadata(self) -> LeagueMetadata:
+        """League metadata, refetched first if stale."""
+        if self._query.metadata is None or self._query.metadata.is_stale():
+            await self.refresh_league()
+        return self._query.metadata
+
+
+    async def refresh_league(self) -> LeagueMetadata:
+        metadata = await self._call('refresh_league')
+        logger.info(f'[Fantasy][refresh_league] - League metadata refreshed, week {metadata.current_week}')
+        return metadata
+
+
+    ###################################################
+    # Yahoo queries
+    ###################################################
+
+    async def get_league_teams(self):
+        return await self._cached('teams', 'get_league_teams')
+
+
+    async def get_teams(self):
+        return await self._cached('teams', 'get_teams')
+
+
+    async def get_player(self, player_id):
+        return await self._call('get_player', player_id)
+
+
+    async def get_player_stats(self, player_id):
+        return await self._cached('player_season', 'get_player_stats', player_id)
+
+
+    async def get_player_profiles(self, player_ids):
+        # order-insensitive key, same as get_players_week_stats
+        player_ids = tuple(sorted(int(player_id) for player_id in player_ids))
+        return await self._cached('player_profile', 'get_player_profiles', player_ids)
+
+
+    async def get_league(self):
+        return await self._call('get_league')
+
+
+    async def get_players(self, start=0, count=25):
+        return await self._call('get_players', start=start, count=count)
+
+
+    async def get_league_info(self):
+        return await self._call('get_league_info')
+
+
+    async def check_recent_transactions(self, start=0, count=25):
+        return await self._call('check_recent_transactions', start=start, count=count)
+
+
+    async def pull_batch_transactions(self, start, count=25):
+        return await self._call('pull_batch_transactions', start, count=count)
+
+
+    async def get_game(self):
+        return await self._call('get_game')
+
+
+    async def get_league_stats(self, player_id):
+        return await self._cached('league_stats', 'get_league_stats', player_id)
+
+
+    async def get_ownership(self, player_id):
+        week = (await self.league_metadata()).current_week
+        return await self._cached('ownership', 'get_ownership', player_id, week)
+
+
+    async def get_team_roster(self, team_id, chosen_week):
+        return await self._cached('roster', 'get_team_roster', team_id, chosen_week, week=chosen_week)
+
+
+    async def get_scoreboard(self, week):
+        return await self._cached('scoreboard', 'get_scoreboard', week, week=week)
+
+
+    async def get_roster(self, team_id, chosen_week):
+        # same endpoint as get_team_roster, share the entry
+        return await self._cached('roster', 'get_team_roster', team_id, chosen_week, week=chosen_week)
+
+
+    async def get_league_rosters(self, week):
+        return await self._cached('roster', 'get_league_rosters', week, week=week)
+
+
+    async def team_stats(self, player_id, week):
+        return await self._cached('player_week', 'team_stats', player_id, week, week=week)
+
+
+    async def get_players_week_stats(self, player_ids, week):
+        # order-insensitive key so the same roster hits the same entry
+        player_ids = tuple(sorted(int(player_id) for player_id in player_ids))
+        return await self._cached('player_week', 'get_players_week_stats', player_ids, week, week=week)
+
+
+    async def get_stat_categories(self):
+        return await self._call('get_stat_categories')
+
+
+    async def get_game_weeks_by_game_id(self):
+        return await self._cached('game_weeks', 'get_game_weeks_by_game_id')
+
+
+    async def get_team_stats(self, week, team_id):
+        return await self._call('get_team_stats', week, team_id)
+
+
+    async def get_player_week(self, player_id, week):
+        return await self._call('get_player_week', player_id, week)
+
+
+    async def get_scoreboard_records(self, week):
+        return await self._cached('scoreboard', 'get_scoreboard_records', week, week=week)
+
+
+    async def get_roster_records(self, team_id, chosen_week):
+        return await self._cached('roster', 'get_roster_records', team_id, chosen_week, week=chosen_week)
+
+
+    async def get_standings_records(self):
+        return await self._cached('standings', 'get_standings_records')
+
+
+    async def get_all_standings(self):
+        return await self._cached('standings', 'get_all_standings')
@@ -2,20 +2,116 @@ import asyncio
 import json
 import aiofiles
 import csv
+import hashlib
 import io
+import os
 import pickle
+import sqlite3
+import threading
 import pandas as pd
-from typing import Optional
+from collections import OrderedDict
+from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Optional
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import pyarrow
+    import pyarrow.feather as feather
+except ImportError:
+    pyarrow = None
 
 
 from pathlib import Path
-from functools import wraps
+from functools import partial, wraps
 
 import logging
 logger = logging.getLogger(__name__)
 
 current_dir = Path(__file__).parent
 
+# blocking file I/O (pandas, pickle) for every manager, separate from the default executor
+# the yfpy worker threads and asyncio.to_thread callers share
+FILE_IO_WORKERS = 4
+_io_executor = ThreadPoolExecutor(max_workers=FILE_IO_WORKERS, thread_name_prefix='file_io')
+
+
+class StdlibJson:
+    """json module, compact unless pretty."""
+    name = 'stdlib'
+
+    def __init__(self, pretty:bool = False):
+        self.pretty = pretty
+
+
+    def dumps(self, data:Any) -> str:
+        if self.pretty:
+            return json.dumps(data, indent=4)
+        return json.dumps(data, separators=(',', ':'))
+
+
+    def loads(self, text:str) -> Any:
+        return json.loads(text)
+
+
+class OrjsonJson(StdlibJson):
+    """
+    orjson when installed, output stays loadable by the json module. Falls back to it for what orjson refuses.
+        Pretty output is left to the json module, orjson only indents by 2 and hand edited files keep their 4.
+    """
+    name = 'orjson'
+
+    def __init__(self, pretty:bool = False):
+        super().__init__(pretty)
+        self._option = orjson.OPT_NON_STR_KEYS
+
+
+    def dumps(self, data:Any) -> str:
+        if self.pretty:
+            return super().dumps(data)
+        try:
+            return orjson.dumps(data, option=self._option).decode('utf-8')
+        except orjson.JSONEncodeError:
+            # e.g. ints past 64 bits
+            return super().dumps(data)
+
+
+    def loads(self, text:str) -> Any:
+        return orjson.loads(text)
+
+
+# orjson is optional, the json module is used without it
+JSON_BACKEND = OrjsonJson if orjson is not None else StdlibJson
+
+
+def json_serializer(pretty:bool = False) -> StdlibJson:
+    """Fastest installed backend, pretty printed only for files people edit by hand."""
+    return JSON_BACKEND(pretty)
+
+
+def _fsync_path(path:Path) -> None:
+    """Push a file written by a library that doesn't expose its handle to disk."""
+    with open(path, 'rb') as file:
+        os.fsync(file.fileno())
+
+
+def _dump_pickle(path:Path, data) -> None:
+    temp_path = path.with_name(f'.{path.name}.tmp')
+    with open(temp_path, 'wb') as file:
+        pickle.dump(data, file)
+        file.flush()
+        os.fsync(file.fileno())
+    os.replace(temp_path, path)
+
+
+def _read_pickle(path:Path):
+    with open(path, 'rb') as file:
+        return pickle.load(file)
+
 
 def async_load_error_handler(func):
     @wraps(func)
@@ -39,11 +135,91 @@ def async_load_pickle_error_handler(func):
     return wrapper
 
 
+def copy_json(value:Any) -> Any:
+    """Copy a parsed JSON document, several times faster than copy.deepcopy for plain dicts and lists."""
+    if isinstance(value, dict):
+        return {key: copy_json(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [copy_json(item) for item in value]
+    return value
+
+
+class JsonCache:
+    """
+    Parsed JSON documents keyed by filename, trusted while the file's mtime and size are unchanged.
+        Callers always get their own copy, so mutating a loaded document can't leak into the cache.
+        Args:
+            max_entries (int): Documents kept before the least recently used is evicted
+    """
+    def __init__(self, max_entries:int):
+        self._entries:OrderedDict[str, tuple[int, int, Any]] = OrderedDict()
+        self._max_entries = max_entries
+
+        self.hits = 0
+        self.misses = 0
+
+
+    def get(self, filename:str, stat:os.stat_result) -> Optional[Any]:
+        entry = self._entries.get(filename)
+        if entry is None or entry[:2] != (stat.st_mtime_ns, stat.st_size):
+            # changed on disk (or never seen), the caller rereads it
+            self._entries.pop(filename, None)
+            self.misses += 1
+            return None
+
+        self._entries.move_to_end(filename)
+        self.hits += 1
+        return copy_json(entry[2])
+
+
+    def set(self, filename:str, stat:os.stat_result, data:Any) -> None:
+        self._entries[filename] = (stat.st_mtime_ns, stat.st_size, copy_json(data))
+        self._entries.move_to_end(filename)
+        while len(self._entries) > self._max_entries:
+            self._entries.popitem(last=False)
+
+
+    def invalidate(self, filename:str = None) -> None:
+        if filename is None:
+            self._entries.clear()
+        else:
+            self._entries.pop(filename, None)
+
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            'entries': len(self._entries),
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_ratio': self.hits / lookups if lookups else 0.0,
+        }
+
+
 class BaseFileManager:
-    def __init__(self, folder_name:str):
+    """
+    Async JSON/CSV/pickle access to one folder, one asyncio lock per file.
+        With a write_delay, write_json is write-behind: the document is serialized right away,
+        later writes to the same file within the delay replace it, and one flush writes the
+        last version. load_json sees pending documents. Call flush() before exiting.
+        Args:
+            folder_name (str): Folder next to this module
+            cache_entries (int): Parsed JSON documents kept in memory, 0 disables the cache
+            write_delay (float): Seconds write_json waits to coalesce writes, 0 writes immediately
+            pretty_json (bool): Indent written JSON, for folders edited by hand
+    """
+    def __init__(self, folder_name:str, cache_entries:int = 0, write_delay:float = 0.0, pretty_json:bool = False):
         self._base = Path(__file__).parent
         self._path = self._base / folder_name
         self._locks = {}
+        self._json = json_serializer(pretty_json)
+        self._json_cache = JsonCache(cache_entries) if cache_entries > 0 else None
+
+        self._write_delay = write_delay
+        self._pending:dict[str, str] = {}
+        self._flush_tasks:dict[str, asyncio.Task] = {}
+        self.writes_requested = 0
+        self.writes_flushed = 0
 
     def _get_raw_path(self) -> Path:
         return self._path
@@ -56,28 +232,107 @@ class BaseFileManager:
         if filename not in self._locks:
             self._locks[filename] = asyncio.Lock()
         return self._locks[filename]
+
+
+    async def _run_io(self, func, *args, **kwargs):
+        """Run blocking file I/O on the shared file executor, callers hold only their own file's lock."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(_io_executor, partial(func, *args, **kwargs))
     
     @async_load_error_handler
     async def load_json(self, filename: str) -> dict:
         lock = self._get_lock(filename)
         path = self._get_path(filename)
         async with lock:
-            if not path.exists():
+            pending = self._pending.get(filename)
+            if pending is not None:
+                return self._json.loads(pending)
+
+            if self._json_cache is None:
+                if not path.exists():
+                    return {}
+                async with aiofiles.open(path, 'r', encoding='utf-8') as file:
+                    return self._json.loads(await file.read())
+
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                self._json_cache.invalidate(filename)
                 return {}
-            async with aiofiles.open(path, 'r') as file:
-                return json.loads(await file.read())
+
+            data = self._json_cache.get(filename, stat)
+            if data is None:
+                async with aiofiles.open(path, 'r', encoding='utf-8') as file:
+                    data = self._json.loads(await file.read())
+                self._json_cache.set(filename, stat, data)
+            return data
 
 
     async def write_json(self, filename: str, data: dict) -> None:
-        raw_path = self._get_raw_path()
-        lock = self._get_lock(filename)
+        # serialized now, the caller may keep mutating data
+        text = self._json.dumps(data)
+        self.writes_requested += 1
+
+        if self._write_delay > 0:
+            self._pending[filename] = text
+            if filename not in self._flush_tasks:
+                self._flush_tasks[filename] = asyncio.create_task(self._flush_later(filename))
+            return
+
+        async with self._get_lock(filename):
+            await self._write_text(filename, text)
+
+
+    async def _write_text(self, filename:str, text:str) -> None:
+        """Replace the file atomically, readers see the old or the new document, never half of one. Hold the file lock."""
         path = self._get_path(filename)
+        temp_path = path.with_name(f'.{path.name}.tmp')
+        self._get_raw_path().mkdir(parents=True, exist_ok=True) # Make sure the directory exists
 
-        raw_path.mkdir(parents=True, exist_ok=True) # Make sure the directory exists
+        async with aiofiles.open(temp_path, 'w', encoding='utf-8') as file:
+            await file.write(text)
+            # on disk before the rename, or a crash can leave the new name pointing at an empty file
+            await file.flush()
+            await self._run_io(os.fsync, file.fileno())
+        os.replace(temp_path, path)
+        self.writes_flushed += 1
+
+        # reread on the next load, json turns tuples and int keys into lists and strings
+        if self._json_cache is not None:
+            self._json_cache.invalidate(filename)
 
-        async with lock:
-            async with aiofiles.open(path, 'w') as file:
-                await file.write(json.dumps(data, indent=4))
+
+    async def _flush_later(self, filename:str) -> None:
+        await asyncio.sleep(self._write_delay)
+        self._flush_tasks.pop(filename, None)
+        await self._flush_pending(filename)
+
+
+    async def _flush_pending(self, filename:str) -> None:
+        async with self._get_lock(filename):
+            text = self._pending.get(filename)
+            if text is None:
+                return
+            try:
+                await self._write_text(filename, text)
+            except OSError as e:
+                # stays pending, the next write or flush() tries again
+                logger.error(f'[FileManager] - Unable to flush {filename}: {e}')
+                return
+
+            # a write that arrived during the flush has its own flush scheduled
+            if self._pending.get(filename) is text:
+                del self._pending[filename]
+
+
+    async def flush(self) -> None:
+        """Write every pending document now, e.g. on shutdown."""
+        for task in self._flush_tasks.values():
+            task.cancel()
+        self._flush_tasks.clear()
+
+        for filename in list(self._pending):
+            await self._flush_pending(filename)
 
 
     @async_load_error_handler
@@ -123,37 +378,145 @@ class BaseFileManager:
     async def load_csv_formatted(self, filename: str) -> Optional[pd.DataFrame]:
         raw_path = self._get_raw_path()
         lock = self._get_lock(filename)
-        thread_lock = self._get_lock('to_thread')
         path = self._get_path(filename)
 
         raw_path.mkdir(parents=True, exist_ok=True) # Make sure the directory exists
 
         async with lock:
-            async with thread_lock:
-                try:
-                    data = await asyncio.to_thread(pd.read_csv, path, **{'on_bad_lines': 'skip'})
-                    return data
-                except FileNotFoundError:
-                    return None
+            try:
+                return await self._run_io(pd.read_csv, path, on_bad_lines='skip')
+            except FileNotFoundError:
+                return None
 
 
     async def write_csv_formatted(self, filename: str, dataframe: pd.DataFrame) -> None:
         raw_path = self._get_raw_path()
         lock = self._get_lock(filename)
-        thread_lock = self._get_lock('to_thread')
         path = self._get_path(filename)
 
         raw_path.mkdir(parents=True, exist_ok=True) # Make sure the directory exists
 
         async with lock:
-            async with thread_lock:
-                await asyncio.to_thread(dataframe.to_csv, path, index=False, encoding='utf-8')
+            await self._run_io(dataframe.to_csv, path, index=False, encoding='utf-8')
+
+
+    async def csv_header(self, filename: str) -> Optional[list[str]]:
+        """Column names of a CSV without reading its rows, None when it is missing or empty."""
+        lock = self._get_lock(filename)
+        path = self._get_path(filename)
+
+        async with lock:
+            try:
+                return list((await self._run_io(pd.read_csv, path, nrows=0)).columns)
+            except (FileNotFoundError, pd.errors.EmptyDataError):
+                return None
+
+
+    async def append_csv_formatted(self, filename: str, dataframe: pd.DataFrame) -> None:
+        """Append rows, the header is written only when the file is new. Columns must match the file's."""
+        raw_path = self._get_raw_path()
+        lock = self._get_lock(filename)
+        path = self._get_path(filename)
+
+        raw_path.mkdir(parents=True, exist_ok=True) # Make sure the directory exists
+
+        async with lock:
+            await self._run_io(dataframe.to_csv, path, mode='a', header=not path.exists(), index=False, encoding='utf-8')
+
+
+    def file_version(self, filename: str) -> Optional[tuple[int, int]]:
+        """(mtime_ns, size) of a file, or None, for callers keeping a derived view of it."""
+        try:
+            stat = self._get_path(filename).stat()
+        except FileNotFoundError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+
+
+    def _table_paths(self, filename: str) -> tuple[Path, Path]:
+        """Feather and CSV paths of a table, named after its .csv filename."""
+        path = self._get_path(filename)
+        return path.with_suffix('.feather'), path.with_suffix('.csv')
+
+
+    @staticmethod
+    def _write_feather(dataframe: pd.DataFrame, path: Path) -> None:
+        # uncompressed so reads can memory-map it
+        temp_path = path.with_name(f'.{path.name}.tmp')
+        dataframe.reset_index(drop=True).to_feather(temp_path, compression='uncompressed')
+        _fsync_path(temp_path)
+        os.replace(temp_path, path)
+
+
+    @staticmethod
+    def _read_feather(path: Path, columns: Optional[list[str]]) -> pd.DataFrame:
+        return feather.read_table(path, columns=columns, memory_map=True).to_pandas()
+
+
+    async def write_table(self, filename: str, dataframe: pd.DataFrame) -> None:
+        """
+        Store a DataFrame with its dtypes, as Feather when pyarrow is installed and CSV otherwise.
+            Args:
+                filename (str): Table name ending in .csv, the Feather file swaps the suffix
+                dataframe (pd.DataFrame): Table to write
+        """
+        feather_path, csv_path = self._table_paths(filename)
+        lock = self._get_lock(filename)
+
+        self._get_raw_path().mkdir(parents=True, exist_ok=True) # Make sure the directory exists
+
+        async with lock:
+            if pyarrow is not None:
+                try:
+                    await self._run_io(self._write_feather, dataframe, feather_path)
+                    return
+                except (pyarrow.ArrowException, ValueError) as e:
+                    # mixed type object columns, CSV takes anything
+                    logger.warning(f'[FileManager][write_table] - {filename} written as CSV, Feather failed: {e}')
+            await self._run_io(dataframe.to_csv, csv_path, index=False, encoding='utf-8')
+
+
+    async def load_table(self, filename: str, columns: Optional[list[str]] = None) -> Optional[pd.DataFrame]:
+        """
+        Load a table written by write_table, or a CSV from before it existed. None when neither exists.
+            Args:
+                filename (str): Table name ending in .csv
+                columns (list[str]): Only read these columns
+        """
+        feather_path, csv_path = self._table_paths(filename)
+        lock = self._get_lock(filename)
+
+        async with lock:
+            # the newer file wins, a CSV written while pyarrow was missing replaces an older Feather file
+            candidates = [path for path in (feather_path, csv_path) if path.exists()]
+            if pyarrow is None and feather_path in candidates:
+                candidates.remove(feather_path)
+            if not candidates:
+                return None
+
+            path = max(candidates, key = lambda candidate: candidate.stat().st_mtime_ns)
+            if path == feather_path:
+                return await self._run_io(self._read_feather, path, columns)
+            return await self._run_io(pd.read_csv, path, usecols=columns, on_bad_lines='skip')
+
+
+    def write_stats(self) -> dict:
+        return {
+            'pending': len(self._pending),
+            'requested': self.writes_requested,
+            'flushed': self.writes_flushed,
+            'coalesced': self.writes_requested - self.writes_flushed - len(self._pending),
+        }
+
+
+    def cache_stats(self) -> Optional[dict]:
+        return self._json_cache.stats() if self._json_cache is not None else None
 
 
     async def path_exists(self, filename: str) -> bool:
         path = self._get_path(filename)
 
-        if path.exists():
+        if filename in self._pending or path.exists():
             return True
         else:
             return False
@@ -173,15 +536,17 @@ class BaseFileManager:
 
 class PersistentManager(BaseFileManager):
     def __init__(self):
-        super().__init__('persistent_data')  
+        # members.json is read several times per command, player_data and transactions are rewritten in bursts
+        super().__init__('persistent_data', cache_entries=32, write_delay=2.0)
 
 class RecapManager(BaseFileManager):
     def __init__(self):
+        # season datasets go through write_table/load_table
         super().__init__('recap')
 
 class DiscordAuthManager(BaseFileManager):
     def __init__(self):
-        super().__init__('discordauth')
+        super().__init__('discordauth', cache_entries=8)
 
 class LiveManager(BaseFileManager):
     def __init__(self):
@@ -189,7 +554,8 @@ class LiveManager(BaseFileManager):
 
 class SettingsManager(BaseFileManager):
     def __init__(self):
-        super().__init__('settings')
+        # the only folder people edit by hand
+        super().__init__('settings', cache_entries=16, pretty_json=True)
 
 class TestingManager(BaseFileManager):
     def __init__(self):
@@ -202,26 +568,417 @@ class VaultManager(BaseFileManager):
     async def write_pickle(self, filename, data) -> None:
         raw_path = self._get_raw_path()
         lock = self._get_lock(filename)
-        thread_lock = self._get_lock('to_thread')
         path = self._get_path(filename)
 
         raw_path.mkdir(parents=True, exist_ok=True) # Make sure the directory exists
 
         async with lock:
-            async with thread_lock:
-                with open(path, 'wb') as file:
-                    await asyncio.to_thread(pickle.dump, data, file)
+            # open, dump and rename all happen on the worker
+            await self._run_io(_dump_pickle, path, data)
 
     @async_load_pickle_error_handler
     async def load_pickle(self, filename):
         lock = self._get_lock(filename)
-        thread_lock = self._get_lock('to_thread')
         path = self._get_path(filename)
 
         async with lock:
             if not path.exists():
                 return None
-            async with thread_lock:
-                with open(path, 'rb') as file:
-                    return await asyncio.to_thread(pickle.load, file)
-                
+            return await self._run_io(_read_pickle, path)
+
+
+
+class YahooCacheManager(BaseFileManager):
+    """
+    Content-addressed store of immutable raw Yahoo payloads (completed weeks, stat categories).
+        objects/<sha256 of payload>.json holds the bytes, refs/<sha256 of url> names the object,
+        so identical payloads are stored once. Nothing is read at startup, a ref is resolved the
+        first time its url is asked for. Used from the yahoo worker threads, so the methods are
+        synchronous and guarded by a threading lock instead of the per-file asyncio locks.
+    """
+    def __init__(self):
+        super().__init__('yahoo_cache')
+        self._refs:dict[str, str] = {}
+        self._thread_lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+
+
+    @staticmethod
+    def _digest(data:bytes) -> str:
+        return hashlib.sha256(data).hexdigest()
+
+
+    def _object_path(self, digest:str) -> Path:
+        return self._path / 'objects' / digest[:2] / f'{digest}.json'
+
+
+    def _ref_path(self, url_key:str) -> Path:
+        return self._path / 'refs' / url_key
+
+
+    def _write_atomic(self, path:Path, data:bytes) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        temp_path = path.with_name(f'{path.name}.{threading.get_ident()}.tmp')
+        with open(temp_path, 'wb') as file:
+            file.write(data)
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(temp_path, path)
+
+
+    def load_payload(self, url:str) -> Optional[bytes]:
+        url_key = self._digest(url.encode('utf-8'))
+        with self._thread_lock:
+            digest = self._refs.get(url_key)
+            try:
+                if digest is None:
+                    digest = self._ref_path(url_key).read_text().strip()
+                content = self._object_path(digest).read_bytes()
+            except FileNotFoundError:
+                self.misses += 1
+                return None
+
+            # a truncated or tampered object no longer matches its address
+            if self._digest(content) != digest:
+                logger.warning(f'[YahooCacheManager] - Corrupt object {digest}, refetching.')
+                self._refs.pop(url_key, None)
+                self.misses += 1
+                return None
+
+            self._refs[url_key] = digest
+            self.hits += 1
+            return content
+
+
+    def store_payload(self, url:str, content:bytes) -> None:
+        url_key = self._digest(url.encode('utf-8'))
+        digest = self._digest(content)
+        with self._thread_lock:
+            try:
+                object_path = self._object_path(digest)
+                if not object_path.exists():
+                    self._write_atomic(object_path, content)
+                self._write_atomic(self._ref_path(url_key), digest.encode('utf-8'))
+                self._refs[url_key] = digest
+            except OSError as e:
+                logger.error(f'[YahooCacheManager] - Unable to store {url}: {e}')
+
+
+    def stats(self) -> dict:
+        return {'refs_loaded': len(self._refs), 'hits': self.hits, 'misses': self.misses}
+
+
+class SQLiteManager:
+    """
+    Indexed SQLite tables for members, league transactions, vault accounts and contracts.
+        Rows round-trip the dicts the JSON files held, so callers keep their data shapes while
+        lookups and single-row updates stop loading and rewriting whole files. One connection in
+        WAL mode is owned by a single worker thread, every query runs there and off the loop.
+        Args:
+            folder_name (str): Folder next to this module
+            db_filename (str): Database file inside it
+    """
+    SCHEMA = '''
+        CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT);
+        CREATE TABLE IF NOT EXISTS members (id TEXT PRIMARY KEY, name TEXT, discord_id TEXT, extra TEXT);
+        CREATE INDEX IF NOT EXISTS members_discord_id ON members (discord_id);
+        CREATE TABLE IF NOT EXISTS transactions (transaction_id INTEGER PRIMARY KEY, payload TEXT NOT NULL);
+        CREATE TABLE IF NOT EXISTS accounts (fantasy_id TEXT PRIMARY KEY, name, discord_tag, discord_id, money, extra TEXT);
+        CREATE INDEX IF NOT EXISTS accounts_discord_id ON accounts (discord_id);
+        CREATE TABLE IF NOT EXISTS contracts (id INTEGER PRIMARY KEY, contract_type TEXT NOT NULL, week, payload TEXT NOT NULL, contract_key TEXT);
+        CREATE INDEX IF NOT EXISTS contracts_type_week ON contracts (contract_type, week);
+    '''
+    MEMBER_COLUMNS = ('id', 'name', 'discord_id')
+    ACCOUNT_COLUMNS = ('fantasy_id', 'name', 'discord_tag', 'discord_id', 'money')
+    # fields that don't change over a contract's life, predictions, bonus and execution do
+    CONTRACT_IDENTITY = ('type', 'week', 'expiration', 'challenger', 'challengee', 'team_1_id', 'team_2_id')
+
+    def __init__(self, folder_name:str, db_filename:str = 'fantasybot.sqlite3'):
+        self._path = Path(__file__).parent / folder_name / db_filename
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='sqlite')
+        self._connection:sqlite3.Connection = None
+
+
+    ###################################################
+    # Connection
+    ###################################################
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._connection is None:
+            self._path.parent.mkdir(parents=True, exist_ok=True)
+            connection = sqlite3.connect(self._path)
+            connection.row_factory = sqlite3.Row
+            connection.execute('PRAGMA journal_mode=WAL')
+            connection.execute('PRAGMA synchronous=NORMAL')
+            connection.executescript(self.SCHEMA)
+            # databases from before contract_key
+            if 'contract_key' not in {row['name'] for row in connection.execute('PRAGMA table_info(contracts)')}:
+                connection.execute('ALTER TABLE contracts ADD COLUMN contract_key TEXT')
+            connection.execute('CREATE UNIQUE INDEX IF NOT EXISTS contracts_key ON contracts (contract_type, contract_key)')
+            self._connection = connection
+        return self._connection
+
+
+    async def _run(self, func, *args):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, lambda: func(self._connect(), *args))
+
+
+    async def _write(self, func, *args):
+        """_run inside one transaction, committed on success and rolled back on error."""
+        def transaction(connection, *args):
+            with connection:
+                return func(connection, *args)
+        return await self._run(transaction, *args)
+
+
+    def _close(self) -> None:
+        if self._connection is not None:
+            self._connection.close()
+            self._connection = None
+
+
+    async def close(self) -> None:
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(self._executor, self._close)
+
+
+    ###################################################
+    # Row <-> dict
+    ###################################################
+
+    @staticmethod
+    def _split(entry:dict, columns:tuple) -> tuple:
+        extra = {key: value for key, value in entry.items() if key not in columns}
+        return (*(entry.get(column) for column in columns), json.dumps(extra) if extra else None)
+
+
+    @staticmethod
+    def _join(row:sqlite3.Row, columns:tuple, optional:tuple = ()) -> dict:
+        entry = {column: row[column] for column in columns if not (column in optional and row[column] is None)}
+        if row['extra']:
+            entry.update(json.loads(row['extra']))
+        return entry
+
+
+    def _member(self, row:sqlite3.Row) -> Optional[dict]:
+        if row is None:
+            return None
+        return self._join(row, ('name', 'id', 'discord_id'), optional=('discord_id',))
+
+
+    def _account(self, row:sqlite3.Row) -> Optional[dict]:
+        if row is None:
+            return None
+        return self._join(row, ('name', 'discord_tag', 'discord_id', 'fantasy_id', 'money'))
+
+
+    ###################################################
+    # Meta
+    ###################################################
+
+    async def get_meta(self, key:str, default:Any = None) -> Any:
+        """JSON value stored under key, e.g. poller checkpoints."""
+        def query(connection):
+            row = connection.execute('SELECT value FROM meta WHERE key = ?', (key,)).fetchone()
+            return json.loads(row['value']) if row else default
+        return await self._run(query)
+
+
+    async def set_meta(self, key:str, value:Any) -> None:
+        await self._write(lambda connection: connection.execute(
+            'INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)', (key, json.dumps(value))))
+
+
+    ###################################################
+    # Members
+    ###################################################
+
+    def _store_members(self, connection:sqlite3.Connection, members:list[dict]) -> None:
+        rows = [self._split({**member, 'id': str(member.get('id'))}, self.MEMBER_COLUMNS) for member in members]
+        connection.executemany(
+            'INSERT INTO members (id, name, discord_id, extra) VALUES (?, ?, ?, ?) '
+            'ON CONFLICT (id) DO UPDATE SET name = excluded.name, discord_id = excluded.discord_id, extra = excluded.extra '
+            'WHERE (name, discord_id, extra) IS NOT (excluded.name, excluded.discord_id, excluded.extra)',
+            rows,
+        )
+        keep = [row[0] for row in rows]
+        connection.execute(f'DELETE FROM members WHERE id NOT IN ({",".join("?" * len(keep))})', keep)
+
+
+    async def load_members(self) -> list[dict]:
+        """Every member, in team id order, as members.json held them."""
+        def query(connection):
+            rows = connection.execute('SELECT * FROM members ORDER BY CAST(id AS INTEGER)').fetchall()
+            return [self._member(row) for row in rows]
+        return await self._run(query)
+
+
+    async def store_members(self, members:list[dict]) -> None:
+        """Replace the member list, only changed rows are written."""
+        await self._write(self._store_members, members)
+
+
+    async def has_members(self) -> bool:
+        return await self._run(lambda connection: connection.execute('SELECT 1 FROM members LIMIT 1').fetchone() is not None)
+
+
+    async def get_member(self, team_id) -> Optional[dict]:
+        return await self._run(lambda connection: self._member(
+            connection.execute('SELECT * FROM members WHERE id = ?', (str(team_id),)).fetchone()))
+
+
+    async def get_member_by_discord(self, discord_id) -> Optional[dict]:
+        return await self._run(lambda connection: self._member(
+            connection.execute('SELECT * FROM members WHERE discord_id = ?', (str(discord_id),)).fetchone()))
+
+
+    async def bind_discord(self, team_id, discord_id) -> bool:
+        """Bind a team to a discord id. False when the team doesn't exist."""
+        return await self._write(lambda connection: connection.execute(
+            'UPDATE members SET discord_id = ? WHERE id = ?', (str(discord_id), str(team_id))).rowcount > 0)
+
+
+    ###################################################
+    # Transactions
+    ###################################################
+
+    async def add_transaction(self, transaction_id, payload:str) -> bool:
+        """Insert one transaction. False when it was already stored."""
+        return await self._write(lambda connection: connection.execute(
+            'INSERT OR IGNORE INTO transactions (transaction_id, payload) VALUES (?, ?)', (int(transaction_id), payload)).rowcount > 0)
+
+
+    async def get_transaction(self, transaction_id) -> Optional[str]:
+        def query(connection):
+            row = connection.execute('SELECT payload FROM transactions WHERE transaction_id = ?', (int(transaction_id),)).fetchone()
+            return row['payload'] if row else None
+        return await self._run(query)
+
+
+    async def has_transaction(self, transaction_id) -> bool:
+        return await self._run(lambda connection: connection.execute(
+            'SELECT 1 FROM transactions WHERE transaction_id = ?', (int(transaction_id),)).fetchone() is not None)
+
+
+    async def transaction_ids(self) -> set[int]:
+        """Every stored transaction id, to tell new transactions apart without a query each."""
+        return await self._run(lambda connection: {row[0] for row in connection.execute('SELECT transaction_id FROM transactions')})
+
+
+    async def load_transactions(self) -> dict[str, str]:
+        """transaction_id -> payload, oldest first, as transactions.json held them."""
+        def query(connection):
+            rows = connection.execute('SELECT transaction_id, payload FROM transactions ORDER BY transaction_id').fetchall()
+            return {str(row['transaction_id']): row['payload'] for row in rows}
+        return await self._run(query)
+
+
+    ###################################################
+    # Vault accounts and contracts
+    ###################################################
+
+    def _store_accounts(self, connection:sqlite3.Connection, accounts:list[dict]) -> None:
+        rows = [self._split(account, self.ACCOUNT_COLUMNS) for account in accounts]
+        # unchanged accounts are left alone
+        connection.executemany(
+            'INSERT INTO accounts (fantasy_id, name, discord_tag, discord_id, money, extra) VALUES (?, ?, ?, ?, ?, ?) '
+            'ON CONFLICT (fantasy_id) DO UPDATE SET name = excluded.name, discord_tag = excluded.discord_tag, '
+            'discord_id = excluded.discord_id, money = excluded.money, extra = excluded.extra '
+            'WHERE (name, discord_tag, discord_id, money, extra) IS NOT '
+            '(excluded.name, excluded.discord_tag, excluded.discord_id, excluded.money, excluded.extra)',
+            rows,
+        )
+        keep = [row[0] for row in rows]
+        connection.execute(f'DELETE FROM accounts WHERE fantasy_id NOT IN ({",".join("?" * len(keep))})', keep)
+
+
+    async def load_accounts(self) -> list[dict]:
+        def query(connection):
+            rows = connection.execute('SELECT * FROM accounts ORDER BY rowid').fetchall()
+            return [self._account(row) for row in rows]
+        return await self._run(query)
+
+
+    async def store_accounts(self, accounts:list[dict]) -> None:
+        """Replace the account list, only changed rows are written."""
+        await self._write(self._store_accounts, accounts)
+
+
+    async def get_account(self, fantasy_id:str) -> Optional[dict]:
+        return await self._run(lambda connection: self._account(
+            connection.execute('SELECT * FROM accounts WHERE fantasy_id = ?', (str(fantasy_id),)).fetchone()))
+
+
+    @classmethod
+    def _contract_keys(cls, contracts:list[dict]) -> list[str]:
+        """Stable key per contract from its identity fields, the vault holds them without ids. Repeats are numbered."""
+        keys = []
+        seen = {}
+        for contract in contracts:
+            parts = []
+            for field in cls.CONTRACT_IDENTITY:
+                value = contract.get(field)
+                # accounts are serialized whole, their money changes
+                if isinstance(value, dict):
+                    value = value.get('fantasy_id')
+                parts.append('' if value is None else str(value))
+            key = '|'.join(parts)
+            seen[key] = seen.get(key, 0) + 1
+            keys.append(f'{key}#{seen[key]}')
+        return keys
+
+
+    def _store_contracts(self, connection:sqlite3.Connection, contract_type:str, contracts:list[dict]) -> None:
+        keys = self._contract_keys(contracts)
+        # unchanged contracts are left alone, new ones are appended after the rest
+        connection.executemany(
+            'INSERT INTO contracts (contract_type, contract_key, week, payload) VALUES (?, ?, ?, ?) '
+            'ON CONFLICT (contract_type, contract_key) DO UPDATE SET week = excluded.week, payload = excluded.payload '
+            'WHERE (week, payload) IS NOT (excluded.week, excluded.payload)',
+            [(contract_type, key, contract.get('week'), json.dumps(contract)) for key, contract in zip(keys, contracts)],
+        )
+        connection.execute(
+            f'DELETE FROM contracts WHERE contract_type = ? AND (contract_key IS NULL OR contract_key NOT IN ({",".join("?" * len(keys))}))',
+            (contract_type, *keys),
+        )
+
+
+    async def load_contracts(self, contract_type:str) -> list[dict]:
+        def query(connection):
+            rows = connection.execute('SELECT payload FROM contracts WHERE contract_type = ? ORDER BY id', (contract_type,)).fetchall()
+            return [json.loads(row['payload']) for row in rows]
+        return await self._run(query)
+
+
+    async def store_contracts(self, contract_type:str, contracts:list[dict]) -> None:
+        """Replace the contracts of one type, only changed rows are written."""
+        await self._write(self._store_contracts, contract_type, contracts)
+
+
+    ###################################################
+    # JSON migration
+    ###################################################
+
+    async def is_imported(self) -> bool:
+        return await self._run(lambda connection: connection.execute(
+            "SELECT 1 FROM meta WHERE key = 'json_imported'").fetchone() is not None)
+
+
+    async def import_json(self, members:list[dict], transactions:dict[str, str], accounts:list[dict],
+                          contracts:dict[str, list[dict]]) -> None:
+        """One-time import of the JSON files' contents, all in one transaction."""
+        def migrate(connection):
+            if members:
+                self._store_members(connection, members)
+            connection.executemany('INSERT OR IGNORE INTO transactions (transaction_id, payload) VALUES (?, ?)',
+                                   [(int(transaction_id), payload) for transaction_id, payload in (transactions or {}).items()])
+            if accounts:
+                self._store_accounts(connection, accounts)
+            for contract_type, entries in (contracts or {}).items():
+                self._store_contracts(connection, contract_type, entries or [])
+            # JSON like every meta value, so get_meta('json_imported') reads it back
+            connection.execute('INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)', ('json_imported', json.dumps(datetime.now().isoformat())))
+        await self._write(migrate)
@@ -14,6 +14,7 @@ import asyncio
 import aiohttp 
 
 import file_manager
+from query_helpers.rw_lock import ReadWriteLock
 
 import logging
 import logging.config
@@ -196,8 +197,9 @@ class BotState:
         self.memlist_ready = False
 
         # Shared resources and locks
+        # readers share the fantasy query, refresh_fantasy swaps it under the write side
         self.fantasy_query = None
-        self.fantasy_query_lock = asyncio.Lock()
+        self.fantasy_query_lock = ReadWriteLock()
         self.session = None
         self.session_lock = asyncio.Lock()
         self.guild_id = guild_id
@@ -233,6 +235,10 @@ class BotState:
         self.live_manager = file_manager.LiveManager()
         self.settings_manager = file_manager.SettingsManager()
         self.vault_manager = file_manager.VaultManager()
+        self.yahoo_cache_manager = file_manager.YahooCacheManager()
+
+        # members, transactions and vault state, imported once from their JSON files
+        self.state_db = file_manager.SQLiteManager('persistent_data')
 
         # shared vault 
         self.vault:Vault = None
@@ -244,6 +250,7 @@ class BotState:
         self.rss_queue_filename = 'rss_queue.json'
         self.player_data_filename = 'player_data.json'
         self.week_dates_filename = 'week_dates.json'
+        self.stat_dict_template = 'stat_dict_{game_id}.json'
         self.transactions_filename = 'transactions.json'
         self.weekly_funds_filename = "weekly_funds.json"
         self.challenges_filename = 'challenges.json'
@@ -277,6 +284,35 @@ class BotState:
         self.bot_features = self.BotFeatures(settings_manager=self.settings_manager)
 
 
+    async def flush_file_managers(self):
+        """Write out every write-behind document still waiting for its delay."""
+        for manager in (self.persistent_manager, self.recap_manager, self.discord_auth_manager,
+                        self.live_manager, self.settings_manager, self.vault_manager):
+            await manager.flush()
+
+
+    async def import_json_state(self):
+        """
+        Copy members, transactions and the vault into state_db on first start.
+            The JSON files are left as they were, a frozen snapshot of the import: nothing
+            writes them afterwards, so restoring from them loses everything since.
+        """
+        if await self.state_db.is_imported():
+            return
+
+        members = await self.persistent_manager.load_json(filename=self.members_filename)
+        transactions = await self.persistent_manager.load_json(filename=self.transactions_filename)
+        accounts = await self.vault_manager.load_json(filename=self.vault_accounts_filename)
+        contracts = {
+            Vault.SlapContract.__name__: await self.vault_manager.load_json(filename=self.vault_slap_contracts_filename),
+            Vault.GroupWagerContract.__name__: await self.vault_manager.load_json(filename=self.vault_wager_contracts_filename),
+        }
+
+        await self.state_db.import_json(members=members or [], transactions=transactions or {}, accounts=accounts or [], contracts=contracts)
+        logger.info(f'[Main_Setup] - Imported {len(members or [])} members, {len(transactions or {})} transactions '
+                    f'and {len(accounts or [])} vault accounts into SQLite. The JSON files are no longer updated.')
+
+
 bot.state = BotState(guild_id=guild_id, guild=guild)
 
 
@@ -365,9 +401,15 @@ async def on_ready():
 
 async def shutdown():
     try:
+        # before close, leftover tasks are cancelled once the bot stops
+        await bot.state.flush_file_managers()
+        logger.info('[Main_Setup] - Pending file writes flushed.')
         await bot.close()
     except Exception as e:
         logger.info(f'[Main_Setup] - Error during shutdown: {e}')
+    finally:
+        # last, once the bot and its loops no longer write through it
+        await bot.state.state_db.close()
 
 
 def handle_exit(signal_received, frame):
@@ -409,6 +451,7 @@ async def load_extensions():
 
 async def setup_hook():
     await setup_session()
+    await bot.state.import_json_state()
     await load_extensions()
 
 
@@ -0,0 +1,172 @@
+import sys
+import time
+from bisect import bisect_left
+from collections import Counter
+from typing import Callable
+
+import logging
+logger = logging.getLogger(__name__)
+
+
+# histogram bucket upper bounds in seconds, the last bucket is everything slower
+LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+
+def caller_cog(default:str = 'other') -> str:
+    """Name of the nearest cog on the call stack, the awaiting coroutines of the current task included."""
+    frame = sys._getframe(1)
+    while frame is not None:
+        module = frame.f_globals.get('__name__', '')
+        if module.startswith('cogs.'):
+            return module[5:]
+        frame = frame.f_back
+    return default
+
+
+class LatencyHistogram:
+    """Fixed bucket latency histogram, cheap enough to update on every request."""
+    __slots__ = ('counts', 'count', 'total', 'max')
+
+    def __init__(self):
+        self.counts = [0] * (len(LATENCY_BUCKETS) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+
+    def observe(self, seconds:float) -> None:
+        self.counts[bisect_left(LATENCY_BUCKETS, seconds)] += 1
+        self.count += 1
+        self.total += seconds
+        self.max = max(self.max, seconds)
+
+
+    def quantile(self, q:float) -> float:
+        """Upper bound of the bucket holding the q-th observation, max for the overflow bucket."""
+        if not self.count:
+            return 0.0
+
+        rank = q * self.count
+        seen = 0
+        for index, count in enumerate(self.counts):
+            seen += count
+            if seen >= rank and count:
+                return LATENCY_BUCKETS[index] if index < len(LATENCY_BUCKETS) else self.max
+        return self.max
+
+
+    def as_dict(self) -> dict:
+        return {
+            'count': self.count,
+            'avg': self.total / self.count if self.count else 0.0,
+            'p50': self.quantile(0.5),
+            'p95': self.quantile(0.95),
+            'max': self.max,
+            'buckets': dict(zip([*LATENCY_BUCKETS, float('inf')], self.counts)),
+        }
+
+
+class EndpointMetrics:
+    __slots__ = ('latency', 'errors', 'retries', 'cache_hits', 'cache_misses')
+
+    def __init__(self):
+        self.latency = LatencyHistogram()
+        self.errors = 0
+        self.retries = 0
+        self.cache_hits = 0
+        self.cache_misses = 0
+
+
+    def as_dict(self) -> dict:
+        lookups = self.cache_hits + self.cache_misses
+        return {
+            'latency': self.latency.as_dict(),
+            'errors': self.errors,
+            'retries': self.retries,
+            'cache_hits': self.cache_hits,
+            'cache_misses': self.cache_misses,
+            'hit_ratio': self.cache_hits / lookups if lookups else None,
+        }
+
+
+class QueryMetrics:
+    """
+    Counters for every Yahoo call made through AsyncFantasyQuery.
+        Endpoints are fantasyQuery method names. Latency covers the request on the worker
+        thread only, time spent waiting for a rate limit token is kept separately.
+        Args:
+            clock (Callable): Monotonic time source, injectable for tests
+    """
+    def __init__(self, clock:Callable[[], float] = time.monotonic):
+        self._clock = clock
+        self.started_at = clock()
+
+        self.endpoints:dict[str, EndpointMetrics] = {}
+        self.callers:Counter[str] = Counter()
+        self.token_wait = LatencyHistogram()
+
+
+    def _endpoint(self, endpoint:str) -> EndpointMetrics:
+        metrics = self.endpoints.get(endpoint)
+        if metrics is None:
+            metrics = self.endpoints[endpoint] = EndpointMetrics()
+        return metrics
+
+
+    def called(self, caller:str) -> None:
+        self.callers[caller] += 1
+
+
+    def cache_lookup(self, endpoint:str, hit:bool) -> None:
+        metrics = self._endpoint(endpoint)
+        if hit:
+            metrics.cache_hits += 1
+        else:
+            metrics.cache_misses += 1
+
+
+    def observe(self, endpoint:str, seconds:float, error:bool = False) -> None:
+        metrics = self._endpoint(endpoint)
+        metrics.latency.observe(seconds)
+        if error:
+            metrics.errors += 1
+
+
+    def retried(self, endpoint:str) -> None:
+        self._endpoint(endpoint).retries += 1
+
+
+    def waited(self, seconds:float) -> None:
+        self.token_wait.observe(seconds)
+
+
+    def uptime(self) -> float:
+        return self._clock() - self.started_at
+
+
+    def snapshot(self) -> dict:
+        days = self.uptime() / 86400
+        return {
+            'uptime': self.uptime(),
+            'endpoints': {name: metrics.as_dict() for name, metrics in sorted(self.endpoints.items())},
+            'callers': {
+                caller: {'calls': count, 'per_day': count / days if days else float(count)}
+                for caller, count in self.callers.most_common()
+            },
+            'token_wait': self.token_wait.as_dict(),
+        }
+
+
+    def summary(self) -> str:
+        """One line per endpoint plus caller totals, slowest endpoints first."""
+        lines = [f'uptime {self.uptime() / 3600:.1f}h, token wait p95 {self.token_wait.quantile(0.95):.2f}s max {self.token_wait.max:.2f}s']
+        by_p95 = sorted(self.endpoints.items(), key = lambda item: item[1].latency.quantile(0.95), reverse=True)
+        for name, metrics in by_p95:
+            latency = metrics.latency
+            lookups = metrics.cache_hits + metrics.cache_misses
+            hit_ratio = f'{metrics.cache_hits / lookups:.0%}' if lookups else '-'
+            lines.append(f'{name}: {latency.count} requests, p50 {latency.quantile(0.5):.2f}s p95 {latency.quantile(0.95):.2f}s '
+                         f'max {latency.max:.2f}s, {metrics.errors} errors, {metrics.retries} retries, cache {hit_ratio}')
+        if self.callers:
+            lines.append('callers: ' + ', '.join(f'{caller} {count}' for caller, count in self.callers.most_common()))
+        return '\n'.join(lines)
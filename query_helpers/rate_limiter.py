@@ -0,0 +1,201 @@
+import asyncio
+import heapq
+import itertools
+import time
+from contextvars import ContextVar
+from enum import IntEnum
+from functools import wraps
+from typing import Callable
+
+import logging
+logger = logging.getLogger(__name__)
+
+
+class Priority(IntEnum):
+    INTERACTIVE = 0
+    BACKGROUND = 1
+
+
+# priority of the Yahoo calls made from the current task, slash commands are interactive by default
+query_priority:ContextVar[Priority] = ContextVar('query_priority', default=Priority.INTERACTIVE)
+
+
+def background(func):
+    """Run a coroutine function's Yahoo calls at background priority, for tasks.loop bodies and bulk jobs."""
+    @wraps(func)
+    async def wrapper(*args, **kwargs):
+        token = query_priority.set(Priority.BACKGROUND)
+        try:
+            return await func(*args, **kwargs)
+        finally:
+            query_priority.reset(token)
+    return wrapper
+
+
+class SharedPriority:
+    """
+    Priority of a call several callers wait on.
+        Starts at the first caller's priority. raise_to() lets a more urgent caller that
+        joins later move the call up the limiter's queue while it waits for a token.
+    """
+    __slots__ = ('priority', '_requeue')
+
+    def __init__(self, priority:Priority):
+        self.priority = priority
+        self._requeue:Callable[[Priority], None] = None
+
+
+    def raise_to(self, priority:Priority) -> None:
+        if priority >= self.priority:
+            return
+        self.priority = priority
+        if self._requeue is not None:
+            self._requeue(priority)
+
+
+def is_rate_limited(error:Exception) -> bool:
+    """Yahoo answers 999 (yfpy raises an HTTPError about rate limiting) or a plain 429."""
+    response = getattr(error, 'response', None)
+    status_code = getattr(response, 'status_code', None)
+    if status_code in (429, 999):
+        return True
+    return 'rate limit' in str(error).lower()
+
+
+class RateLimiter:
+    """
+    Token bucket shared by every Yahoo call.
+        Waiters are served lowest priority value first, FIFO within a priority, so a slash
+        command jumps ahead of a queued background loop. backoff() empties the bucket and
+        blocks everyone for an exponentially growing window after a 999/429.
+        Args:
+            rate (float): Tokens added per second
+            burst (int): Bucket capacity
+            base_backoff (float): First backoff window in seconds, doubled on each consecutive penalty
+            max_backoff (float): Backoff ceiling in seconds
+            clock (Callable): Monotonic time source
+    """
+    def __init__(self, rate:float = 1.0, burst:int = 5, base_backoff:float = 5.0, max_backoff:float = 300.0,
+                 clock:Callable[[], float] = time.monotonic):
+        if rate <= 0 or burst < 1:
+            raise ValueError('rate must be positive and burst at least 1.')
+
+        self.rate = rate
+        self.burst = burst
+        self._base_backoff = base_backoff
+        self._max_backoff = max_backoff
+        self._clock = clock
+
+        self._tokens = float(burst)
+        self._updated = clock()
+        self._blocked_until = 0.0
+        self._backoff = 0.0
+
+        self._waiters:list[tuple[int, int, asyncio.Future]] = []
+        self._sequence = itertools.count()
+        self._timer:asyncio.TimerHandle = None
+
+        self.granted = 0
+        self.queued = 0
+        self.backoffs = 0
+
+
+    def _refill(self, now:float) -> None:
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+
+    def _dispatch(self) -> None:
+        """Hand out tokens to waiters in priority order and arm a timer for the rest."""
+        self._timer = None
+        now = self._clock()
+        self._refill(now)
+
+        while self._waiters and now >= self._blocked_until and self._tokens >= 1:
+            _, _, future = heapq.heappop(self._waiters)
+            if future.done():
+                continue
+            self._tokens -= 1
+            future.set_result(None)
+
+        # drop cancelled waiters at the head so an idle bucket doesn't keep a timer alive
+        while self._waiters and self._waiters[0][2].done():
+            heapq.heappop(self._waiters)
+
+        if self._waiters:
+            delay = max(self._blocked_until - now, (1 - self._tokens) / self.rate, 0)
+            self._timer = asyncio.get_running_loop().call_later(delay, self._dispatch)
+
+
+    def _enqueue(self, priority:Priority, future:asyncio.Future) -> None:
+        heapq.heappush(self._waiters, (int(priority), next(self._sequence), future))
+        if self._timer is None:
+            self._dispatch()
+
+
+    async def acquire(self, priority:Priority = None, shared:SharedPriority = None) -> None:
+        """
+        Wait for a token.
+            Args:
+                priority (Priority): Defaults to the caller's query_priority
+                shared (SharedPriority): Priority of a coalesced call, followed if raised while waiting
+        """
+        if shared is not None:
+            priority = shared.priority
+        elif priority is None:
+            priority = query_priority.get()
+
+        future = asyncio.get_running_loop().create_future()
+        if shared is not None:
+            # a second entry for the same future, whichever is popped first resolves it and the other is skipped
+            shared._requeue = lambda raised: None if future.done() else self._enqueue(raised, future)
+        self._enqueue(priority, future)
+
+        if not future.done():
+            self.queued += 1
+        try:
+            await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                # token was granted as we were cancelled, put it back
+                self._tokens = min(self.burst, self._tokens + 1)
+            raise
+        finally:
+            if shared is not None:
+                shared._requeue = None
+        self.granted += 1
+
+
+    def backoff(self) -> float:
+        """Yahoo pushed back, block all callers. Returns the window in seconds."""
+        self._backoff = min(self._max_backoff, self._backoff * 2 if self._backoff else self._base_backoff)
+        self._blocked_until = max(self._blocked_until, self._clock() + self._backoff)
+        self._tokens = 0.0
+        self.backoffs += 1
+        logger.warning(f'[RateLimiter] - Yahoo rate limited, backing off {self._backoff:.0f}s')
+
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        if self._waiters:
+            self._dispatch()
+        return self._backoff
+
+
+    def succeeded(self) -> None:
+        """Reset the backoff window after a good response."""
+        self._backoff = 0.0
+
+
+    def stats(self) -> dict:
+        self._refill(self._clock())
+        return {
+            'rate': self.rate,
+            'burst': self.burst,
+            'tokens': round(self._tokens, 2),
+            'waiting': len({id(future) for _, _, future in self._waiters if not future.done()}),
+            'granted': self.granted,
+            'queued': self.queued,
+            'backoffs': self.backoffs,
+            'backoff_seconds': self._backoff,
+        }
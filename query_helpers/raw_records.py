@@ -0,0 +1,222 @@
+from typing import Any, Optional
+
+import logging
+logger = logging.getLogger(__name__)
+
+
+###################################################
+# Records
+###################################################
+
+class Record:
+    """Base for the lightweight records built straight from Yahoo's JSON, no per-instance __dict__."""
+    __slots__ = ()
+
+    def __repr__(self):
+        fields = ', '.join(f'{name}={getattr(self, name)!r}' for name in self.__slots__)
+        return f'{self.__class__.__name__}({fields})'
+
+
+    def __eq__(self, other):
+        if not isinstance(other, self.__class__):
+            return NotImplemented
+        return all(getattr(self, name) == getattr(other, name) for name in self.__slots__)
+
+
+class PointsRecord(Record):
+    __slots__ = ('total', 'week')
+
+    def __init__(self, total:float, week:Optional[int]):
+        self.total = total
+        self.week = week
+
+
+class TeamRecord(Record):
+    __slots__ = ('team_id', 'team_key', 'name', 'url', 'logo_url', 'team_points', 'team_projected_points', 'win_probability')
+
+    def __init__(self, team_id:int, team_key:str, name:str, url:str, logo_url:str,
+                 team_points:PointsRecord, team_projected_points:PointsRecord, win_probability:float):
+        self.team_id = team_id
+        self.team_key = team_key
+        self.name = name
+        self.url = url
+        self.logo_url = logo_url
+        self.team_points = team_points
+        self.team_projected_points = team_projected_points
+        self.win_probability = win_probability
+
+
+class MatchupRecord(Record):
+    __slots__ = ('week', 'week_start', 'week_end', 'status', 'winner_team_key', 'is_tied', 'teams')
+
+    def __init__(self, week:int, week_start:str, week_end:str, status:str, winner_team_key:str, is_tied:bool, teams:list[TeamRecord]):
+        self.week = week
+        self.week_start = week_start
+        self.week_end = week_end
+        self.status = status
+        self.winner_team_key = winner_team_key
+        self.is_tied = is_tied
+        self.teams = teams
+
+
+class RosterPlayerRecord(Record):
+    __slots__ = ('player_id', 'player_key', 'name', 'primary_position', 'selected_position',
+                 'editorial_team_full_name', 'uniform_number', 'url')
+
+    def __init__(self, player_id:int, player_key:str, name:str, primary_position:str, selected_position:str,
+                 editorial_team_full_name:str, uniform_number:str, url:str):
+        self.player_id = player_id
+        self.player_key = player_key
+        self.name = name
+        self.primary_position = primary_position
+        self.selected_position = selected_position
+        self.editorial_team_full_name = editorial_team_full_name
+        self.uniform_number = uniform_number
+        self.url = url
+
+
+class StandingsRecord(Record):
+    __slots__ = ('team_id', 'name', 'rank', 'wins', 'losses', 'ties', 'points_for', 'points_against', 'streak_type', 'streak_value')
+
+    def __init__(self, team_id:int, name:str, rank:Optional[int], wins:int, losses:int, ties:int,
+                 points_for:float, points_against:float, streak_type:str, streak_value:int):
+        self.team_id = team_id
+        self.name = name
+        self.rank = rank
+        self.wins = wins
+        self.losses = losses
+        self.ties = ties
+        self.points_for = points_for
+        self.points_against = points_against
+        self.streak_type = streak_type
+        self.streak_value = streak_value
+
+
+###################################################
+# Yahoo JSON helpers
+###################################################
+
+def _merge(items:Any) -> dict:
+    """Flatten Yahoo's nested lists of single-key dicts (padded with empty lists) into one dict."""
+    if isinstance(items, dict):
+        return items
+
+    merged = {}
+    for item in items:
+        if isinstance(item, list):
+            merged.update(_merge(item))
+        elif isinstance(item, dict):
+            merged.update(item)
+    return merged
+
+
+def _collection(node:dict, key:str) -> list:
+    """Items of a Yahoo {"0": {key: ...}, "1": ..., "count": n} collection, in order."""
+    indexes = sorted(int(index) for index in node if index.isdigit())
+    return [node[str(index)][key] for index in indexes]
+
+
+def _int(value, default = None):
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return default
+
+
+def _float(value, default:float = 0.0) -> float:
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return default
+
+
+def _points(node:Optional[dict]) -> PointsRecord:
+    node = node or {}
+    return PointsRecord(_float(node.get('total')), _int(node.get('week')))
+
+
+def _team(team_node:list) -> TeamRecord:
+    team = _merge(team_node)
+    logos = team.get('team_logos') or []
+    logo_url = logos[0]['team_logo'].get('url') if logos else None
+    return TeamRecord(
+        team_id=_int(team.get('team_id')),
+        team_key=team.get('team_key'),
+        name=team.get('name'),
+        url=team.get('url'),
+        logo_url=logo_url,
+        team_points=_points(team.get('team_points')),
+        team_projected_points=_points(team.get('team_projected_points')),
+        win_probability=_float(team.get('win_probability')),
+    )
+
+
+###################################################
+# Parsers, take the fantasy_content of a response
+###################################################
+
+def parse_scoreboard(content:dict) -> list[MatchupRecord]:
+    """league/{key}/scoreboard;week=N"""
+    scoreboard = _merge(content['league'])['scoreboard']
+    matchups_node = scoreboard['0']['matchups']
+
+    matchups = []
+    for matchup in _collection(matchups_node, 'matchup'):
+        teams = [_team(team) for team in _collection(matchup['0']['teams'], 'team')]
+        matchups.append(MatchupRecord(
+            week=_int(matchup.get('week')),
+            week_start=matchup.get('week_start'),
+            week_end=matchup.get('week_end'),
+            status=matchup.get('status'),
+            winner_team_key=matchup.get('winner_team_key'),
+            is_tied=bool(_int(matchup.get('is_tied'), 0)),
+            teams=teams,
+        ))
+    return matchups
+
+
+def parse_roster(content:dict) -> list[RosterPlayerRecord]:
+    """team/{key}/roster;week=N"""
+    roster = _merge(content['team'])['roster']
+    players_node = roster['0']['players']
+
+    players = []
+    for player_node in _collection(players_node, 'player'):
+        player = _merge(player_node)
+        selected = _merge(player.get('selected_position') or [])
+        players.append(RosterPlayerRecord(
+            player_id=_int(player.get('player_id')),
+            player_key=player.get('player_key'),
+            name=(player.get('name') or {}).get('full'),
+            primary_position=player.get('primary_position'),
+            selected_position=selected.get('position'),
+            editorial_team_full_name=player.get('editorial_team_full_name'),
+            uniform_number=player.get('uniform_number'),
+            url=player.get('url'),
+        ))
+    return players
+
+
+def parse_standings(content:dict) -> list[StandingsRecord]:
+    """league/{key}/standings, ordered by team_id like fantasyQuery.get_all_standings"""
+    standings = _merge(_merge(content['league'])['standings'])
+
+    records = []
+    for team_node in _collection(standings['teams'], 'team'):
+        team = _merge(team_node)
+        team_standings = team.get('team_standings') or {}
+        outcome_totals = team_standings.get('outcome_totals') or {}
+        streak = team_standings.get('streak') or {}
+        records.append(StandingsRecord(
+            team_id=_int(team.get('team_id')),
+            name=team.get('name'),
+            rank=_int(team_standings.get('rank')),
+            wins=_int(outcome_totals.get('wins'), 0),
+            losses=_int(outcome_totals.get('losses'), 0),
+            ties=_int(outcome_totals.get('ties'), 0),
+            points_for=_float(team_standings.get('points_for')),
+            points_against=_float(team_standings.get('points_against')),
+            streak_type=streak.get('type'),
+            streak_value=_int(streak.get('value'), 0),
+        ))
+    return sorted(records, key = lambda record: record.team_id)
@@ -0,0 +1,108 @@
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Hashable, Optional
+
+import logging
+logger = logging.getLogger(__name__)
+
+
+class CacheEntry:
+    __slots__ = ('value', 'stored_at', 'ttl', 'max_stale')
+
+    def __init__(self, value:Any, stored_at:float, ttl:Optional[float], max_stale:float):
+        self.value = value
+        self.stored_at = stored_at
+        self.ttl = ttl
+        self.max_stale = max_stale
+
+
+    def is_fresh(self, now:float) -> bool:
+        return self.ttl is None or now - self.stored_at < self.ttl
+
+
+    def is_usable(self, now:float) -> bool:
+        """Fresh, or expired but still inside the stale-while-revalidate window."""
+        return self.ttl is None or now - self.stored_at < self.ttl + self.max_stale
+
+
+class ResponseCache:
+    """
+    Size bounded LRU of Yahoo responses keyed by (endpoint, args).
+        Args:
+            max_entries (int): Entries kept before the least recently used is evicted
+            clock (Callable): Monotonic time source, injectable for tests
+    """
+    def __init__(self, max_entries:int = 512, clock:Callable[[], float] = time.monotonic):
+        self._entries:OrderedDict[Hashable, CacheEntry] = OrderedDict()
+        self._max_entries = max_entries
+        self._clock = clock
+
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+    def get(self, key:Hashable) -> Optional[CacheEntry]:
+        """
+        Look up a usable entry.
+            Returns:
+                CacheEntry | None: Fresh or stale entry, None on a miss or when past the stale window
+        """
+        entry = self._entries.get(key)
+        now = self._clock()
+
+        if entry is None or not entry.is_usable(now):
+            if entry is not None:
+                del self._entries[key]
+            self.misses += 1
+            return None
+
+        self._entries.move_to_end(key)
+        if entry.is_fresh(now):
+            self.hits += 1
+        else:
+            self.stale_hits += 1
+        return entry
+
+
+    def is_fresh(self, entry:CacheEntry) -> bool:
+        return entry.is_fresh(self._clock())
+
+
+    def set(self, key:Hashable, value:Any, ttl:Optional[float], max_stale:float = 0) -> None:
+        """
+        Store a response.
+            Args:
+                ttl (float | None): Seconds the entry is fresh, None never expires
+                max_stale (float): Seconds past the ttl the entry may still be served while revalidating
+        """
+        self._entries[key] = CacheEntry(value, self._clock(), ttl, max_stale)
+        self._entries.move_to_end(key)
+
+        while len(self._entries) > self._max_entries:
+            self._entries.popitem(last=False)
+
+
+    def invalidate(self, endpoint:Optional[str] = None) -> None:
+        """Drop every entry, or only the entries of one endpoint."""
+        if endpoint is None:
+            self._entries.clear()
+            return
+
+        for key in [key for key in self._entries if key[0] == endpoint]:
+            del self._entries[key]
+
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.stale_hits + self.misses
+        return {
+            'entries': len(self._entries),
+            'hits': self.hits,
+            'stale_hits': self.stale_hits,
+            'misses': self.misses,
+            'hit_ratio': (self.hits + self.stale_hits) / lookups if lookups else 0.0,
+        }
@@ -0,0 +1,138 @@
+import asyncio
+import time
+from contextlib import asynccontextmanager
+from typing import Callable
+
+import logging
+logger = logging.getLogger(__name__)
+
+
+class LockWaitStats:
+    __slots__ = ('acquired', 'total_wait', 'max_wait')
+
+    def __init__(self):
+        self.acquired = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+
+
+    def record(self, waited:float) -> None:
+        self.acquired += 1
+        self.total_wait += waited
+        self.max_wait = max(self.max_wait, waited)
+
+
+    def as_dict(self) -> dict:
+        return {
+            'acquired': self.acquired,
+            'avg_wait': self.total_wait / self.acquired if self.acquired else 0.0,
+            'max_wait': self.max_wait,
+            'total_wait': self.total_wait,
+        }
+
+
+class ReadWriteLock:
+    """
+    Many readers or one writer.
+        Writers are preferred: once a writer is waiting new readers queue behind it, so a
+        token refresh can't be starved by a steady stream of slash commands. Not reentrant.
+        Args:
+            clock (Callable): Monotonic time source used for the wait-time metric
+    """
+    def __init__(self, clock:Callable[[], float] = time.monotonic):
+        self._condition = asyncio.Condition()
+        self._clock = clock
+
+        self._readers = 0
+        self._writer = False
+        self._writers_waiting = 0
+
+        self._read_waits = LockWaitStats()
+        self._write_waits = LockWaitStats()
+
+        # notify tasks scheduled by the releases, referenced so they aren't collected mid-run
+        self._notifiers:set[asyncio.Task] = set()
+
+
+    @property
+    def readers(self) -> int:
+        return self._readers
+
+
+    def locked(self) -> bool:
+        """True while held exclusively."""
+        return self._writer
+
+
+    async def acquire_read(self) -> None:
+        start = self._clock()
+        async with self._condition:
+            await self._condition.wait_for(lambda: not self._writer and not self._writers_waiting)
+            self._readers += 1
+        self._read_waits.record(self._clock() - start)
+
+
+    async def release_read(self) -> None:
+        # counted down before any await, a cancelled release can't leave the lock held
+        self._readers -= 1
+        if self._readers == 0:
+            self._notify_all()
+
+
+    async def acquire_write(self) -> None:
+        start = self._clock()
+        async with self._condition:
+            self._writers_waiting += 1
+            try:
+                await self._condition.wait_for(lambda: not self._writer and self._readers == 0)
+            finally:
+                self._writers_waiting -= 1
+                # a cancelled writer may be the only thing holding readers back
+                self._condition.notify_all()
+            self._writer = True
+        self._write_waits.record(self._clock() - start)
+
+
+    async def release_write(self) -> None:
+        self._writer = False
+        self._notify_all()
+
+
+    def _notify_all(self) -> None:
+        """Wake the waiters from a task of its own, notify_all needs the condition's lock and the releaser may be cancelled."""
+        task = asyncio.get_running_loop().create_task(self._notify_waiters())
+        self._notifiers.add(task)
+        task.add_done_callback(self._notifiers.discard)
+
+
+    async def _notify_waiters(self) -> None:
+        async with self._condition:
+            self._condition.notify_all()
+
+
+    @asynccontextmanager
+    async def read(self):
+        await self.acquire_read()
+        try:
+            yield
+        finally:
+            await self.release_read()
+
+
+    @asynccontextmanager
+    async def write(self):
+        await self.acquire_write()
+        try:
+            yield
+        finally:
+            await self.release_write()
+
+
+    def stats(self) -> dict:
+        return {
+            'readers': self._readers,
+            'writer': self._writer,
+            'writers_waiting': self._writers_waiting,
+            'read': self._read_waits.as_dict(),
+            'write': self._write_waits.as_dict(),
+        }
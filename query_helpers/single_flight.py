@@ -0,0 +1,65 @@
+import asyncio
+from typing import Any, Awaitable, Callable, Hashable
+
+import logging
+logger = logging.getLogger(__name__)
+
+
+class SingleFlight:
+    """
+    Coalesces concurrent identical calls onto one in-flight task.
+        The first caller for a key starts the work, everyone arriving before it finishes
+        awaits the same task. A cancelled caller doesn't cancel the shared work.
+    """
+    def __init__(self):
+        self._inflight:dict[Hashable, asyncio.Task] = {}
+
+        self.calls = 0
+        self.coalesced = 0
+
+
+    def __len__(self) -> int:
+        return len(self._inflight)
+
+
+    def __contains__(self, key:Hashable) -> bool:
+        """True while a call for key is in flight, joining it won't invoke func."""
+        return key in self._inflight
+
+
+    async def do(self, key:Hashable, func:Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Run func once per key at a time.
+            Args:
+                key (Hashable): Identity of the call, usually (method, args)
+                func (Callable): Zero argument coroutine factory, only invoked by the first caller
+        """
+        task = self._inflight.get(key)
+        if task is None:
+            self.calls += 1
+            task = asyncio.ensure_future(func())
+            self._inflight[key] = task
+            task.add_done_callback(lambda done: self._finished(key, done))
+        else:
+            self.coalesced += 1
+
+        return await asyncio.shield(task)
+
+
+    def _finished(self, key:Hashable, task:asyncio.Task) -> None:
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+
+        # every waiter may have been cancelled, don't leave the error unretrieved
+        if not task.cancelled() and task.exception() is not None:
+            logger.debug(f'[SingleFlight] - {key} failed: {task.exception()}')
+
+
+    def stats(self) -> dict:
+        total = self.calls + self.coalesced
+        return {
+            'in_flight': len(self._inflight),
+            'calls': self.calls,
+            'coalesced': self.coalesced,
+            'dedup_ratio': self.coalesced / total if total else 0.0,
+        }
@@ -0,0 +1,325 @@
+"""
+Local stand-in for the Yahoo Fantasy API, serving recorded payloads.
+
+    python -m query_helpers.stand_in record tests/fixtures/yahoo --week 3
+    python -m query_helpers.stand_in serve tests/fixtures/yahoo --port 8800 --latency 0.3
+
+record runs the bot's usual queries against the live API (yfpyauth/.env) and saves every
+response body. serve answers the same URLs from those files, so yfpy and fantasyQuery can
+run, be tested and be benchmarked without a league or OAuth.
+"""
+import argparse
+import asyncio
+import hashlib
+import re
+import socket
+import threading
+from collections import Counter
+from contextlib import contextmanager
+from pathlib import Path
+from urllib.parse import parse_qsl, unquote, urlencode, urlsplit
+
+import requests
+from aiohttp import web
+
+import logging
+logger = logging.getLogger(__name__)
+
+
+YAHOO_API_ROOT = 'https://fantasysports.yahooapis.com'
+API_PREFIX = '/fantasy/v2/'
+
+
+###################################################
+# Fixtures
+###################################################
+
+class FixtureStore:
+    """
+    One file per recorded URL, holding the response body exactly as Yahoo sent it.
+        Args:
+            directory (Path): Fixture folder, created on the first save
+    """
+    def __init__(self, directory):
+        self.directory = Path(directory)
+
+
+    @staticmethod
+    def fixture_key(url:str) -> str:
+        """Path after /fantasy/v2/ plus any query string other than format, the same for Yahoo and the stand-in."""
+        parts = urlsplit(url)
+        path = unquote(parts.path)
+        if path.startswith(API_PREFIX):
+            path = path[len(API_PREFIX):]
+
+        query = sorted((key, value) for key, value in parse_qsl(parts.query) if key != 'format')
+        return f'{path}?{urlencode(query)}' if query else path
+
+
+    def path_for(self, url:str) -> Path:
+        key = self.fixture_key(url)
+        slug = re.sub(r'[^A-Za-z0-9]+', '_', key).strip('_')[:100]
+        digest = hashlib.sha1(key.encode()).hexdigest()[:8]
+        return self.directory / f'{slug}_{digest}.json'
+
+
+    def load(self, url:str) -> bytes:
+        path = self.path_for(url)
+        return path.read_bytes() if path.exists() else None
+
+
+    def save(self, url:str, content:bytes) -> None:
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.path_for(url).write_bytes(content)
+
+
+    def __len__(self) -> int:
+        return len(list(self.directory.glob('*.json'))) if self.directory.exists() else 0
+
+
+###################################################
+# Sessions handed to yfpy
+###################################################
+
+class StandInSession(requests.Session):
+    """requests session that sends Yahoo API URLs to the stand-in instead."""
+    def __init__(self, base_url:str):
+        super().__init__()
+        self.base_url = base_url.rstrip('/')
+
+
+    def request(self, method, url, *args, **kwargs):
+        if isinstance(url, str) and url.startswith(YAHOO_API_ROOT):
+            url = self.base_url + url[len(YAHOO_API_ROOT):]
+        return super().request(method, url, *args, **kwargs)
+
+
+class StandInOAuth:
+    """Enough of yfpy's OAuth2 for queries and fantasyQuery.refresh_credentials, no tokens involved."""
+    access_token = 'stand_in'
+    guid = 'stand_in'
+    refresh_token = 'stand_in'
+    token_time = 0
+    token_type = 'bearer'
+
+    def __init__(self, base_url:str):
+        self.session = StandInSession(base_url)
+        self.oauth = self
+
+
+    def token_is_valid(self) -> bool:
+        return True
+
+
+    def refresh_access_token(self) -> None:
+        pass
+
+
+    def get_session(self, token = None) -> StandInSession:
+        return self.session
+
+
+class RecordingSession:
+    """Wraps a live OAuth session, saving every successful response into a FixtureStore."""
+    def __init__(self, session, store:FixtureStore):
+        self._session = session
+        self._store = store
+        self.recorded = 0
+
+
+    def get(self, url, **kwargs):
+        response = self._session.get(url, **kwargs)
+        if response.status_code == 200:
+            self._store.save(url, response.content)
+            self.recorded += 1
+        return response
+
+
+    def __getattr__(self, name):
+        return getattr(self._session, name)
+
+
+def stand_in_query(base_url:str, league_id:str, game_code:str = 'nfl', game_id:int = None):
+    """A YahooFantasySportsQuery that talks to the stand-in at base_url without authenticating."""
+    from yfpy.query import YahooFantasySportsQuery
+
+    # offline skips the OAuth handshake in the constructor, turned back off so queries run
+    query = YahooFantasySportsQuery(
+        league_id=league_id,
+        game_code=game_code,
+        game_id=game_id,
+        yahoo_consumer_key='stand_in',
+        yahoo_consumer_secret='stand_in',
+        env_var_fallback=False,
+        offline=True,
+    )
+    query.offline = False
+    query.oauth = StandInOAuth(base_url)
+    return query
+
+
+def record_into(yahoo_query, directory) -> RecordingSession:
+    """Save every response the authenticated yahoo_query receives from now on into directory."""
+    session = RecordingSession(yahoo_query.oauth.session, FixtureStore(directory))
+    yahoo_query.oauth.session = session
+    return session
+
+
+###################################################
+# Server
+###################################################
+
+class StandInServer:
+    """
+    aiohttp app answering /fantasy/v2/... from a FixtureStore.
+        Unknown URLs get Yahoo's 404 error body so yfpy fails the way it would live.
+        Args:
+            fixtures (FixtureStore | Path): Recorded payloads
+            host (str): Interface to bind
+            port (int): Port to bind, 0 picks a free one
+            latency (float): Seconds added to every response, to benchmark as if Yahoo were remote
+    """
+    def __init__(self, fixtures, host:str = '127.0.0.1', port:int = 0, latency:float = 0.0):
+        self.fixtures = fixtures if isinstance(fixtures, FixtureStore) else FixtureStore(fixtures)
+        self.host = host
+        self.port = port
+        self.latency = latency
+
+        self.requests:Counter[str] = Counter()
+        self.missing:Counter[str] = Counter()
+        self._runner:web.AppRunner = None
+
+
+    @property
+    def base_url(self) -> str:
+        return f'http://{self.host}:{self.port}'
+
+
+    async def start(self) -> str:
+        app = web.Application()
+        app.router.add_get(API_PREFIX + '{tail:.*}', self._handle)
+        self._runner = web.AppRunner(app, access_log=None)
+        await self._runner.setup()
+
+        sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        sock.bind((self.host, self.port))
+        self.port = sock.getsockname()[1]
+        await web.SockSite(self._runner, sock).start()
+
+        logger.info(f'[StandInServer] - Serving {len(self.fixtures)} fixtures on {self.base_url}')
+        return self.base_url
+
+
+    async def stop(self) -> None:
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+
+
+    async def _handle(self, request:web.Request) -> web.Response:
+        url = str(request.rel_url)
+        key = self.fixtures.fixture_key(url)
+        if self.latency:
+            await asyncio.sleep(self.latency)
+
+        content = self.fixtures.load(url)
+        if content is None:
+            self.missing[key] += 1
+            logger.warning(f'[StandInServer] - No fixture for {key}')
+            return web.json_response({'error': {'lang': 'en-US', 'description': f'No fixture recorded for {key}'}}, status=404)
+
+        self.requests[key] += 1
+        return web.Response(body=content, content_type='application/json')
+
+
+@contextmanager
+def serve_in_thread(fixtures, latency:float = 0.0):
+    """Run a StandInServer on its own event loop thread, for synchronous callers like yfpy. Yields the server."""
+    loop = asyncio.new_event_loop()
+    thread = threading.Thread(target=loop.run_forever, name='yahoo_stand_in', daemon=True)
+    thread.start()
+
+    server = StandInServer(fixtures, latency=latency)
+    try:
+        asyncio.run_coroutine_threadsafe(server.start(), loop).result()
+        yield server
+    finally:
+        asyncio.run_coroutine_threadsafe(server.stop(), loop).result()
+        loop.call_soon_threadsafe(loop.stop)
+        thread.join()
+        loop.close()
+
+
+###################################################
+# Command line
+###################################################
+
+def record(directory, week:int) -> int:
+    """Capture the payloads behind the bot's regular queries for one week."""
+    import os
+    from dotenv import load_dotenv
+    from yfpy.query import YahooFantasySportsQuery
+    from fantasy import fantasyQuery
+
+    auth_dir = Path(__file__).resolve().parent.parent / 'yfpyauth'
+    load_dotenv(auth_dir / '.env', override=True)
+    yahoo_query = YahooFantasySportsQuery(
+        league_id=os.getenv('LEAGUE_ID'),
+        game_code=os.getenv('GAME_CODE').lower(),
+        game_id=os.getenv('GAME_ID'),
+        yahoo_consumer_key=os.getenv('CONSUMER_KEY'),
+        yahoo_consumer_secret=os.getenv('CONSUMER_SECRET'),
+        env_file_location=auth_dir,
+    )
+    session = record_into(yahoo_query, directory)
+
+    # constructor records the game, stat categories, league and game weeks
+    fantasy_query = fantasyQuery(yahoo_query)
+    fantasy_query.get_teams()
+    fantasy_query.get_all_standings()
+    fantasy_query.get_scoreboard(week)
+    rosters = fantasy_query.get_league_rosters(week)
+    fantasy_query.check_recent_transactions()
+
+    player_ids = [player.player_id for roster in rosters.values() for player in roster.players]
+    fantasy_query.get_player_profiles(player_ids)
+    fantasy_query.get_players_week_stats(player_ids, week)
+    return session.recorded
+
+
+async def serve(directory, host:str, port:int, latency:float) -> None:
+    server = StandInServer(directory, host=host, port=port, latency=latency)
+    print(f'Yahoo stand-in on {await server.start()}, Ctrl+C to stop')
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await server.stop()
+
+
+def main(argv:list = None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    serve_parser = commands.add_parser('serve', help='Serve recorded fixtures')
+    serve_parser.add_argument('directory')
+    serve_parser.add_argument('--host', default='127.0.0.1')
+    serve_parser.add_argument('--port', type=int, default=8800)
+    serve_parser.add_argument('--latency', type=float, default=0.0)
+
+    record_parser = commands.add_parser('record', help='Record live Yahoo responses')
+    record_parser.add_argument('directory')
+    record_parser.add_argument('--week', type=int, required=True)
+
+    args = parser.parse_args(argv)
+    if args.command == 'record':
+        print(f'Recorded {record(args.directory, args.week)} responses into {args.directory}')
+    else:
+        try:
+            asyncio.run(serve(args.directory, args.host, args.port, args.latency))
+        except KeyboardInterrupt:
+            pass
+
+
+if __name__ == '__main__':
+    main()
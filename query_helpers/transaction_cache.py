@@ -0,0 +1,51 @@
+from collections import OrderedDict
+from typing import Optional
+
+
+class TransactionCache:
+    """
+    Decoded transactions keyed by transaction_id, least recently used evicted first.
+        Filled when a transaction is stored, so posting it or turning it into trade rows
+        reuses the dict instead of decoding the payload again. Entries are shared, not copied,
+        so callers treat them as read-only.
+        Args:
+            max_entries (int): Transactions kept
+    """
+    def __init__(self, max_entries:int = 512):
+        self._entries:OrderedDict[int, dict] = OrderedDict()
+        self._max_entries = max_entries
+
+        self.hits = 0
+        self.misses = 0
+
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+    def get(self, transaction_id) -> Optional[dict]:
+        transaction = self._entries.get(int(transaction_id))
+        if transaction is None:
+            self.misses += 1
+            return None
+
+        self._entries.move_to_end(int(transaction_id))
+        self.hits += 1
+        return transaction
+
+
+    def set(self, transaction_id, transaction:dict) -> None:
+        self._entries[int(transaction_id)] = transaction
+        self._entries.move_to_end(int(transaction_id))
+        while len(self._entries) > self._max_entries:
+            self._entries.popitem(last=False)
+
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            'entries': len(self._entries),
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_ratio': self.hits / lookups if lookups else 0.0,
+        }
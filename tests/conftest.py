@@ -0,0 +1,70 @@
+import json
+import pytest
+
+from query_helpers.stand_in import FixtureStore, serve_in_thread, stand_in_query
+
+
+#############################################################################
+# shared fixtures - a two team league recorded as the stand-in would serve it
+#############################################################################
+
+API = 'https://fantasysports.yahooapis.com/fantasy/v2'
+GAME = {'game_key': '449', 'game_id': '449', 'name': 'Football', 'code': 'nfl', 'type': 'full', 'season': '2024'}
+LEAGUE = {
+    'league_key': '449.l.1', 'league_id': '1', 'name': 'Stand-in League', 'num_teams': 2, 'season': '2024',
+    'current_week': 4, 'start_week': '1', 'end_week': '17', 'start_date': '2024-09-05', 'end_date': '2024-12-30',
+}
+
+
+def team_meta(team_id):
+    return [{'team_key': f'449.l.1.t.{team_id}'}, {'team_id': str(team_id)}, {'name': f'Team {team_id}'}]
+
+
+def league_payloads() -> dict:
+    game_weeks = {str(index): {'game_week': {'week': str(index + 1), 'start': f'2024-09-{5 + 7 * index:02d}', 'end': f'2024-09-{9 + 7 * index:02d}'}}
+                  for index in range(3)}
+    game_weeks['count'] = 3
+
+    def scoreboard_team(team_id, points):
+        return {'team': [team_meta(team_id), {'team_points': {'coverage_type': 'week', 'week': '3', 'total': str(points)},
+                                              'team_projected_points': {'coverage_type': 'week', 'week': '3', 'total': '100'}}]}
+
+    matchup = {'week': '3', 'week_start': '2024-09-19', 'week_end': '2024-09-23', 'status': 'postevent', 'is_tied': 0,
+               'winner_team_key': '449.l.1.t.2', '0': {'teams': {'0': scoreboard_team(1, 98.5), '1': scoreboard_team(2, 120.1), 'count': 2}}}
+
+    return {
+        f'{API}/game/449/metadata': {'game': [GAME]},
+        f'{API}/game/449/stat_categories': {'game': [GAME, {'stat_categories': {'stats': [
+            {'stat': {'stat_id': 4, 'name': 'Passing Yards', 'display_name': 'Pass Yds'}},
+            {'stat': {'stat_id': 5, 'name': 'Passing Touchdowns', 'display_name': 'Pass TD'}},
+        ]}}]},
+        f'{API}/game/449/game_weeks': {'game': [GAME, {'game_weeks': game_weeks}]},
+        f'{API}/league/449.l.1': {'league': [LEAGUE]},
+        f'{API}/league/449.l.1/scoreboard;week=3': {'league': [LEAGUE, {'scoreboard': {'week': '3', '0': {'matchups': {'0': {'matchup': matchup}, 'count': 1}}}}]},
+    }
+
+
+@pytest.fixture
+def extra_payloads() -> dict:
+    """Payloads recorded on top of league_payloads(), override in a test module."""
+    return {}
+
+
+@pytest.fixture
+def fixtures(tmp_path, extra_payloads):
+    store = FixtureStore(tmp_path / 'yahoo')
+    for url, content in {**league_payloads(), **extra_payloads}.items():
+        store.save(url, json.dumps({'fantasy_content': content}).encode())
+    return store
+
+
+@pytest.fixture
+def server(fixtures):
+    with serve_in_thread(fixtures) as server:
+        yield server
+
+
+@pytest.fixture
+def yahoo_query(server):
+    """Unauthenticated YahooFantasySportsQuery for league 1 talking to the stand-in."""
+    return stand_in_query(server.base_url, league_id='1', game_id=449)
@@ -0,0 +1,92 @@
+import pytest
+
+from fantasy import AsyncFantasyQuery, fantasyQuery
+
+
+#############################################################################
+# fixtures - an OAuth whose refresh hands out a new token
+#############################################################################
+
+class RotatingOAuth:
+    """Enough of yfpy's OAuth2 for refresh_credentials, keeping the session it wraps."""
+    def __init__(self, session):
+        self.session = session
+        self.oauth = self
+        self.sessions = []
+
+        self.access_token = 'initial'
+        self.guid = 'guid'
+        self.refresh_token = 'initial_refresh'
+        self.token_time = 0
+        self.token_type = 'bearer'
+
+    def token_is_valid(self) -> bool:
+        return True
+
+    def refresh_access_token(self) -> None:
+        self.access_token = 'rotated'
+        self.refresh_token = 'rotated_refresh'
+        self.token_time = 1726000000.0
+
+    def get_session(self, token = None):
+        self.sessions.append(token)
+        return self.session
+
+
+@pytest.fixture
+def oauth(yahoo_query):
+    oauth = RotatingOAuth(yahoo_query.oauth.session)
+    yahoo_query.oauth = oauth
+    return oauth
+
+
+#############################################################################
+# credential_rotation tests
+#############################################################################
+
+@pytest.mark.credential_rotation
+def test_rotation_updates_the_token_yfpy_saves(server, yahoo_query, oauth, tmp_path):
+    query = fantasyQuery(yahoo_query)
+    league, stat_dict = query.league, query.stat_dict
+    requests = dict(server.requests)
+
+    query.refresh_credentials(tmp_path)
+
+    assert oauth.sessions == ['rotated']
+    assert yahoo_query._yahoo_access_token_dict == {
+        'access_token': 'rotated', 'guid': 'guid', 'refresh_token': 'rotated_refresh',
+        'token_time': 1726000000.0, 'token_type': 'bearer',
+    }
+    env_file = (tmp_path / '.env').read_text()
+    assert 'YAHOO_ACCESS_TOKEN=rotated\n' in env_file
+    assert 'YAHOO_REFRESH_TOKEN=rotated_refresh\n' in env_file
+
+    # nothing fantasy related is refetched
+    assert query.league is league and query.stat_dict is stat_dict
+    assert dict(server.requests) == requests
+
+
+@pytest.mark.credential_rotation
+def test_rotation_without_env_file_saves_nothing(yahoo_query, oauth):
+    query = fantasyQuery(yahoo_query)
+    def save_access_token_data_to_env_file(*args, **kwargs):
+        raise AssertionError('saved')
+    yahoo_query.save_access_token_data_to_env_file = save_access_token_data_to_env_file
+
+    query.refresh_credentials()
+    assert yahoo_query._yahoo_access_token_dict['access_token'] == 'rotated'
+
+
+@pytest.mark.credential_rotation
+async def test_facade_rotation_takes_no_rate_limit_token(yahoo_query, oauth):
+    fantasy_query = AsyncFantasyQuery(fantasyQuery(yahoo_query))
+    try:
+        await fantasy_query.refresh_credentials()
+        assert fantasy_query.rate_limit_stats()['granted'] == 0
+
+        # queries keep working on the rotated session
+        assert (await fantasy_query.get_scoreboard(3)).week == 3
+        assert fantasy_query.rate_limit_stats()['granted'] == 1
+    finally:
+        fantasy_query.close()
+    assert oauth.access_token == 'rotated'
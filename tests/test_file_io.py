@@ -0,0 +1,74 @@
+import asyncio
+import threading
+import pandas as pd
+import pytest
+
+import file_manager
+from file_manager import BaseFileManager, VaultManager
+
+
+#############################################################################
+# fixtures
+#############################################################################
+
+@pytest.fixture
+def manager(tmp_path):
+    manager = BaseFileManager('recap')
+    manager._path = tmp_path
+    return manager
+
+
+@pytest.fixture
+def vault_manager(tmp_path):
+    manager = VaultManager()
+    manager._path = tmp_path
+    return manager
+
+
+def rendezvous(parties:int):
+    """Blocking stand-in that only returns once `parties` calls are inside it at the same time."""
+    barrier = threading.Barrier(parties, timeout=2)
+
+    def blocking_io(*args, **kwargs):
+        barrier.wait()
+        return pd.DataFrame({'thread': [threading.current_thread().name]})
+    return blocking_io
+
+
+#############################################################################
+# file_io tests
+#############################################################################
+
+@pytest.mark.file_io
+async def test_independent_files_run_in_parallel(manager, monkeypatch):
+    monkeypatch.setattr(file_manager.pd, 'read_csv', rendezvous(2))
+
+    roster, trades = await asyncio.gather(
+        manager.load_csv_formatted('roster_value.csv'),
+        manager.load_csv_formatted('trade_transactions.csv'),
+    )
+    assert roster['thread'][0].startswith('file_io')
+    assert trades['thread'][0] != roster['thread'][0]
+
+
+@pytest.mark.file_io
+async def test_same_file_is_serialized(manager):
+    frames = [pd.DataFrame({'week': [week]}) for week in range(5)]
+    await asyncio.gather(*(manager.write_csv_formatted('matchup_data.csv', frame) for frame in frames))
+
+    loaded = await manager.load_csv_formatted('matchup_data.csv')
+    assert list(loaded['week']) in [[week] for week in range(5)]
+
+
+@pytest.mark.file_io
+async def test_missing_csv_is_none(manager):
+    assert await manager.load_csv_formatted('missing.csv') is None
+
+
+@pytest.mark.file_io
+async def test_pickle_round_trip(vault_manager, tmp_path):
+    await vault_manager.write_pickle('vault.pkl', {'accounts': [1, 2]})
+
+    assert await vault_manager.load_pickle('vault.pkl') == {'accounts': [1, 2]}
+    assert [path.name for path in tmp_path.iterdir()] == ['vault.pkl']
+    assert await vault_manager.load_pickle('missing.pkl') is None
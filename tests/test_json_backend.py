@@ -0,0 +1,77 @@
+import json
+import pytest
+
+import file_manager
+from file_manager import BaseFileManager, SettingsManager, StdlibJson, OrjsonJson, json_serializer
+
+
+#############################################################################
+# fixtures
+#############################################################################
+
+DOCUMENT = {'week': 3, 'teams': [{'id': '1', 'name': 'Équipe Un', 'points': 98.5}], 'tied': False, 'winner': None}
+
+
+@pytest.fixture
+def orjson_backend():
+    pytest.importorskip('orjson')
+    return OrjsonJson
+
+
+#############################################################################
+# json_backend tests
+#############################################################################
+
+@pytest.mark.json_backend
+def test_stdlib_compact_by_default():
+    text = StdlibJson().dumps(DOCUMENT)
+    assert '\n' not in text and ', ' not in text
+    assert StdlibJson().loads(text) == DOCUMENT
+
+
+@pytest.mark.json_backend
+def test_stdlib_pretty_matches_old_format():
+    assert StdlibJson(pretty=True).dumps(DOCUMENT) == json.dumps(DOCUMENT, indent=4)
+
+
+@pytest.mark.json_backend
+def test_default_backend_follows_install():
+    expected = 'orjson' if file_manager.orjson is not None else 'stdlib'
+    assert json_serializer().name == expected
+
+
+@pytest.mark.json_backend
+def test_orjson_output_loads_with_stdlib(orjson_backend):
+    serializer = orjson_backend()
+    text = serializer.dumps({**DOCUMENT, 4: (1, 2)})
+    assert json.loads(text) == {**DOCUMENT, '4': [1, 2]}
+    assert serializer.loads(text) == json.loads(text)
+
+
+@pytest.mark.json_backend
+def test_orjson_falls_back_for_big_ints(orjson_backend):
+    assert json.loads(orjson_backend().dumps({'id': 2 ** 70})) == {'id': 2 ** 70}
+
+
+@pytest.mark.json_backend
+def test_pretty_output_is_the_same_for_both_backends(orjson_backend):
+    assert orjson_backend(pretty=True).dumps(DOCUMENT) == StdlibJson(pretty=True).dumps(DOCUMENT)
+
+
+@pytest.mark.json_backend
+async def test_manager_writes_compact_and_reads_old_pretty_files(tmp_path):
+    manager = BaseFileManager('persistent_data')
+    manager._path = tmp_path
+    (tmp_path / 'old.json').write_text(json.dumps(DOCUMENT, indent=4), encoding='utf-8')
+
+    assert await manager.load_json('old.json') == DOCUMENT
+    await manager.write_json('new.json', DOCUMENT)
+    assert len((tmp_path / 'new.json').read_text(encoding='utf-8').splitlines()) == 1
+
+
+@pytest.mark.json_backend
+async def test_settings_stay_pretty(tmp_path):
+    manager = SettingsManager()
+    manager._path = tmp_path
+    await manager.write_json('features_config.json', DOCUMENT)
+    assert len((tmp_path / 'features_config.json').read_text(encoding='utf-8').splitlines()) > 1
@@ -0,0 +1,119 @@
+import json
+import os
+import pytest
+
+from file_manager import BaseFileManager, copy_json
+
+
+#############################################################################
+# fixtures
+#############################################################################
+
+@pytest.fixture
+def manager(tmp_path):
+    manager = BaseFileManager('persistent_data', cache_entries=32)
+    manager._path = tmp_path / 'persistent_data'
+    return manager
+
+
+MEMBERS = [{'id': '1', 'name': 'Team 1', 'discord_id': '100'}, {'id': '2', 'name': 'Team 2'}]
+
+
+def touch_later(path):
+    """Bump the mtime as an edit outside the bot would."""
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+
+#############################################################################
+# json_cache tests
+#############################################################################
+
+@pytest.mark.json_cache
+async def test_repeat_loads_hit_the_cache(manager):
+    await manager.write_json('members.json', MEMBERS)
+
+    assert await manager.load_json('members.json') == MEMBERS
+    assert await manager.load_json('members.json') == MEMBERS
+    assert manager.cache_stats()['hits'] == 1
+    assert manager.cache_stats()['misses'] == 1
+
+
+@pytest.mark.json_cache
+async def test_loaded_documents_are_copies(manager):
+    await manager.write_json('members.json', MEMBERS)
+    await manager.load_json('members.json')
+
+    members = await manager.load_json('members.json')
+    members[1]['discord_id'] = '200'
+    members.append({'id': '3'})
+
+    assert await manager.load_json('members.json') == MEMBERS
+
+
+@pytest.mark.json_cache
+async def test_write_invalidates(manager):
+    await manager.write_json('members.json', MEMBERS)
+    await manager.load_json('members.json')
+
+    await manager.write_json('members.json', MEMBERS[:1])
+    assert await manager.load_json('members.json') == MEMBERS[:1]
+
+
+@pytest.mark.json_cache
+async def test_write_returns_json_types(manager):
+    await manager.write_json('scores.json', {1: (1.5, 2.5)})
+    await manager.load_json('scores.json')
+    assert await manager.load_json('scores.json') == {'1': [1.5, 2.5]}
+
+
+@pytest.mark.json_cache
+async def test_external_edit_is_picked_up(manager):
+    await manager.write_json('members.json', MEMBERS)
+    await manager.load_json('members.json')
+
+    path = manager._get_path('members.json')
+    path.write_text(json.dumps(MEMBERS[1:]))
+    touch_later(path)
+
+    assert await manager.load_json('members.json') == MEMBERS[1:]
+
+
+@pytest.mark.json_cache
+async def test_deleted_file_loads_empty(manager):
+    await manager.write_json('members.json', MEMBERS)
+    await manager.load_json('members.json')
+
+    manager._get_path('members.json').unlink()
+    assert await manager.load_json('members.json') == {}
+
+
+@pytest.mark.json_cache
+async def test_lru_is_bounded(tmp_path):
+    manager = BaseFileManager('persistent_data', cache_entries=2)
+    manager._path = tmp_path
+    for name in ('a.json', 'b.json', 'c.json'):
+        await manager.write_json(name, {'name': name})
+        await manager.load_json(name)
+
+    assert manager.cache_stats()['entries'] == 2
+    await manager.load_json('a.json')
+    assert manager.cache_stats()['hits'] == 0
+
+
+@pytest.mark.json_cache
+async def test_cache_is_opt_in(tmp_path):
+    manager = BaseFileManager('recap')
+    manager._path = tmp_path
+    await manager.write_json('week_1.json', {'week': 1})
+
+    assert await manager.load_json('week_1.json') == {'week': 1}
+    assert manager.cache_stats() is None
+
+
+@pytest.mark.json_cache
+def test_copy_json_is_deep():
+    document = {'teams': [{'id': 1, 'players': ['a']}]}
+    copied = copy_json(document)
+    copied['teams'][0]['players'].append('b')
+    assert document == {'teams': [{'id': 1, 'players': ['a']}]}
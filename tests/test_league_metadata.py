@@ -0,0 +1,61 @@
+import pytest
+from datetime import date
+from types import SimpleNamespace
+
+from fantasy import LeagueMetadata, LEAGUE_METADATA_TTL
+
+
+#############################################################################
+# fixtures
+#############################################################################
+
+@pytest.fixture
+def league():
+    return SimpleNamespace(
+        league_key='449.l.1',
+        season=2024,
+        num_teams='12',
+        current_week=3,
+        start_week=1,
+        end_week=17,
+        start_date='2024-09-05',
+        end_date='2024-12-30',
+    )
+
+
+#############################################################################
+# league_metadata tests
+#############################################################################
+
+@pytest.mark.league_metadata
+def test_fields_are_normalized(league):
+    metadata = LeagueMetadata(league, '2024-09-23', fetched_at=0, fetched_on=date(2024, 9, 20))
+    assert metadata.num_teams == 12
+    assert metadata.current_week == 3
+    assert metadata.week_end_date == '2024-09-23'
+
+@pytest.mark.league_metadata
+def test_fresh_inside_ttl_and_week(league):
+    metadata = LeagueMetadata(league, '2024-09-23', fetched_at=0, fetched_on=date(2024, 9, 20))
+    assert not metadata.is_stale(now=LEAGUE_METADATA_TTL - 1, today=date(2024, 9, 23))
+
+@pytest.mark.league_metadata
+def test_stale_after_ttl(league):
+    metadata = LeagueMetadata(league, '2024-09-23', fetched_at=0, fetched_on=date(2024, 9, 20))
+    assert metadata.is_stale(now=LEAGUE_METADATA_TTL, today=date(2024, 9, 20))
+
+@pytest.mark.league_metadata
+def test_stale_when_week_rolls_over(league):
+    metadata = LeagueMetadata(league, '2024-09-23', fetched_at=0, fetched_on=date(2024, 9, 20))
+    assert metadata.is_stale(now=1, today=date(2024, 9, 24))
+
+@pytest.mark.league_metadata
+def test_final_week_only_expires_by_ttl(league):
+    league.current_week = 17
+    metadata = LeagueMetadata(league, '2024-12-30', fetched_at=0, fetched_on=date(2024, 12, 20))
+    assert not metadata.is_stale(now=1, today=date(2025, 1, 15))
+
+@pytest.mark.league_metadata
+def test_late_rollover_only_expires_by_ttl(league):
+    metadata = LeagueMetadata(league, '2024-09-23', fetched_at=0, fetched_on=date(2024, 9, 24))
+    assert not metadata.is_stale(now=1, today=date(2024, 9, 24))
@@ -0,0 +1,74 @@
+import pytest
+
+from fantasy import AsyncFantasyQuery, fantasyQuery
+from tests.conftest import API, LEAGUE, team_meta
+
+
+#############################################################################
+# fixtures - both rosters of week 3 in one teams collection
+#############################################################################
+
+ROSTERS_KEY = 'league/449.l.1/teams/roster;week=3'
+TEAM_ROSTER_KEY = 'team/449.l.1.t.2/roster;week=3'
+
+
+def roster_player(player_id, position):
+    return {'player': [
+        [{'player_key': f'449.p.{player_id}'}, {'player_id': str(player_id)}, {'name': {'full': f'Player {player_id}'}}, {'display_position': position}],
+        {'selected_position': [{'coverage_type': 'week', 'week': '3'}, {'position': position}]},
+    ]}
+
+
+def roster_team(team_id, players:list[tuple[int, str]]):
+    roster_players = {str(index): roster_player(player_id, position) for index, (player_id, position) in enumerate(players)}
+    roster_players['count'] = len(players)
+    return {'team': [team_meta(team_id), {'roster': {'coverage_type': 'week', 'week': '3', 'is_editable': 0, '0': {'players': roster_players}}}]}
+
+
+@pytest.fixture
+def extra_payloads():
+    teams = {'0': roster_team(2, [(20, 'QB'), (21, 'WR')]), '1': roster_team(1, [(10, 'RB')]), 'count': 2}
+    return {
+        f'{API}/{ROSTERS_KEY}': {'league': [LEAGUE, {'teams': teams}]},
+        f'{API}/{TEAM_ROSTER_KEY}': roster_team(2, [(20, 'QB'), (21, 'WR')]),
+    }
+
+
+#############################################################################
+# league_rosters tests
+#############################################################################
+
+@pytest.mark.league_rosters
+def test_every_roster_in_one_request(server, yahoo_query):
+    query = fantasyQuery(yahoo_query)
+    rosters = query.get_league_rosters(3)
+
+    assert list(rosters) == [1, 2]
+    assert [[player.player_id for player in roster.players] for roster in rosters.values()] == [[10], [20, 21]]
+    assert rosters[2].players[1].selected_position.position == 'WR'
+    assert server.requests[ROSTERS_KEY] == 1
+    assert not [key for key in server.requests if key.startswith('team/')]
+    assert not server.missing
+
+
+@pytest.mark.league_rosters
+async def test_finished_week_is_fetched_once(server, yahoo_query):
+    fantasy_query = AsyncFantasyQuery(fantasyQuery(yahoo_query))
+    try:
+        first = await fantasy_query.get_league_rosters(3)
+        second = await fantasy_query.get_league_rosters(3)
+    finally:
+        fantasy_query.close()
+
+    assert second is first
+    assert server.requests[ROSTERS_KEY] == 1
+
+
+@pytest.mark.league_rosters
+def test_roster_records_from_team_url(server, yahoo_query):
+    query = fantasyQuery(yahoo_query)
+    records = query.get_roster_records(2, 3)
+
+    assert [record.player_id for record in records] == [20, 21]
+    assert server.requests[TEAM_ROSTER_KEY] == 1
+    assert not server.missing
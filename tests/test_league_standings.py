@@ -0,0 +1,39 @@
+import pytest
+
+from fantasy import fantasyQuery
+from tests.conftest import API, LEAGUE, team_meta
+
+
+#############################################################################
+# fixtures
+#############################################################################
+
+def standings_team(team_id, rank, wins):
+    return {'team': [team_meta(team_id), {'team_points': {'coverage_type': 'season', 'season': '2024', 'total': '300'}}, {'team_standings': {
+        'rank': rank, 'playoff_seed': str(rank), 'points_for': '300', 'points_against': '280',
+        'outcome_totals': {'wins': wins, 'losses': 3 - wins, 'ties': 0, 'percentage': f'{wins / 3:.3f}'},
+    }}]}
+
+
+@pytest.fixture
+def extra_payloads():
+    # Yahoo lists teams by rank, not by id
+    teams = {'0': standings_team(2, 1, 3), '1': standings_team(1, 2, 0), 'count': 2}
+    return {f'{API}/league/449.l.1/standings': {'league': [LEAGUE, {'standings': [{'teams': teams}]}]}}
+
+
+#############################################################################
+# league_standings tests
+#############################################################################
+
+@pytest.mark.league_standings
+def test_all_standings_in_one_request(server, yahoo_query):
+    query = fantasyQuery(yahoo_query)
+    standings = query.get_all_standings()
+
+    assert [team_id for team_id, _ in standings] == [1, 2]
+    assert [team_standings.rank for _, team_standings in standings] == [2, 1]
+    assert [team_standings.outcome_totals.wins for _, team_standings in standings] == [0, 3]
+    assert server.requests['league/449.l.1/standings'] == 1
+    assert not [key for key in server.requests if key.startswith('team/')]
+    assert not server.missing
@@ -0,0 +1,93 @@
+import pytest
+
+from fantasy import QUERY_TTLS, AsyncFantasyQuery, fantasyQuery
+from tests.conftest import API, LEAGUE
+
+
+#############################################################################
+# fixtures - season stats, ownership and percent owned in one players request
+#############################################################################
+
+def profiles_key(player_ids) -> str:
+    player_keys = ','.join(f'449.p.{player_id}' for player_id in player_ids)
+    return f'league/449.l.1/players;player_keys={player_keys};out=stats,ownership,percent_owned'
+
+
+def profile(player_id, owner_team_id = None):
+    if owner_team_id is None:
+        ownership = {'ownership_type': 'freeagents'}
+    else:
+        ownership = {'ownership_type': 'team', 'owner_team_key': f'449.l.1.t.{owner_team_id}', 'owner_team_name': f'Team {owner_team_id}'}
+    return {'player': [
+        [{'player_key': f'449.p.{player_id}'}, {'player_id': str(player_id)}, {'name': {'full': f'Player {player_id}'}}],
+        {'player_stats': {'coverage_type': 'season', 'season': '2024', 'stats': [{'stat': {'stat_id': '4', 'value': '1200'}}]},
+         'player_points': {'coverage_type': 'season', 'season': '2024', 'total': '150.5'}},
+        {'ownership': ownership},
+        {'percent_owned': [{'coverage_type': 'week'}, {'week': '4'}, {'value': 87}, {'delta': '1.0'}]},
+    ]}
+
+
+@pytest.fixture
+def extra_payloads():
+    payloads = {}
+    for player_ids in ([7, 8], [7]):
+        players = {str(index): profile(player_id, 2 if player_id == 7 else None) for index, player_id in enumerate(player_ids)}
+        players['count'] = len(player_ids)
+        payloads[f'{API}/{profiles_key(player_ids)}'] = {'league': [LEAGUE, {'players': players}]}
+    return payloads
+
+
+#############################################################################
+# player_profiles tests
+#############################################################################
+
+@pytest.mark.player_profiles
+def test_profile_fields_from_one_request(server, yahoo_query):
+    query = fantasyQuery(yahoo_query)
+    profiles = query.get_player_profiles([7, 8])
+
+    assert sorted(profiles) == [7, 8]
+    player = profiles[7]
+    assert player.player_points.total == 150.5
+    assert player.player_stats.stats[0].value == 1200
+    assert player.ownership.owner_team_name == 'Team 2'
+    assert player.percent_owned.value == 87
+    assert not profiles[8].ownership.owner_team_name
+
+    # no separate stats, league stats or ownership requests
+    assert [key for key in server.requests if key.startswith('league/449.l.1/') or key.startswith('player')] == [profiles_key([7, 8])]
+    assert server.requests[profiles_key([7, 8])] == 1
+    assert not server.missing
+
+
+@pytest.mark.player_profiles
+async def test_single_player_profile_is_cached(server, yahoo_query):
+    fantasy_query = AsyncFantasyQuery(fantasyQuery(yahoo_query))
+    try:
+        # a single player comes back unwrapped, as /player_stats asks for it
+        first = await fantasy_query.get_player_profiles(['7'])
+        second = await fantasy_query.get_player_profiles([7])
+    finally:
+        fantasy_query.close()
+
+    assert list(first) == [7]
+    assert second is first
+    assert server.requests[profiles_key([7])] == 1
+
+
+@pytest.mark.player_profiles
+async def test_profile_ownership_refetched_after_short_ttl(server, yahoo_query):
+    fantasy_query = AsyncFantasyQuery(fantasyQuery(yahoo_query))
+    now = [0.0]
+    fantasy_query._cache._clock = lambda: now[0]
+    ttl, max_stale = QUERY_TTLS['player_profile']
+    try:
+        await fantasy_query.get_player_profiles([7])
+        # past the stale window, still inside player_season's ttl
+        now[0] = ttl + max_stale + 1
+        assert now[0] < QUERY_TTLS['player_season'][0]
+        await fantasy_query.get_player_profiles([7])
+    finally:
+        fantasy_query.close()
+
+    assert server.requests[profiles_key([7])] == 2
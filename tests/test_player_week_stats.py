@@ -0,0 +1,63 @@
+import pytest
+
+from fantasy import PLAYER_KEY_LIMIT, AsyncFantasyQuery, fantasyQuery
+from tests.conftest import API, LEAGUE
+
+
+#############################################################################
+# fixtures - weekly stats for a roster longer than one players request
+#############################################################################
+
+PLAYER_IDS = list(range(1, PLAYER_KEY_LIMIT + 2))
+
+
+def week_player(player_id):
+    return {'player': [[{'player_key': f'449.p.{player_id}'}, {'player_id': str(player_id)}, {'name': {'full': f'Player {player_id}'}}], {
+        'player_stats': {'coverage_type': 'week', 'week': '3', 'stats': [{'stat': {'stat_id': '4', 'value': str(player_id * 10)}}]},
+        'player_points': {'coverage_type': 'week', 'week': '3', 'total': str(player_id)},
+    }]}
+
+
+@pytest.fixture
+def extra_payloads():
+    payloads = {}
+    for chunk in (PLAYER_IDS[:PLAYER_KEY_LIMIT], PLAYER_IDS[PLAYER_KEY_LIMIT:]):
+        player_keys = ','.join(f'449.p.{player_id}' for player_id in chunk)
+        players = {str(index): week_player(player_id) for index, player_id in enumerate(chunk)}
+        players['count'] = len(chunk)
+        payloads[f'{API}/league/449.l.1/players;player_keys={player_keys}/stats;type=week;week=3'] = {'league': [LEAGUE, {'players': players}]}
+    return payloads
+
+
+def players_requests(server) -> list[int]:
+    return [count for key, count in server.requests.items() if key.startswith('league/449.l.1/players;')]
+
+
+#############################################################################
+# player_week_stats tests
+#############################################################################
+
+@pytest.mark.player_week_stats
+def test_week_stats_batched_by_player_key_limit(server, yahoo_query):
+    query = fantasyQuery(yahoo_query)
+    players = query.get_players_week_stats(PLAYER_IDS, 3)
+
+    assert sorted(players) == PLAYER_IDS
+    assert players[3].player_stats.stats[0].value == 30
+    # the last chunk holds a single player, which Yahoo doesn't wrap in a list
+    assert players[PLAYER_IDS[-1]].player_points.total == PLAYER_IDS[-1]
+    assert players_requests(server) == [1, 1]
+    assert not server.missing
+
+
+@pytest.mark.player_week_stats
+async def test_facade_shares_the_entry_for_any_id_order(server, yahoo_query):
+    fantasy_query = AsyncFantasyQuery(fantasyQuery(yahoo_query))
+    try:
+        first = await fantasy_query.get_players_week_stats(PLAYER_IDS, 3)
+        second = await fantasy_query.get_players_week_stats([str(player_id) for player_id in reversed(PLAYER_IDS)], 3)
+    finally:
+        fantasy_query.close()
+
+    assert second is first
+    assert players_requests(server) == [1, 1]
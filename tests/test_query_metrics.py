@@ -0,0 +1,180 @@
+import pytest
+
+from fantasy import AsyncFantasyQuery
+from query_helpers.metrics import LatencyHistogram, QueryMetrics, caller_cog
+
+
+#############################################################################
+# fixtures
+#############################################################################
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class RateLimited(Exception):
+    pass
+
+
+class FakeQuery:
+    metadata = None
+
+    def __init__(self):
+        self.failures = 0
+
+    def get_scoreboard(self, week):
+        return f'scoreboard {week}'
+
+    def get_teams(self):
+        if self.failures:
+            self.failures -= 1
+            raise RateLimited('Yahoo rate limit exceeded')
+        return ['team']
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+@pytest.fixture
+def metrics(clock):
+    return QueryMetrics(clock=clock)
+
+
+@pytest.fixture
+async def fantasy_query():
+    query = AsyncFantasyQuery(FakeQuery(), max_workers=1, rate=1000, burst=100)
+    yield query
+    query.close()
+
+
+def cog_function(name:str, source:str):
+    """Compile source as if it lived in cogs/<name>.py."""
+    namespace = {'__name__': f'cogs.{name}', 'caller_cog': caller_cog}
+    exec(source, namespace)
+    return namespace
+
+
+#############################################################################
+# query_metrics tests
+#############################################################################
+
+@pytest.mark.query_metrics
+def test_histogram_quantiles_use_bucket_bounds():
+    histogram = LatencyHistogram()
+    for seconds in (0.03, 0.2, 0.2, 0.4, 12.0):
+        histogram.observe(seconds)
+
+    assert histogram.count == 5
+    assert histogram.quantile(0.5) == 0.25
+    assert histogram.quantile(0.95) == 30.0
+    assert histogram.max == 12.0
+    assert histogram.as_dict()['avg'] == pytest.approx(12.83 / 5)
+
+
+@pytest.mark.query_metrics
+def test_histogram_overflow_reports_max():
+    histogram = LatencyHistogram()
+    histogram.observe(45.0)
+    assert histogram.quantile(0.5) == 45.0
+    assert histogram.as_dict()['buckets'][float('inf')] == 1
+
+
+@pytest.mark.query_metrics
+def test_empty_histogram_is_zero():
+    assert LatencyHistogram().quantile(0.95) == 0.0
+
+
+@pytest.mark.query_metrics
+def test_endpoint_errors_retries_and_hit_ratio(metrics):
+    metrics.observe('get_scoreboard', 0.3)
+    metrics.observe('get_scoreboard', 1.2, error=True)
+    metrics.retried('get_scoreboard')
+    metrics.cache_lookup('get_scoreboard', True)
+    metrics.cache_lookup('get_scoreboard', True)
+    metrics.cache_lookup('get_scoreboard', False)
+
+    endpoint = metrics.snapshot()['endpoints']['get_scoreboard']
+    assert endpoint['latency']['count'] == 2
+    assert endpoint['errors'] == 1
+    assert endpoint['retries'] == 1
+    assert endpoint['hit_ratio'] == pytest.approx(2 / 3)
+
+
+@pytest.mark.query_metrics
+def test_callers_per_day(metrics, clock):
+    for _ in range(6):
+        metrics.called('FantasyQuery')
+    metrics.called('MaintainVault')
+    clock.now = 43200
+
+    callers = metrics.snapshot()['callers']
+    assert list(callers) == ['FantasyQuery', 'MaintainVault']
+    assert callers['FantasyQuery']['per_day'] == pytest.approx(12)
+
+
+@pytest.mark.query_metrics
+def test_summary_lists_slowest_endpoint_first(metrics):
+    metrics.observe('get_teams', 0.1)
+    metrics.observe('get_league_rosters', 4.0)
+    metrics.called('TransactionsLog')
+
+    lines = metrics.summary().splitlines()
+    assert lines[1].startswith('get_league_rosters:')
+    assert lines[2].startswith('get_teams:')
+    assert lines[-1] == 'callers: TransactionsLog 1'
+
+
+@pytest.mark.query_metrics
+def test_caller_cog_found_through_awaiting_coroutines():
+    namespace = cog_function('MaintainVault', '''
+async def inner():
+    return caller_cog()
+
+async def outer():
+    return await inner()
+''')
+
+    async def not_a_cog():
+        return await namespace['outer']()
+
+    coroutine = not_a_cog()
+    with pytest.raises(StopIteration) as stop:
+        coroutine.send(None)
+    assert stop.value.value == 'MaintainVault'
+    assert caller_cog() == 'other'
+
+
+@pytest.mark.query_metrics
+async def test_facade_records_calls_cache_and_latency(fantasy_query):
+    namespace = cog_function('FantasyQuery', '''
+async def scoreboard(query, week):
+    return await query.get_scoreboard(week)
+''')
+    for _ in range(3):
+        assert await namespace['scoreboard'](fantasy_query, 3) == 'scoreboard 3'
+
+    snapshot = fantasy_query.metrics().snapshot()
+    endpoint = snapshot['endpoints']['get_scoreboard']
+    assert snapshot['callers']['FantasyQuery']['calls'] == 3
+    assert endpoint['latency']['count'] == 1
+    assert (endpoint['cache_hits'], endpoint['cache_misses']) == (2, 1)
+    assert snapshot['token_wait']['count'] == 1
+
+
+@pytest.mark.query_metrics
+async def test_facade_counts_rate_limit_retries(fantasy_query, monkeypatch):
+    monkeypatch.setattr(fantasy_query._limiter, 'backoff', lambda: 0)
+    fantasy_query._query.failures = 2
+
+    assert await fantasy_query.get_teams() == ['team']
+
+    endpoint = fantasy_query.metrics().snapshot()['endpoints']['get_teams']
+    assert endpoint['errors'] == 2
+    assert endpoint['retries'] == 2
+    assert endpoint['latency']['count'] == 3
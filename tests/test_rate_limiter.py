@@ -0,0 +1,188 @@
+import asyncio
+import pytest
+from requests import HTTPError
+
+from fantasy import AsyncFantasyQuery
+from query_helpers.rate_limiter import RateLimiter, Priority, SharedPriority, background, is_rate_limited, query_priority
+
+
+#############################################################################
+# fixtures
+#############################################################################
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+    def advance(self, seconds):
+        self.now += seconds
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+class FakeResponse:
+    def __init__(self, status_code):
+        self.status_code = status_code
+
+
+class FakeQuery:
+    metadata = None
+
+    def __init__(self):
+        self.calls = []
+
+    def get_scoreboard(self, week):
+        self.calls.append('scoreboard')
+        return week
+
+    def get_teams(self):
+        self.calls.append('teams')
+        return ['team']
+
+
+#############################################################################
+# rate_limiter tests
+#############################################################################
+
+@pytest.mark.rate_limiter
+async def test_burst_is_granted_without_waiting(clock):
+    limiter = RateLimiter(rate=1, burst=3, clock=clock)
+    for _ in range(3):
+        await asyncio.wait_for(limiter.acquire(), timeout=0.1)
+    assert limiter.granted == 3
+    assert limiter.queued == 0
+
+@pytest.mark.rate_limiter
+async def test_empty_bucket_waits_for_refill(clock):
+    limiter = RateLimiter(rate=1, burst=1, clock=clock)
+    await limiter.acquire()
+
+    waiter = asyncio.create_task(limiter.acquire())
+    await asyncio.sleep(0)
+    assert not waiter.done()
+
+    clock.advance(1)
+    limiter._dispatch()
+    await asyncio.wait_for(waiter, timeout=0.1)
+    assert limiter.queued == 1
+
+@pytest.mark.rate_limiter
+async def test_interactive_served_before_background(clock):
+    limiter = RateLimiter(rate=1, burst=1, clock=clock)
+    await limiter.acquire()
+
+    order = []
+    async def take(priority, name):
+        await limiter.acquire(priority)
+        order.append(name)
+
+    tasks = [
+        asyncio.create_task(take(Priority.BACKGROUND, 'loop')),
+        asyncio.create_task(take(Priority.INTERACTIVE, 'command')),
+    ]
+    await asyncio.sleep(0)
+    for _ in range(2):
+        clock.advance(1)
+        limiter._dispatch()
+        await asyncio.sleep(0)
+    await asyncio.gather(*tasks)
+    assert order == ['command', 'loop']
+
+@pytest.mark.rate_limiter
+async def test_raised_shared_priority_jumps_the_queue(clock):
+    limiter = RateLimiter(rate=1, burst=1, clock=clock)
+    await limiter.acquire()
+
+    order = []
+    async def take(name, shared = None):
+        await limiter.acquire(Priority.BACKGROUND, shared=shared)
+        order.append(name)
+
+    shared = SharedPriority(Priority.BACKGROUND)
+    tasks = [asyncio.create_task(take('loop')), asyncio.create_task(take('joined', shared))]
+    await asyncio.sleep(0)
+    shared.raise_to(Priority.INTERACTIVE)
+    shared.raise_to(Priority.BACKGROUND)
+    assert shared.priority == Priority.INTERACTIVE
+    assert limiter.stats()['waiting'] == 2
+
+    for _ in range(2):
+        clock.advance(1)
+        limiter._dispatch()
+        await asyncio.sleep(0)
+    await asyncio.gather(*tasks)
+    assert order == ['joined', 'loop']
+    assert limiter.granted == 3
+
+@pytest.mark.rate_limiter
+async def test_interactive_caller_raises_coalesced_background_call(clock):
+    fake = FakeQuery()
+    fantasy_query = AsyncFantasyQuery(fake, max_workers=1)
+    fantasy_query._limiter = RateLimiter(rate=1, burst=1, clock=clock)
+    await fantasy_query._limiter.acquire()
+
+    @background
+    async def loop_call(method_name, *args):
+        return await fantasy_query._call(method_name, *args)
+
+    try:
+        scoreboard = asyncio.create_task(loop_call('get_scoreboard', 3))
+        teams = asyncio.create_task(loop_call('get_teams'))
+        await asyncio.sleep(0)
+        # a slash command asking for the same thing lifts the shared call to its priority
+        command = asyncio.create_task(fantasy_query._call('get_teams'))
+        await asyncio.sleep(0)
+
+        for _ in range(2):
+            clock.advance(1)
+            fantasy_query._limiter._dispatch()
+            await asyncio.sleep(0.01)
+        assert await asyncio.gather(teams, command, scoreboard) == [['team'], ['team'], 3]
+    finally:
+        fantasy_query.close()
+    assert fake.calls == ['teams', 'scoreboard']
+    assert fantasy_query.coalescing_stats()['coalesced'] == 1
+    assert fantasy_query._priorities == {}
+
+@pytest.mark.rate_limiter
+async def test_backoff_blocks_and_grows(clock):
+    limiter = RateLimiter(rate=10, burst=5, base_backoff=5, max_backoff=12, clock=clock)
+    assert limiter.backoff() == 5
+    assert limiter.backoff() == 10
+    assert limiter.backoff() == 12
+
+    waiter = asyncio.create_task(limiter.acquire())
+    await asyncio.sleep(0)
+    clock.advance(11)
+    limiter._dispatch()
+    await asyncio.sleep(0)
+    assert not waiter.done()
+
+    clock.advance(2)
+    limiter._dispatch()
+    await asyncio.wait_for(waiter, timeout=0.1)
+
+    limiter.succeeded()
+    assert limiter.backoff() == 5
+
+@pytest.mark.rate_limiter
+async def test_background_decorator_sets_priority():
+    @background
+    async def loop_body():
+        return query_priority.get()
+
+    assert await loop_body() == Priority.BACKGROUND
+    assert query_priority.get() == Priority.INTERACTIVE
+
+@pytest.mark.rate_limiter
+def test_rate_limited_errors_are_detected():
+    assert is_rate_limited(HTTPError('Yahoo data unavailable due to rate limiting. Please try again later.'))
+    assert is_rate_limited(HTTPError('Too Many Requests', response=FakeResponse(429)))
+    assert not is_rate_limited(HTTPError('Not Found', response=FakeResponse(404)))
+    assert not is_rate_limited(ValueError('bad week'))
@@ -0,0 +1,98 @@
+import pytest
+
+from query_helpers.raw_records import parse_scoreboard, parse_roster, parse_standings, MatchupRecord
+
+
+#############################################################################
+# fixtures - trimmed Yahoo fantasy_content payloads
+#############################################################################
+
+def team_meta(team_id):
+    return [
+        {'team_key': f'449.l.1.t.{team_id}'},
+        {'team_id': str(team_id)},
+        {'name': f'Team {team_id}'},
+        [],
+        {'url': f'https://football.fantasysports.yahoo.com/f1/1/{team_id}'},
+        {'team_logos': [{'team_logo': {'size': 'large', 'url': f'https://logo/{team_id}.png'}}]},
+    ]
+
+
+@pytest.fixture
+def scoreboard_content():
+    def team(team_id, points):
+        return {'team': [team_meta(team_id), {
+            'win_probability': 0.5,
+            'team_points': {'coverage_type': 'week', 'week': '3', 'total': str(points)},
+            'team_projected_points': {'coverage_type': 'week', 'week': '3', 'total': '101.25'},
+        }]}
+
+    matchup = {
+        'week': '3', 'week_start': '2024-09-19', 'week_end': '2024-09-23', 'status': 'postevent',
+        'is_tied': 0, 'winner_team_key': '449.l.1.t.2',
+        '0': {'teams': {'0': team(1, 98.5), '1': team(2, 120.1), 'count': 2}},
+    }
+    return {'league': [{'league_key': '449.l.1'}, {'scoreboard': {'week': '3', '0': {'matchups': {'0': {'matchup': matchup}, 'count': 1}}}}]}
+
+
+@pytest.fixture
+def roster_content():
+    def player(player_id, position):
+        return {'player': [
+            [{'player_key': f'449.p.{player_id}'}, {'player_id': str(player_id)}, {'name': {'full': f'Player {player_id}'}},
+             {'editorial_team_full_name': 'Buffalo Bills'}, {'uniform_number': '17'}, {'primary_position': 'QB'}],
+            {'selected_position': [{'coverage_type': 'week'}, {'week': '3'}, {'position': position}]},
+        ]}
+
+    players = {'0': player(30, 'QB'), '1': player(31, 'BN'), 'count': 2}
+    return {'team': [team_meta(4), {'roster': {'coverage_type': 'week', 'week': '3', '0': {'players': players}}}]}
+
+
+@pytest.fixture
+def standings_content():
+    def team(team_id, rank):
+        return {'team': [team_meta(team_id), {'team_points': {'coverage_type': 'season', 'total': '300.5'}}, {'team_standings': {
+            'rank': rank, 'points_for': '300.5', 'points_against': 280,
+            'outcome_totals': {'wins': '2', 'losses': 1, 'ties': 0, 'percentage': '.667'},
+            'streak': {'type': 'win', 'value': '2'},
+        }}]}
+
+    teams = {'0': team(2, 1), '1': team(1, ''), 'count': 2}
+    return {'league': [{'league_key': '449.l.1'}, {'standings': [{'teams': teams}]}]}
+
+
+#############################################################################
+# raw_records tests
+#############################################################################
+
+@pytest.mark.raw_records
+def test_parse_scoreboard(scoreboard_content):
+    matchups = parse_scoreboard(scoreboard_content)
+    assert len(matchups) == 1
+
+    matchup:MatchupRecord = matchups[0]
+    assert matchup.week == 3
+    assert matchup.winner_team_key == '449.l.1.t.2'
+    assert [team.team_id for team in matchup.teams] == [1, 2]
+    assert matchup.teams[1].team_points.total == pytest.approx(120.1)
+    assert matchup.teams[0].logo_url == 'https://logo/1.png'
+
+@pytest.mark.raw_records
+def test_parse_roster(roster_content):
+    players = parse_roster(roster_content)
+    assert [(player.player_id, player.selected_position) for player in players] == [(30, 'QB'), (31, 'BN')]
+    assert players[0].name == 'Player 30'
+
+@pytest.mark.raw_records
+def test_parse_standings_ordered_by_team_id(standings_content):
+    standings = parse_standings(standings_content)
+    assert [record.team_id for record in standings] == [1, 2]
+    assert standings[0].rank is None
+    assert standings[1].wins == 2
+    assert standings[1].points_against == 280.0
+
+@pytest.mark.raw_records
+def test_records_have_no_instance_dict(scoreboard_content):
+    matchup = parse_scoreboard(scoreboard_content)[0]
+    assert not hasattr(matchup, '__dict__')
+    assert not hasattr(matchup.teams[0], '__dict__')
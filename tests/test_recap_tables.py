@@ -0,0 +1,89 @@
+import os
+import pandas as pd
+import pytest
+
+import file_manager
+from file_manager import RecapManager
+
+
+#############################################################################
+# fixtures
+#############################################################################
+
+@pytest.fixture
+def manager(tmp_path):
+    manager = RecapManager()
+    manager._path = tmp_path / 'recap'
+    return manager
+
+
+@pytest.fixture
+def without_pyarrow(monkeypatch):
+    monkeypatch.setattr(file_manager, 'pyarrow', None)
+
+
+def roster_frame() -> pd.DataFrame:
+    return pd.DataFrame({
+        'owner_id': [1, 1, 2],
+        'owner_name': ['Team One', 'Team One', 'Team Two'],
+        'week': [1, 2, 2],
+        'primary_position': ['QB', 'WR', 'DEF'],
+        'name': ['Player A', 'Player B', 'Bills'],
+        'redraft_value': [5200, 3100, 0],
+        'number': ['17', '11', '-1'],
+    })
+
+
+#############################################################################
+# recap_tables tests
+#############################################################################
+
+@pytest.mark.recap_tables
+async def test_missing_table_is_none(manager):
+    assert await manager.load_table('roster_value.csv') is None
+
+
+@pytest.mark.recap_tables
+async def test_csv_fallback_round_trip(manager, without_pyarrow):
+    await manager.write_table('roster_value.csv', roster_frame())
+
+    assert (manager._path / 'roster_value.csv').exists()
+    loaded = await manager.load_table('roster_value.csv', columns=['owner_id', 'redraft_value'])
+    assert list(loaded.columns) == ['owner_id', 'redraft_value']
+    assert loaded['redraft_value'].tolist() == [5200, 3100, 0]
+
+
+@pytest.mark.recap_tables
+async def test_reads_csv_written_before_tables(manager):
+    manager._path.mkdir(parents=True)
+    roster_frame().to_csv(manager._path / 'roster_value.csv', index=False)
+
+    loaded = await manager.load_table('roster_value.csv')
+    assert loaded['name'].tolist() == ['Player A', 'Player B', 'Bills']
+
+
+@pytest.mark.recap_tables
+async def test_feather_keeps_dtypes_and_projects_columns(manager):
+    pytest.importorskip('pyarrow')
+    await manager.write_table('roster_value.csv', roster_frame())
+
+    assert (manager._path / 'roster_value.feather').exists()
+    assert not (manager._path / 'roster_value.csv').exists()
+
+    loaded = await manager.load_table('roster_value.csv', columns=['name', 'number'])
+    assert list(loaded.columns) == ['name', 'number']
+    # CSV would have turned these back into ints
+    assert loaded['number'].tolist() == ['17', '11', '-1']
+
+
+@pytest.mark.recap_tables
+async def test_newer_csv_wins_over_feather(manager):
+    pytest.importorskip('pyarrow')
+    await manager.write_table('roster_value.csv', roster_frame())
+    feather_mtime = (manager._path / 'roster_value.feather').stat().st_mtime_ns
+
+    newer = roster_frame().head(1)
+    newer.to_csv(manager._path / 'roster_value.csv', index=False)
+    os.utime(manager._path / 'roster_value.csv', ns=(feather_mtime + 10**9, feather_mtime + 10**9))
+
+    assert len(await manager.load_table('roster_value.csv')) == 1
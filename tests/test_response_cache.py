@@ -0,0 +1,84 @@
+import pytest
+
+from query_helpers.response_cache import ResponseCache
+
+
+#############################################################################
+# fixtures
+#############################################################################
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+    def advance(self, seconds):
+        self.now += seconds
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+@pytest.fixture
+def cache(clock):
+    return ResponseCache(max_entries=3, clock=clock)
+
+
+#############################################################################
+# response_cache tests
+#############################################################################
+
+@pytest.mark.response_cache
+def test_miss_then_hit(cache):
+    key = ('scoreboard', ('3',))
+    assert cache.get(key) is None
+    cache.set(key, 'week 3', ttl=60)
+    assert cache.get(key).value == 'week 3'
+    assert cache.hits == 1
+    assert cache.misses == 1
+
+@pytest.mark.response_cache
+def test_stale_entry_served_inside_window(cache, clock):
+    key = ('scoreboard', ('3',))
+    cache.set(key, 'week 3', ttl=60, max_stale=600)
+    clock.advance(120)
+    entry = cache.get(key)
+    assert entry.value == 'week 3'
+    assert not cache.is_fresh(entry)
+    assert cache.stale_hits == 1
+
+@pytest.mark.response_cache
+def test_entry_dropped_past_stale_window(cache, clock):
+    key = ('scoreboard', ('3',))
+    cache.set(key, 'week 3', ttl=60, max_stale=600)
+    clock.advance(661)
+    assert cache.get(key) is None
+    assert len(cache) == 0
+
+@pytest.mark.response_cache
+def test_finished_week_never_expires(cache, clock):
+    key = ('scoreboard', ('1',))
+    cache.set(key, 'week 1', ttl=None)
+    clock.advance(10 ** 9)
+    assert cache.is_fresh(cache.get(key))
+
+@pytest.mark.response_cache
+def test_lru_eviction(cache):
+    for week in range(3):
+        cache.set(('scoreboard', (str(week),)), week, ttl=None)
+    cache.get(('scoreboard', ('0',)))
+    cache.set(('scoreboard', ('3',)), 3, ttl=None)
+    assert cache.get(('scoreboard', ('1',))) is None
+    assert cache.get(('scoreboard', ('0',))).value == 0
+
+@pytest.mark.response_cache
+def test_invalidate_endpoint(cache):
+    cache.set(('scoreboard', ('1',)), 1, ttl=None)
+    cache.set(('teams', ()), [], ttl=None)
+    cache.invalidate('scoreboard')
+    assert cache.get(('scoreboard', ('1',))) is None
+    assert cache.get(('teams', ())) is not None
@@ -0,0 +1,110 @@
+import asyncio
+import pytest
+
+from query_helpers.rw_lock import ReadWriteLock
+
+
+#############################################################################
+# fixtures
+#############################################################################
+
+@pytest.fixture
+def lock():
+    return ReadWriteLock()
+
+
+#############################################################################
+# rw_lock tests
+#############################################################################
+
+@pytest.mark.rw_lock
+async def test_readers_share_the_lock(lock):
+    async with lock.read():
+        async with lock.read():
+            assert lock.readers == 2
+    assert lock.readers == 0
+
+@pytest.mark.rw_lock
+async def test_writer_waits_for_readers(lock):
+    events = []
+    async def writer():
+        async with lock.write():
+            events.append('write')
+
+    await lock.acquire_read()
+    task = asyncio.create_task(writer())
+    await asyncio.sleep(0)
+    assert events == []
+
+    await lock.release_read()
+    await task
+    assert events == ['write']
+    assert not lock.locked()
+
+@pytest.mark.rw_lock
+async def test_waiting_writer_blocks_new_readers(lock):
+    events = []
+    async def writer():
+        async with lock.write():
+            events.append('write')
+
+    async def reader():
+        async with lock.read():
+            events.append('read')
+
+    await lock.acquire_read()
+    writer_task = asyncio.create_task(writer())
+    await asyncio.sleep(0)
+    reader_task = asyncio.create_task(reader())
+    await asyncio.sleep(0)
+    assert events == []
+
+    await lock.release_read()
+    await asyncio.gather(writer_task, reader_task)
+    assert events == ['write', 'read']
+
+@pytest.mark.rw_lock
+async def test_cancelled_writer_releases_readers(lock):
+    await lock.acquire_read()
+    writer_task = asyncio.create_task(lock.acquire_write())
+    await asyncio.sleep(0)
+    writer_task.cancel()
+    await asyncio.sleep(0)
+
+    await asyncio.wait_for(lock.acquire_read(), timeout=0.1)
+    assert lock.readers == 2
+
+@pytest.mark.rw_lock
+async def test_wait_time_is_recorded(lock):
+    async with lock.write():
+        reader_task = asyncio.create_task(lock.acquire_read())
+        await asyncio.sleep(0.01)
+    await reader_task
+
+    stats = lock.stats()
+    assert stats['write']['acquired'] == 1
+    assert stats['read']['acquired'] == 1
+    assert stats['read']['max_wait'] >= 0.01
+
+@pytest.mark.rw_lock
+async def test_cancelled_reader_still_releases(lock):
+    entered = asyncio.Event()
+    async def reader():
+        async with lock.read():
+            entered.set()
+            await asyncio.sleep(10)
+
+    # with the condition held elsewhere a release that waited for it is cancelled again while waiting
+    reader_task = asyncio.create_task(reader())
+    await entered.wait()
+    async with lock._condition:
+        reader_task.cancel()
+        await asyncio.sleep(0)
+        reader_task.cancel()
+        await asyncio.sleep(0)
+    with pytest.raises(asyncio.CancelledError):
+        await reader_task
+    assert lock.readers == 0
+
+    await asyncio.wait_for(lock.acquire_write(), timeout=0.1)
+    assert lock.locked()
@@ -0,0 +1,80 @@
+import asyncio
+import pytest
+
+from query_helpers.single_flight import SingleFlight
+
+
+#############################################################################
+# fixtures
+#############################################################################
+
+@pytest.fixture
+def flight():
+    return SingleFlight()
+
+
+class SlowCall:
+    def __init__(self):
+        self.count = 0
+        self.release = asyncio.Event()
+
+    async def __call__(self):
+        self.count += 1
+        await self.release.wait()
+        return self.count
+
+
+#############################################################################
+# single_flight tests
+#############################################################################
+
+@pytest.mark.single_flight
+async def test_concurrent_identical_calls_share_one_request(flight):
+    call = SlowCall()
+    waiters = [asyncio.create_task(flight.do(('scoreboard', ('3',)), call)) for _ in range(5)]
+    await asyncio.sleep(0)
+    call.release.set()
+
+    assert await asyncio.gather(*waiters) == [1] * 5
+    assert call.count == 1
+    assert flight.calls == 1
+    assert flight.coalesced == 4
+    assert len(flight) == 0
+
+@pytest.mark.single_flight
+async def test_different_keys_are_not_coalesced(flight):
+    call = SlowCall()
+    call.release.set()
+    await asyncio.gather(flight.do(('roster', ('1',)), call), flight.do(('roster', ('2',)), call))
+    assert call.count == 2
+    assert flight.coalesced == 0
+
+@pytest.mark.single_flight
+async def test_sequential_calls_are_not_coalesced(flight):
+    call = SlowCall()
+    call.release.set()
+    assert await flight.do('key', call) == 1
+    assert await flight.do('key', call) == 2
+    assert flight.stats()['calls'] == 2
+
+@pytest.mark.single_flight
+async def test_error_reaches_every_waiter(flight):
+    async def fail():
+        await asyncio.sleep(0)
+        raise RuntimeError('999')
+
+    results = await asyncio.gather(flight.do('key', fail), flight.do('key', fail), return_exceptions=True)
+    assert all(isinstance(result, RuntimeError) for result in results)
+    assert len(flight) == 0
+
+@pytest.mark.single_flight
+async def test_cancelled_waiter_does_not_cancel_shared_call(flight):
+    call = SlowCall()
+    first = asyncio.create_task(flight.do('key', call))
+    second = asyncio.create_task(flight.do('key', call))
+    await asyncio.sleep(0)
+    first.cancel()
+    call.release.set()
+
+    assert await second == 1
+    assert first.cancelled()
@@ -0,0 +1,159 @@
+import pytest
+
+from file_manager import SQLiteManager
+
+
+#############################################################################
+# fixtures
+#############################################################################
+
+MEMBERS = [
+    {'name': 'Team One', 'id': '1', 'discord_id': '111'},
+    {'name': 'Team Two', 'id': '2'},
+    {'name': 'Team Ten', 'id': '10', 'discord_id': '1010'},
+]
+
+ACCOUNTS = [
+    {'name': 'Team One', 'discord_tag': '<@111>', 'discord_id': '111', 'fantasy_id': '1', 'money': 300},
+    {'name': 'Team Ten', 'discord_tag': '<@1010>', 'discord_id': '1010', 'fantasy_id': '10', 'money': 150},
+]
+
+
+@pytest.fixture
+async def state_db(tmp_path):
+    state_db = SQLiteManager('persistent_data')
+    state_db._path = tmp_path / 'state.sqlite3'
+    yield state_db
+    await state_db.close()
+
+
+#############################################################################
+# sqlite_manager tests
+#############################################################################
+
+@pytest.mark.sqlite_manager
+async def test_members_round_trip_in_team_order(state_db):
+    assert not await state_db.has_members()
+    await state_db.store_members(list(reversed(MEMBERS)))
+
+    assert await state_db.has_members()
+    assert await state_db.load_members() == MEMBERS
+
+
+@pytest.mark.sqlite_manager
+async def test_member_lookups(state_db):
+    await state_db.store_members(MEMBERS)
+
+    assert (await state_db.get_member(10))['name'] == 'Team Ten'
+    assert (await state_db.get_member_by_discord(111))['id'] == '1'
+    assert await state_db.get_member(4) is None
+    assert await state_db.get_member_by_discord(999) is None
+
+
+@pytest.mark.sqlite_manager
+async def test_bind_discord(state_db):
+    await state_db.store_members(MEMBERS)
+
+    assert await state_db.bind_discord(2, 222)
+    assert not await state_db.bind_discord(7, 777)
+    assert await state_db.get_member(2) == {'name': 'Team Two', 'id': '2', 'discord_id': '222'}
+
+
+@pytest.mark.sqlite_manager
+async def test_store_members_drops_missing_and_keeps_extra_keys(state_db):
+    await state_db.store_members(MEMBERS)
+    await state_db.store_members([{'name': 'Renamed', 'id': '1', 'discord_id': '111', 'logo': 'url'}])
+
+    assert await state_db.load_members() == [{'name': 'Renamed', 'id': '1', 'discord_id': '111', 'logo': 'url'}]
+
+    await state_db.store_members([])
+    assert not await state_db.has_members()
+
+
+@pytest.mark.sqlite_manager
+async def test_transactions_insert_once(state_db):
+    assert await state_db.add_transaction('12', '{"transaction_id": 12}')
+    assert not await state_db.add_transaction(12, '{"changed": true}')
+    assert await state_db.add_transaction(3, '{"transaction_id": 3}')
+
+    assert await state_db.has_transaction('3')
+    assert await state_db.get_transaction(12) == '{"transaction_id": 12}'
+    assert await state_db.get_transaction(4) is None
+    assert list(await state_db.load_transactions()) == ['3', '12']
+
+
+@pytest.mark.sqlite_manager
+async def test_accounts_keep_types(state_db):
+    await state_db.store_accounts(ACCOUNTS)
+    assert await state_db.load_accounts() == ACCOUNTS
+
+    await state_db.store_accounts([{**ACCOUNTS[0], 'money': 275}])
+    assert await state_db.load_accounts() == [{**ACCOUNTS[0], 'money': 275}]
+    assert await state_db.get_account('10') is None
+
+
+@pytest.mark.sqlite_manager
+async def test_contracts_replaced_per_type(state_db):
+    slaps = [{'week': 3, 'challenger': '1', 'challengee': '10', 'amount': 25}]
+    wagers = [{'week': 3, 'team_1_id': '1', 'team_2_id': '2', 'bets': [{'id': '1', 'amount': 10}]}]
+
+    await state_db.store_contracts('SlapContract', slaps)
+    await state_db.store_contracts('GroupWagerContract', wagers)
+    await state_db.store_contracts('SlapContract', [])
+
+    assert await state_db.load_contracts('SlapContract') == []
+    assert await state_db.load_contracts('GroupWagerContract') == wagers
+
+
+@pytest.mark.sqlite_manager
+async def test_contracts_upsert_changed_rows(state_db):
+    slaps = [{'week': 3, 'expiration': 't1', 'challenger': {'fantasy_id': '1', 'money': 50}, 'challengee': '10', 'executed': False},
+             {'week': 3, 'expiration': 't2', 'challenger': {'fantasy_id': '2', 'money': 50}, 'challengee': '10', 'executed': False},
+             {'week': 3, 'expiration': 't3', 'challenger': {'fantasy_id': '3', 'money': 50}, 'challengee': '10', 'executed': False}]
+    await state_db.store_contracts('SlapContract', slaps)
+    rowids = lambda: state_db._run(lambda connection: [row['id'] for row in connection.execute('SELECT id FROM contracts ORDER BY id')])
+    before = await rowids()
+
+    # first executed and dropped, second changes, a new one arrives
+    slaps[1]['executed'] = True
+    slaps[1]['challenger']['money'] = 10
+    new = {'week': 3, 'expiration': 't4', 'challenger': {'fantasy_id': '4', 'money': 50}, 'challengee': '10', 'executed': False}
+    await state_db.store_contracts('SlapContract', slaps[1:] + [new])
+
+    after = await rowids()
+    assert after[:2] == before[1:]
+    assert await state_db.load_contracts('SlapContract') == slaps[1:] + [new]
+
+
+@pytest.mark.sqlite_manager
+async def test_import_json_runs_once(state_db):
+    assert not await state_db.is_imported()
+    await state_db.import_json(members=MEMBERS, transactions={'5': '{}'}, accounts=ACCOUNTS,
+                               contracts={'SlapContract': [{'week': 1}], 'GroupWagerContract': {}})
+
+    assert await state_db.is_imported()
+    assert isinstance(await state_db.get_meta('json_imported'), str)
+    assert await state_db.load_members() == MEMBERS
+    assert await state_db.load_transactions() == {'5': '{}'}
+    assert await state_db.load_accounts() == ACCOUNTS
+    assert await state_db.load_contracts('SlapContract') == [{'week': 1}]
+
+
+@pytest.mark.sqlite_manager
+async def test_data_survives_reopen(state_db):
+    await state_db.store_members(MEMBERS)
+    await state_db.close()
+
+    reopened = SQLiteManager('persistent_data')
+    reopened._path = state_db._path
+    assert await reopened.load_members() == MEMBERS
+    await reopened.close()
+
+
+@pytest.mark.sqlite_manager
+async def test_transaction_ids(state_db):
+    assert await state_db.transaction_ids() == set()
+    for transaction_id in (4, '9', 12):
+        await state_db.add_transaction(transaction_id, '{}')
+
+    assert await state_db.transaction_ids() == {4, 9, 12}
@@ -0,0 +1,103 @@
+import pytest
+
+from fantasy import fantasyQuery, AsyncFantasyQuery
+from query_helpers.stand_in import FixtureStore, RecordingSession, stand_in_query
+from tests.conftest import API
+
+
+#############################################################################
+# fixtures
+#############################################################################
+
+class FakeResponse:
+    def __init__(self, status_code, content):
+        self.status_code = status_code
+        self.content = content
+
+
+class FakeSession:
+    def __init__(self, status_code = 200):
+        self.status_code = status_code
+        self.headers = {'Authorization': 'Bearer token'}
+
+    def get(self, url, **kwargs):
+        return FakeResponse(self.status_code, b'{"fantasy_content": {}}')
+
+
+#############################################################################
+# stand_in tests
+#############################################################################
+
+@pytest.mark.stand_in
+def test_fixture_key_ignores_format_and_host():
+    live = f'{API}/players;player_keys=449.p.1,449.p.2/stats?type=week&week=3&format=json'
+    local = 'http://127.0.0.1:8800/fantasy/v2/players%3Bplayer_keys=449.p.1,449.p.2/stats?week=3&type=week'
+    assert FixtureStore.fixture_key(live) == FixtureStore.fixture_key(local)
+    assert FixtureStore.fixture_key(live) == 'players;player_keys=449.p.1,449.p.2/stats?type=week&week=3'
+
+
+@pytest.mark.stand_in
+def test_recording_session_saves_successful_responses(tmp_path):
+    store = FixtureStore(tmp_path)
+    session = RecordingSession(FakeSession(), store)
+    session.get(f'{API}/league/449.l.1', params={'format': 'json'})
+
+    assert session.recorded == 1
+    assert store.load(f'{API}/league/449.l.1') == b'{"fantasy_content": {}}'
+    assert session.headers['Authorization'] == 'Bearer token'
+
+    failing = RecordingSession(FakeSession(status_code=999), store)
+    failing.get(f'{API}/league/449.l.1/standings')
+    assert failing.recorded == 0
+    assert len(store) == 1
+
+
+@pytest.mark.stand_in
+def test_fantasy_query_runs_against_stand_in(server):
+    query = fantasyQuery(stand_in_query(server.base_url, league_id='1', game_id=449))
+
+    assert query.league_key == '449.l.1'
+    assert query.stat_dict == {'4': 'Passing Yards', '5': 'Passing Touchdowns'}
+    assert query.metadata.current_week == 4
+    assert query.metadata.num_teams == 2
+
+    matchups = query.get_scoreboard_records(3)
+    assert [team.team_points.total for team in matchups[0].teams] == [98.5, 120.1]
+    assert server.requests['league/449.l.1/scoreboard;week=3'] == 1
+    assert not server.missing
+
+
+@pytest.mark.stand_in
+def test_unrecorded_url_fails_like_yahoo(server):
+    query = stand_in_query(server.base_url, league_id='1', game_id=449)
+    with pytest.raises(Exception):
+        query.get_league_standings()
+    assert server.missing == {'league/449.l.1/standings': 1}
+
+
+@pytest.mark.stand_in
+async def test_async_facade_against_stand_in(server):
+    fantasy_query = await AsyncFantasyQuery.create(stand_in_query(server.base_url, league_id='1', game_id=449), rate=100, burst=10)
+    try:
+        first = await fantasy_query.get_scoreboard_records(3)
+        second = await fantasy_query.get_scoreboard_records(3)
+    finally:
+        fantasy_query.close()
+
+    assert first == second
+    assert server.requests['league/449.l.1/scoreboard;week=3'] == 1
+
+
+@pytest.mark.stand_in
+async def test_rebind_takes_a_token_per_constructor_request(server):
+    fantasy_query = await AsyncFantasyQuery.create(stand_in_query(server.base_url, league_id='1', game_id=449), rate=100, burst=10)
+    try:
+        requests = sum(server.requests.values())
+        assert requests > 1
+        assert fantasy_query.rate_limit_stats()['granted'] == requests
+
+        # once bound the facade takes the tokens, the constructor's throttle is off
+        await fantasy_query.get_scoreboard_records(3)
+        assert fantasy_query.rate_limit_stats()['granted'] == requests + 1
+    finally:
+        fantasy_query.close()
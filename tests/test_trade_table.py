@@ -0,0 +1,177 @@
+import asyncio
+import pandas as pd
+import pytest
+from types import SimpleNamespace
+
+from yfpy.models import Transaction
+
+from cogs.TradeValue import TradeValue
+from cogs.TransactionsLog import TransactionsLog
+from file_manager import BaseFileManager, SQLiteManager
+from query_helpers.rw_lock import ReadWriteLock
+
+
+#############################################################################
+# fixtures
+#############################################################################
+
+TRADE_FILENAME = 'trade_transactions.csv'
+
+
+def trade(transaction_id:int, players:list[tuple[str, str]]) -> Transaction:
+    """players: (name, source team key) pairs"""
+    return Transaction({
+        'transaction_id': transaction_id, 'type': 'trade', 'status': 'successful', 'timestamp': 1726000000 + transaction_id,
+        'players': [{'player': {'name': {'full': name}, 'transaction_data': {
+            'type': 'trade', 'source_team_key': team_key, 'source_team_name': f'Team {team_key}',
+            'destination_team_key': 'other', 'destination_team_name': 'Other'}}} for name, team_key in players],
+    })
+
+
+def add(transaction_id:int) -> Transaction:
+    return Transaction({'transaction_id': transaction_id, 'type': 'add', 'status': 'successful', 'timestamp': 1726000000 + transaction_id})
+
+
+@pytest.fixture
+async def state(tmp_path):
+    state_db = SQLiteManager('persistent_data')
+    state_db._path = tmp_path / 'state.sqlite3'
+    persistent_manager = BaseFileManager('persistent_data')
+    persistent_manager._path = tmp_path / 'persistent_data'
+
+    yield SimpleNamespace(
+        emb_color=None, private_filename='private.json', trade_transactions_filename=TRADE_FILENAME,
+        trade_value_config_filename='trade_value_config.json', roster_csv='roster_value.csv', matchup_csv='matchup_data.csv',
+        persistent_manager=persistent_manager, state_db=state_db, fantasy_query=None, fantasy_query_lock=ReadWriteLock(),
+        value_map_lock=asyncio.Lock(), value_map={'Josh Allen': {'redraftValue': 9000}, 'Davante Adams': {'redraftValue': 4000}},
+    )
+    await state_db.close()
+
+
+@pytest.fixture
+def cog(state):
+    cog = TransactionsLog(SimpleNamespace(state=state))
+    cog._transaction_ids = set()
+
+    async def post_transaction(transaction_id, transaction = None):
+        pass
+    cog.post_transaction = post_transaction
+    return cog
+
+
+def read_trades(state) -> pd.DataFrame:
+    return pd.read_csv(state.persistent_manager._get_path(TRADE_FILENAME))
+
+
+#############################################################################
+# trade_table tests
+#############################################################################
+
+@pytest.mark.trade_table
+async def test_first_update_rebuilds_then_appends(state, cog):
+    await cog.add_new_transactions(trade(1, [('Josh Allen', 'a'), ('Davante Adams', 'b')]))
+    await cog.add_new_transactions(add(2))
+    await cog.update_trade_csv()
+    assert read_trades(state)['id'].tolist() == [1, 1]
+
+    # the rebuild is not repeated, only the new trade's rows are appended
+    await state.state_db.add_transaction(99, '{"type": "trade", "players": [{"player": {"name": {"full": "x"}, "transaction_data": {"type": "trade"}}}]}')
+    await cog.add_new_transactions(trade(3, [('Josh Allen', 'b')]))
+    await cog.update_trade_csv()
+
+    trades = read_trades(state)
+    assert list(trades.columns) == cog.TRADE_COLUMNS
+    assert trades['id'].tolist() == [1, 1, 3]
+    assert trades['value'].tolist() == [9000, 4000, 9000]
+
+
+@pytest.mark.trade_table
+async def test_player_values_matched_once_per_value_map(state, cog):
+    assert await cog.get_player_value('Josh Allen Jr') == 9000
+    state.value_map['Josh Allen']['redraftValue'] = 1
+    assert await cog.get_player_value('Josh Allen Jr') == 9000
+
+    state.value_map = {'Josh Allen': {'redraftValue': 8500}}
+    assert await cog.get_player_value('Josh Allen Jr') == 8500
+    assert await cog.get_player_value('Nobody Similar') is None
+
+
+@pytest.mark.trade_table
+async def test_trade_value_view_follows_the_file(state, cog):
+    trade_value = TradeValue(SimpleNamespace(state=state))
+    await cog.add_new_transactions(trade(4, [('Josh Allen', 'a'), ('Davante Adams', 'b')]))
+    await cog.update_trade_csv()
+
+    df, team_1, team_2 = await trade_value.refine_transaction_df(4)
+    assert df['cumulative_value'].tolist() == [9000, 4000]
+    assert {team_1, team_2} == {'Team a', 'Team b'}
+    assert await trade_value.refine_transaction_df(5) == (None, None, None)
+
+    await cog.add_new_transactions(trade(5, [('Davante Adams', 'a'), ('Josh Allen', 'b')]))
+    await cog.update_trade_csv()
+    df, _, _ = await trade_value.refine_transaction_df(5)
+    assert df['name'].tolist() == ['Josh Allen', 'Davante Adams']
+
+
+@pytest.mark.trade_table
+async def test_restart_appends_to_a_current_table(state, cog):
+    await cog.add_new_transactions(trade(1, [('Josh Allen', 'a')]))
+    await cog.update_trade_csv()
+
+    # a restarted cog appends to a table with the current header instead of rebuilding it
+    restarted = TransactionsLog(SimpleNamespace(state=state))
+    restarted._transaction_ids = await state.state_db.transaction_ids()
+    restarted.post_transaction = cog.post_transaction
+    async def create_new_trades_csv():
+        raise AssertionError('rebuilt')
+    restarted.create_new_trades_csv = create_new_trades_csv
+
+    await restarted.add_new_transactions(trade(2, [('Davante Adams', 'b')]))
+    await restarted.update_trade_csv()
+    assert read_trades(state)['id'].tolist() == [1, 2]
+
+
+@pytest.mark.trade_table
+async def test_older_header_is_rebuilt(state, cog):
+    await cog.add_new_transactions(trade(1, [('Josh Allen', 'a')]))
+    await state.persistent_manager.write_csv_formatted(TRADE_FILENAME, pd.DataFrame({'name': ['Josh Allen'], 'id': [1]}))
+
+    await cog.update_trade_csv()
+    trades = read_trades(state)
+    assert list(trades.columns) == cog.TRADE_COLUMNS
+    assert trades['id'].tolist() == [1]
+
+
+@pytest.mark.trade_table
+async def test_failed_append_keeps_trades_queued(state, cog, monkeypatch):
+    await cog.add_new_transactions(trade(1, [('Josh Allen', 'a')]))
+    await cog.update_trade_csv()
+    await cog.add_new_transactions(trade(2, [('Davante Adams', 'b')]))
+
+    async def append_csv_formatted(filename, dataframe):
+        raise OSError('disk full')
+    with monkeypatch.context() as patch:
+        patch.setattr(state.persistent_manager, 'append_csv_formatted', append_csv_formatted)
+        with pytest.raises(OSError):
+            await cog.update_trade_csv()
+    assert [t['transaction_id'] for t in cog._new_trades] == [2]
+
+    await cog.update_trade_csv()
+    assert cog._new_trades == []
+    assert read_trades(state)['id'].tolist() == [1, 2]
+
+
+@pytest.mark.trade_table
+async def test_trade_value_view_survives_a_failed_load(state, cog, monkeypatch):
+    trade_value = TradeValue(SimpleNamespace(state=state))
+    await cog.add_new_transactions(trade(4, [('Josh Allen', 'a')]))
+    await cog.update_trade_csv()
+
+    async def load_csv_formatted(filename):
+        return None
+    with monkeypatch.context() as patch:
+        patch.setattr(state.persistent_manager, 'load_csv_formatted', load_csv_formatted)
+        assert await trade_value.trades_by_id() is None
+    assert trade_value._trades_version is None
+
+    assert (await trade_value.trades_by_id())['id'].tolist() == [4]
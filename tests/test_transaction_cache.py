@@ -0,0 +1,78 @@
+import pytest
+from types import SimpleNamespace
+
+from yfpy.models import Transaction
+
+from cogs.TransactionsLog import TransactionsLog
+from file_manager import SQLiteManager
+from query_helpers.transaction_cache import TransactionCache
+
+
+#############################################################################
+# fixtures
+#############################################################################
+
+@pytest.fixture
+async def state_db(tmp_path):
+    state_db = SQLiteManager('persistent_data')
+    state_db._path = tmp_path / 'state.sqlite3'
+    yield state_db
+    await state_db.close()
+
+
+@pytest.fixture
+def cog(state_db):
+    state = SimpleNamespace(emb_color=None, private_filename='private.json', trade_transactions_filename='trade_transactions.csv',
+                            persistent_manager=None, state_db=state_db)
+    cog = TransactionsLog(SimpleNamespace(state=state))
+    cog._transaction_ids = set()
+    cog.posted = []
+
+    async def post_transaction(transaction_id, transaction = None):
+        cog.posted.append(transaction)
+    cog.post_transaction = post_transaction
+    return cog
+
+
+def transaction(transaction_id:int) -> Transaction:
+    return Transaction({'transaction_id': transaction_id, 'type': 'add', 'status': 'successful', 'timestamp': 1726000000 + transaction_id})
+
+
+#############################################################################
+# transaction_cache tests
+#############################################################################
+
+@pytest.mark.transaction_cache
+def test_least_recently_used_is_evicted():
+    cache = TransactionCache(max_entries=2)
+    cache.set(1, {'transaction_id': 1})
+    cache.set('2', {'transaction_id': 2})
+    assert cache.get('1') == {'transaction_id': 1}
+
+    cache.set(3, {'transaction_id': 3})
+    assert cache.get(2) is None
+    assert len(cache) == 2
+    assert cache.stats()['hits'] == 1
+
+
+@pytest.mark.transaction_cache
+async def test_ingest_decodes_once(cog, state_db):
+    await cog.add_new_transactions(transaction(7))
+
+    decoded = cog._decoded.get(7)
+    assert cog.posted == [decoded]
+    assert decoded['status'] == 'successful'
+
+    # served from the store, the payload is not read back
+    state_db.get_transaction = None
+    assert await cog.unpack_transaction('7') is decoded
+
+
+@pytest.mark.transaction_cache
+async def test_store_filled_from_database_on_miss(cog, state_db):
+    await state_db.add_transaction(8, TransactionsLog.encode_transaction(transaction(8)))
+
+    first = await cog.unpack_transaction('8')
+    assert first['transaction_id'] == 8
+    assert await cog.unpack_transaction(8) is first
+    assert await cog.unpack_transaction(9) is None
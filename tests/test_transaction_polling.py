@@ -0,0 +1,162 @@
+import pytest
+from types import SimpleNamespace
+
+from yfpy.models import Transaction
+
+from cogs.TransactionsLog import TransactionsLog
+from file_manager import SQLiteManager
+from query_helpers.rw_lock import ReadWriteLock
+
+
+#############################################################################
+# fixtures
+#############################################################################
+
+class FakeLeague:
+    """Transactions newest first, paged like Yahoo's league/transactions."""
+    def __init__(self, count:int):
+        self.history = [self.transaction(transaction_id) for transaction_id in range(count, 0, -1)]
+        self.requests = []
+
+    @staticmethod
+    def transaction(transaction_id:int) -> Transaction:
+        return Transaction({'transaction_id': transaction_id, 'type': 'add', 'status': 'successful', 'timestamp': 1726000000 + transaction_id})
+
+    def add(self, count:int) -> None:
+        newest = int(self.history[0].transaction_id)
+        self.history = [self.transaction(newest + offset) for offset in range(count, 0, -1)] + self.history
+
+    async def check_recent_transactions(self, start = 0, count = 25):
+        self.requests.append(start)
+        page = self.history[start:start + count]
+        return {'league': SimpleNamespace(transactions=page or None)}
+
+
+@pytest.fixture
+async def state_db(tmp_path):
+    state_db = SQLiteManager('persistent_data')
+    state_db._path = tmp_path / 'state.sqlite3'
+    yield state_db
+    await state_db.close()
+
+
+def make_cog(state_db, league:FakeLeague) -> TransactionsLog:
+    state = SimpleNamespace(
+        emb_color=None, private_filename='private.json', trade_transactions_filename='trade_transactions.csv',
+        persistent_manager=None, state_db=state_db, fantasy_query=league, fantasy_query_lock=ReadWriteLock(),
+    )
+    cog = TransactionsLog(SimpleNamespace(state=state))
+    cog.posted = []
+
+    async def post_transaction(transaction_id, transaction = None):
+        cog.posted.append(int(transaction_id))
+    cog.post_transaction = post_transaction
+    return cog
+
+
+#############################################################################
+# transaction_polling tests
+#############################################################################
+
+@pytest.mark.transaction_polling
+async def test_fresh_install_backfills_without_posting(state_db):
+    league = FakeLeague(60)
+    cog = make_cog(state_db, league)
+
+    assert await cog.update_transactions()
+    assert cog.posted == []
+    assert await state_db.transaction_ids() == set(range(1, 61))
+    assert league.requests == [0, 25, 50]
+    assert await state_db.get_meta(cog.WATERMARK_KEY) == {'transaction_id': 60, 'timestamp': 1726000060}
+
+
+@pytest.mark.transaction_polling
+async def test_steady_state_is_one_request(state_db):
+    league = FakeLeague(30)
+    cog = make_cog(state_db, league)
+    await cog.update_transactions()
+
+    league.requests.clear()
+    assert not await cog.update_transactions()
+    assert league.requests == [0]
+
+    league.add(3)
+    assert await cog.update_transactions()
+    assert league.requests == [0, 0]
+    assert cog.posted == [31, 32, 33]
+
+
+@pytest.mark.transaction_polling
+async def test_burst_larger_than_a_page(state_db):
+    league = FakeLeague(10)
+    cog = make_cog(state_db, league)
+    await cog.update_transactions()
+
+    league.add(30)
+    league.requests.clear()
+    await cog.update_transactions()
+
+    assert league.requests == [0, 25]
+    assert cog.posted == list(range(11, 41))
+
+
+@pytest.mark.transaction_polling
+async def test_backfill_resumes_from_checkpoint(state_db):
+    league = FakeLeague(80)
+    cog = make_cog(state_db, league)
+
+    original_fetch = cog.fetch_transactions
+    async def failing_fetch(start):
+        if start == 50:
+            raise ConnectionError('Yahoo went away')
+        return await original_fetch(start)
+    cog.fetch_transactions = failing_fetch
+
+    with pytest.raises(ConnectionError):
+        await cog.update_transactions()
+    assert await state_db.get_meta(cog.BACKFILL_KEY) == {'start': 50, 'complete': False}
+
+    # new transactions arrive before the restart
+    league.add(2)
+    restarted = make_cog(state_db, league)
+    league.requests.clear()
+    await restarted.update_transactions()
+
+    assert league.requests == [0, 50, 75]
+    assert restarted.posted == [81, 82]
+    assert await state_db.transaction_ids() == set(range(1, 83))
+
+
+@pytest.mark.transaction_polling
+async def test_upgrade_from_stored_history(state_db):
+    for transaction_id in range(1, 6):
+        await state_db.add_transaction(transaction_id, TransactionsLog.encode_transaction(FakeLeague.transaction(transaction_id)))
+    league = FakeLeague(7)
+    cog = make_cog(state_db, league)
+
+    await cog.update_transactions()
+
+    assert league.requests == [0]
+    assert cog.posted == [6, 7]
+
+
+@pytest.mark.transaction_polling
+async def test_failed_insert_is_retried(state_db):
+    league = FakeLeague(5)
+    cog = make_cog(state_db, league)
+    await cog.update_transactions()
+
+    original_add = state_db.add_transaction
+    async def failing_add(transaction_id, payload):
+        raise OSError('disk full')
+    state_db.add_transaction = failing_add
+
+    league.add(1)
+    with pytest.raises(OSError):
+        await cog.update_transactions()
+    assert 6 not in cog._transaction_ids
+
+    state_db.add_transaction = original_add
+    await cog.update_transactions()
+    assert cog.posted == [6]
+    assert 6 in await state_db.transaction_ids()
@@ -0,0 +1,111 @@
+import asyncio
+import json
+import pytest
+
+from file_manager import BaseFileManager
+
+
+#############################################################################
+# fixtures
+#############################################################################
+
+DELAY = 0.05
+
+
+@pytest.fixture
+def manager(tmp_path):
+    manager = BaseFileManager('persistent_data', write_delay=DELAY)
+    manager._path = tmp_path / 'persistent_data'
+    return manager
+
+
+def on_disk(manager, filename):
+    path = manager._get_path(filename)
+    return json.loads(path.read_text()) if path.exists() else None
+
+
+#############################################################################
+# write_behind tests
+#############################################################################
+
+@pytest.mark.write_behind
+async def test_burst_of_writes_flushes_once(manager):
+    for count in range(25):
+        await manager.write_json('player_data.json', {'count': count})
+
+    assert on_disk(manager, 'player_data.json') is None
+    await asyncio.sleep(DELAY * 3)
+
+    assert on_disk(manager, 'player_data.json') == {'count': 24}
+    assert manager.write_stats() == {'pending': 0, 'requested': 25, 'flushed': 1, 'coalesced': 24}
+
+
+@pytest.mark.write_behind
+async def test_pending_document_is_readable(manager):
+    await manager.write_json('members.json', [{'id': '1'}])
+
+    assert await manager.path_exists('members.json')
+    assert await manager.load_json('members.json') == [{'id': '1'}]
+
+
+@pytest.mark.write_behind
+async def test_document_is_snapshotted_at_write(manager):
+    data = {'accounts': [1]}
+    await manager.write_json('vault_accounts.json', data)
+    data['accounts'].append(2)
+
+    await manager.flush()
+    assert on_disk(manager, 'vault_accounts.json') == {'accounts': [1]}
+
+
+@pytest.mark.write_behind
+async def test_flush_writes_everything_now(manager):
+    await manager.write_json('a.json', {'a': 1})
+    await manager.write_json('b.json', {'b': 2})
+
+    await manager.flush()
+    assert on_disk(manager, 'a.json') == {'a': 1}
+    assert on_disk(manager, 'b.json') == {'b': 2}
+    assert manager.write_stats()['pending'] == 0
+
+    # the cancelled timers don't write again
+    await asyncio.sleep(DELAY * 3)
+    assert manager.write_stats()['flushed'] == 2
+
+
+@pytest.mark.write_behind
+async def test_write_during_flush_is_not_lost(manager):
+    await manager.write_json('transactions.json', {'version': 1})
+    flushing = asyncio.create_task(manager.flush())
+    await asyncio.sleep(0)
+    await manager.write_json('transactions.json', {'version': 2})
+    await flushing
+
+    await asyncio.sleep(DELAY * 3)
+    assert on_disk(manager, 'transactions.json') == {'version': 2}
+
+
+@pytest.mark.write_behind
+async def test_failed_flush_stays_pending(manager, monkeypatch):
+    await manager.write_json('members.json', {'id': 1})
+
+    async def disk_full(filename, text):
+        raise OSError('No space left on device')
+
+    monkeypatch.setattr(manager, '_write_text', disk_full)
+    await manager.flush()
+    assert manager.write_stats()['pending'] == 1
+
+    monkeypatch.undo()
+    await manager.flush()
+    assert on_disk(manager, 'members.json') == {'id': 1}
+
+
+@pytest.mark.write_behind
+async def test_immediate_writes_are_atomic(tmp_path):
+    manager = BaseFileManager('settings')
+    manager._path = tmp_path
+    await manager.write_json('challenge_config.json', {'enabled': True})
+
+    assert on_disk(manager, 'challenge_config.json') == {'enabled': True}
+    assert [path.name for path in tmp_path.iterdir()] == ['challenge_config.json']
@@ -0,0 +1,61 @@
+import pytest
+
+from file_manager import YahooCacheManager
+
+
+#############################################################################
+# fixtures
+#############################################################################
+
+@pytest.fixture
+def store(tmp_path):
+    manager = YahooCacheManager()
+    manager._path = tmp_path / 'yahoo_cache'
+    return manager
+
+
+def fresh_store(store):
+    """Same directory, empty in-memory refs, as after a restart."""
+    manager = YahooCacheManager()
+    manager._path = store._path
+    return manager
+
+
+SCOREBOARD_URL = 'https://fantasysports.yahooapis.com/fantasy/v2/league/449.l.1/scoreboard;week=1'
+PAYLOAD = b'{"fantasy_content": {"league": []}}'
+
+
+#############################################################################
+# yahoo_cache tests
+#############################################################################
+
+@pytest.mark.yahoo_cache
+def test_miss_then_hit(store):
+    assert store.load_payload(SCOREBOARD_URL) is None
+    store.store_payload(SCOREBOARD_URL, PAYLOAD)
+    assert store.load_payload(SCOREBOARD_URL) == PAYLOAD
+    assert store.stats() == {'refs_loaded': 1, 'hits': 1, 'misses': 1}
+
+@pytest.mark.yahoo_cache
+def test_survives_restart_and_loads_lazily(store):
+    store.store_payload(SCOREBOARD_URL, PAYLOAD)
+
+    restarted = fresh_store(store)
+    assert restarted.stats()['refs_loaded'] == 0
+    assert restarted.load_payload(SCOREBOARD_URL) == PAYLOAD
+    assert restarted.stats()['refs_loaded'] == 1
+
+@pytest.mark.yahoo_cache
+def test_identical_payloads_share_one_object(store):
+    store.store_payload(SCOREBOARD_URL, PAYLOAD)
+    store.store_payload(SCOREBOARD_URL.replace('week=1', 'week=2'), PAYLOAD)
+    assert len(list((store._path / 'objects').rglob('*.json'))) == 1
+    assert len(list((store._path / 'refs').iterdir())) == 2
+
+@pytest.mark.yahoo_cache
+def test_corrupt_object_is_a_miss(store):
+    store.store_payload(SCOREBOARD_URL, PAYLOAD)
+    object_path = next((store._path / 'objects').rglob('*.json'))
+    object_path.write_bytes(b'{"trunc')
+
+    assert fresh_store(store).load_payload(SCOREBOARD_URL) is None
@@ -6,7 +6,6 @@ logger = logging.getLogger(__name__)
 current_dir = Path(__file__).parent
 
 EMPTY = '\u001b'
-_member_filename = 'members.json'
 
 
 def compose_player_key(game_key, player_id):
@@ -18,16 +17,12 @@ def format_member(member,id):
     return new_mem
 
 
-async def teamid_to_discord(team_id:int, file_manager):
-    members = await file_manager.load_json(filename=_member_filename)
+async def teamid_to_discord(team_id:int, state_db):
+    member = await state_db.get_member(team_id)
+    return member.get('discord_id') if member else None
 
-    for member in members:
-        if member.get('id') == str(team_id):
-            return member.get('discord_id')
-    return None
 
-
-async def teamid_to_name(team_id:int, file_manager) -> str | None:
+async def teamid_to_name(team_id:int, state_db) -> str | None:
     """
     Convert team id to name.
         Args:
@@ -35,15 +30,11 @@ async def teamid_to_name(team_id:int, file_manager) -> str | None:
         Returns:
             str: Team name
     """
-    members = await file_manager.load_json(filename=_member_filename)
-
-    for member in members:
-        if member.get('id') == str(team_id):
-            return member.get('name')
-    return None
+    member = await state_db.get_member(team_id)
+    return member.get('name') if member else None
 
 
-async def discord_to_teamid(discord_id:int, file_manager) -> str | None:
+async def discord_to_teamid(discord_id:int, state_db) -> str | None:
     '''
     Convert discord id to team id
         Args:
@@ -51,15 +42,11 @@ async def discord_to_teamid(discord_id:int, file_manager) -> str | None:
         Returns:
             str: Team_id
     '''
-    members = await file_manager.load_json(filename=_member_filename)
+    member = await state_db.get_member_by_discord(discord_id)
+    return member.get('id') if member else None
 
-    for member in members:
-        if member.get('discord_id') == str(discord_id):
-            return member.get('id')
-    return None
 
-
-async def discord_to_name(discord_id:int, file_manager) -> str | None:
+async def discord_to_name(discord_id:int, state_db) -> str | None:
     """
     Convert discord id to name
         Args:
@@ -67,13 +54,8 @@ async def discord_to_name(discord_id:int, file_manager) -> str | None:
         Returns:
             str: Team name
     """
-    members = await file_manager.load_json(filename=_member_filename)
-
-    for member in members:
-        if member.get('discord_id') == str(discord_id):
-            return member.get('name')
-        
-    return None
+    member = await state_db.get_member_by_discord(discord_id)
+    return member.get('name') if member else None
     
 
 def id_to_mention(user) -> str: